@@ -0,0 +1,54 @@
+import argparse
+import json
+
+def flatten(report, prefix=""):
+    values = {}
+    if isinstance(report, dict):
+        items = report.items()
+    elif isinstance(report, list):
+        items = ((item.get('name', str(i)) if isinstance(item, dict) else str(i), item)
+                 for i, item in enumerate(report))
+    else:
+        return values
+    
+    for key, value in items:
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            values[path] = float(value)
+        elif isinstance(value, (dict, list)) and key != 'spec':
+            values.update(flatten(value, path))
+    return values
+
+def compare(base, head, threshold=0.05):
+    base_values = flatten(base)
+    head_values = flatten(head)
+    rows = []
+    for path in sorted(base_values.keys() & head_values.keys()):
+        old, new = base_values[path], head_values[path]
+        if old == 0:
+            continue
+        change = (new - old) / abs(old)
+        if abs(change) >= threshold:
+            rows.append((path, old, new, change))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=0.05)
+    args = parser.parse_args(argv)
+    
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.head, encoding='utf-8') as f:
+        head = json.load(f)
+    
+    print(f"{base.get('commit')} -> {head.get('commit')}")
+    for path, old, new, change in compare(base, head, args.threshold):
+        print(f"{path:<70} {old:>12.3f} {new:>12.3f} {change * 100:>+8.1f}%")
+
+if __name__ == "__main__":
+    main()
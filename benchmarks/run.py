@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import SyntheticSpec, generate_video, ground_truth, locate_blob, make_blobs
+from core.decoder_config import DecoderConfig
+from core.video_processor import VideoProcessor
+from core.calculator import SpeedCalculator
+
+PIXEL_VALUE = 546
+UM_VALUE = 1000
+BENCH_DECODER = DecoderConfig()
+
+def default_specs(quick: bool = False):
+    if quick:
+        return [
+            SyntheticSpec(640, 480, 120, codec='MJPG'),
+            SyntheticSpec(640, 480, 120, codec='mp4v', gop=12),
+        ]
+    
+    specs = []
+    for width, height in [(640, 480), (1920, 1080), (4096, 3000)]:
+        for codec in ['MJPG', 'mp4v', 'XVID', 'FFV1']:
+            specs.append(SyntheticSpec(width, height, 300, codec=codec, gop=12))
+    for gop in [1, 30, 250]:
+        specs.append(SyntheticSpec(1920, 1080, 300, codec='mp4v', gop=gop))
+    return specs
+
+def summarize_ms(samples):
+    values = np.asarray(samples, dtype=np.float64) * 1000.0
+    if len(values) == 0:
+        return {}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        'count': int(len(values)),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(p50),
+        'p90_ms': float(p90),
+        'p99_ms': float(p99),
+    }
+
+def bench_random_access(video_path, total_frames, samples, seed=0):
+    processor = VideoProcessor()
+    processor.load_video(video_path, config=BENCH_DECODER)
+    rng = np.random.default_rng(seed)
+    timings = []
+    for frame_number in rng.integers(0, total_frames, size=samples):
+        start = time.perf_counter()
+        processor.get_frame(int(frame_number))
+        timings.append(time.perf_counter() - start)
+    processor.release()
+    return summarize_ms(timings)
+
+def bench_sequential_access(video_path, max_frames):
+    processor = VideoProcessor()
+    processor.load_video(video_path, config=BENCH_DECODER)
+    timings = []
+    start_all = time.perf_counter()
+    for _ in range(min(max_frames, processor.total_frames - 1)):
+        start = time.perf_counter()
+        if processor.next_frame() is None:
+            break
+        timings.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - start_all
+    processor.release()
+    result = summarize_ms(timings)
+    result['fps'] = len(timings) / elapsed if elapsed > 0 else 0.0
+    return result
+
+def bench_accuracy(video_path, spec, frame_step=10):
+    processor = VideoProcessor()
+    processor.load_video(video_path, config=BENCH_DECODER)
+    truth = ground_truth(spec, UM_VALUE / PIXEL_VALUE)
+    errors = []
+    
+    for blob, true_speed in zip(spec.blobs, truth['speeds_um_per_sec']):
+        calculator = SpeedCalculator(processor.fps, UM_VALUE / PIXEL_VALUE)
+        for frame_number in range(0, spec.frames, frame_step):
+            frame = processor.get_frame(frame_number)
+            if frame is None:
+                continue
+            found = locate_blob(frame, blob.position(frame_number), blob.radius)
+            if found is not None:
+                calculator.add_point(int(round(found[0])), int(round(found[1])), frame_number)
+        
+        results = calculator.calculate_all_consecutive()
+        if not results or true_speed == 0:
+            continue
+        measured = float(np.mean([r['speed_um_per_sec'] for r in results]))
+        errors.append(abs(measured - true_speed) / true_speed)
+    
+    processor.release()
+    return {
+        'blobs': len(spec.blobs),
+        'measured_blobs': len(errors),
+        'mean_relative_error': float(np.mean(errors)) if errors else None,
+        'max_relative_error': float(np.max(errors)) if errors else None,
+    }
+
+def bench_display(video_path, repeats):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PyQt6.QtWidgets import QApplication
+        from ui.main_window import MainWindow
+    except ImportError as e:
+        return {'skipped': str(e)}
+    
+    app = QApplication.instance() or QApplication(sys.argv)
+    window = MainWindow()
+    window.resize(1600, 1000)
+    window.video_processor.load_video(video_path, config=BENCH_DECODER)
+    window.video_loaded = True
+    window.video_display_width = 1200
+    window.video_display_height = 900
+    
+    results = {}
+    for zoom in [1.0, 4.0]:
+        window.zoom_level = zoom
+        window.renderer.reset()
+        timings = []
+        for i in range(repeats):
+            window.zoom_offset_x = (i % 7) * 10
+            start = time.perf_counter()
+            window.display_frame()
+            timings.append(time.perf_counter() - start)
+        results[f"zoom_{zoom:g}x"] = summarize_ms(timings)
+    
+    window.close()
+    app.processEvents()
+    return results
+
+def bench_calculator(sizes, seed=0):
+    rng = np.random.default_rng(seed)
+    results = {}
+    for size in sizes:
+        xs = rng.integers(0, 4000, size=size)
+        ys = rng.integers(0, 3000, size=size)
+        calculator = SpeedCalculator(30, UM_VALUE / PIXEL_VALUE)
+        
+        start = time.perf_counter()
+        for i in range(size):
+            calculator.add_point(int(xs[i]), int(ys[i]), i)
+        add_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        calculator.calculate_all_consecutive()
+        calc_seconds = time.perf_counter() - start
+        
+        results[str(size)] = {
+            'add_points_per_sec': size / add_seconds if add_seconds > 0 else None,
+            'pairs_per_sec': (size - 1) / calc_seconds if calc_seconds > 0 else None,
+            'add_seconds': add_seconds,
+            'calculate_seconds': calc_seconds,
+        }
+    return results
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).resolve().parent, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args):
+    video_dir = Path(args.video_dir) if args.video_dir else Path(tempfile.mkdtemp(prefix="hiz_bench_"))
+    video_dir.mkdir(parents=True, exist_ok=True)
+    
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'decoder': BENCH_DECODER.label,
+        'videos': [],
+    }
+    
+    for spec in default_specs(args.quick):
+        spec.blobs = make_blobs(spec)
+        video_path = str(video_dir / f"{spec.name}{spec.extension}")
+        if not Path(video_path).exists() or args.regenerate:
+            if not generate_video(video_path, spec):
+                report['videos'].append({'name': spec.name, 'skipped': f"codec {spec.codec} unavailable"})
+                print(f"{spec.name}: skipped (codec unavailable)")
+                continue
+        
+        print(f"{spec.name}: measuring")
+        entry = {
+            'name': spec.name,
+            'spec': ground_truth(spec, UM_VALUE / PIXEL_VALUE),
+            'file_bytes': Path(video_path).stat().st_size,
+            'random_access': bench_random_access(video_path, spec.frames, args.random_samples),
+            'sequential_access': bench_sequential_access(video_path, spec.frames),
+            'accuracy': bench_accuracy(video_path, spec),
+        }
+        if not args.no_display:
+            entry['display_frame'] = bench_display(video_path, args.display_repeats)
+        report['videos'].append(entry)
+    
+    sizes = [10 ** e for e in range(2, 5 if args.quick else 7)]
+    print(f"calculator: {sizes}")
+    report['calculator'] = bench_calculator(sizes)
+    
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hız Analiz benchmark suite on synthetic videos")
+    parser.add_argument('--out', default='benchmark_results.json')
+    parser.add_argument('--video-dir', default=None)
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--regenerate', action='store_true')
+    parser.add_argument('--no-display', action='store_true')
+    parser.add_argument('--random-samples', type=int, default=100)
+    parser.add_argument('--display-repeats', type=int, default=30)
+    run(parser.parse_args(argv))
+
+if __name__ == "__main__":
+    main()
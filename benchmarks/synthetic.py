@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field, asdict
+from typing import List, Optional, Tuple
+import cv2
+import numpy as np
+
+CODEC_EXTENSIONS = {
+    'MJPG': '.avi',
+    'XVID': '.avi',
+    'mp4v': '.mp4',
+    'FFV1': '.mkv',
+}
+
+@dataclass
+class Blob:
+    start: Tuple[float, float]
+    velocity: Tuple[float, float]
+    radius: int
+    intensity: int
+    
+    def position(self, frame_number: int) -> Tuple[float, float]:
+        return (self.start[0] + self.velocity[0] * frame_number,
+                self.start[1] + self.velocity[1] * frame_number)
+
+@dataclass
+class SyntheticSpec:
+    width: int
+    height: int
+    frames: int
+    fps: float = 30.0
+    codec: str = 'MJPG'
+    gop: Optional[int] = None
+    blob_count: int = 3
+    seed: int = 0
+    blobs: List[Blob] = field(default_factory=list)
+    
+    @property
+    def name(self) -> str:
+        gop = f"g{self.gop}" if self.gop else "gdef"
+        return f"{self.codec}_{self.width}x{self.height}_{gop}_{self.frames}f_s{self.seed}"
+    
+    @property
+    def extension(self) -> str:
+        return CODEC_EXTENSIONS.get(self.codec, '.avi')
+
+def make_blobs(spec: SyntheticSpec) -> List[Blob]:
+    rng = np.random.default_rng(spec.seed)
+    blobs = []
+    margin = max(10, min(spec.width, spec.height) // 20)
+    for _ in range(spec.blob_count):
+        radius = int(rng.integers(max(3, margin // 3), max(4, margin // 2) + 1))
+        max_travel_x = (spec.width - 2 * margin) / max(1, spec.frames)
+        max_travel_y = (spec.height - 2 * margin) / max(1, spec.frames)
+        vx = float(rng.uniform(0.2, 1.0) * max_travel_x * rng.choice([-1, 1]))
+        vy = float(rng.uniform(0.0, 0.5) * max_travel_y * rng.choice([-1, 1]))
+        x0 = margin if vx > 0 else spec.width - margin
+        travel_y = vy * spec.frames
+        y0 = float(rng.uniform(margin + max(0.0, -travel_y), spec.height - margin - max(0.0, travel_y)))
+        blobs.append(Blob((float(x0), float(y0)), (vx, vy), radius, int(rng.integers(180, 256))))
+    return blobs
+
+def render_frame(spec: SyntheticSpec, frame_number: int) -> np.ndarray:
+    frame = np.full((spec.height, spec.width, 3), 20, dtype=np.uint8)
+    for blob in spec.blobs:
+        x, y = blob.position(frame_number)
+        cv2.circle(frame, (int(round(x * 16)), int(round(y * 16))), blob.radius * 16,
+                   (blob.intensity, blob.intensity, blob.intensity), -1, lineType=cv2.LINE_AA, shift=4)
+    return frame
+
+def generate_video(path: str, spec: SyntheticSpec) -> bool:
+    if not spec.blobs:
+        spec.blobs = make_blobs(spec)
+    
+    params = []
+    key_interval = getattr(cv2, 'VIDEOWRITER_PROP_KEY_INTERVAL', None)
+    if spec.gop and key_interval is not None:
+        params = [key_interval, spec.gop]
+    
+    fourcc = cv2.VideoWriter_fourcc(*spec.codec)
+    if params:
+        writer = cv2.VideoWriter(path, cv2.CAP_FFMPEG, fourcc, spec.fps, (spec.width, spec.height), params)
+    else:
+        writer = cv2.VideoWriter(path, fourcc, spec.fps, (spec.width, spec.height))
+    
+    if not writer.isOpened():
+        return False
+    
+    try:
+        for frame_number in range(spec.frames):
+            writer.write(render_frame(spec, frame_number))
+    finally:
+        writer.release()
+    return True
+
+def ground_truth(spec: SyntheticSpec, um_per_pixel: float) -> dict:
+    truth = asdict(spec)
+    truth['name'] = spec.name
+    truth['speeds_um_per_sec'] = [
+        float(np.hypot(*blob.velocity) * spec.fps * um_per_pixel) for blob in spec.blobs
+    ]
+    return truth
+
+def locate_blob(frame: np.ndarray, expected: Tuple[float, float], radius: int) -> Optional[Tuple[float, float]]:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    x, y = int(round(expected[0])), int(round(expected[1]))
+    window = radius * 3
+    x1, y1 = max(0, x - window), max(0, y - window)
+    roi = gray[y1:y + window, x1:x + window]
+    if roi.size == 0:
+        return None
+    
+    _, mask = cv2.threshold(roi, 100, 255, cv2.THRESH_BINARY)
+    moments = cv2.moments(mask, binaryImage=True)
+    if moments['m00'] == 0:
+        return None
+    return (x1 + moments['m10'] / moments['m00'], y1 + moments['m01'] / moments['m00'])
@@ -0,0 +1,86 @@
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from core.video_processor import scan_frames
+
+ACTIVITY_WIDTH = 160
+ACTIVITY_TOP_FRACTION = 0.01
+MIN_THRESHOLD = 0.5
+MERGE_GAP_FRAMES = 5
+
+class ActivityAnalyser:
+    def __init__(self, width: int = ACTIVITY_WIDTH):
+        self.width = width
+        self.scores = np.zeros(1, dtype=np.float32)
+        self.previous = None
+        self.small_size = None
+        self.top_count = 1
+        self.count = 0
+    
+    def start(self, cap):
+        self.scores = np.zeros(max(1, int(cap.get(cv2.CAP_PROP_FRAME_COUNT))), dtype=np.float32)
+    
+    def add(self, frame: np.ndarray, timestamp: float = 0.0):
+        if self.small_size is None:
+            height = max(1, round(frame.shape[0] * self.width / frame.shape[1]))
+            self.small_size = (self.width, height)
+            self.top_count = max(1, int(self.width * height * ACTIVITY_TOP_FRACTION))
+        small = cv2.resize(frame, self.small_size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        
+        if self.count >= len(self.scores):
+            self.scores = np.concatenate([self.scores, np.zeros(len(self.scores), dtype=np.float32)])
+        if self.previous is not None:
+            diff = cv2.absdiff(small, self.previous).ravel()
+            self.scores[self.count] = np.partition(diff, -self.top_count)[-self.top_count:].mean()
+        self.previous = small
+        self.count += 1
+    
+    def result(self) -> np.ndarray:
+        return self.scores[:self.count].copy()
+
+def compute_activity(video_path: str, progress_callback: Optional[Callable[[int], None]] = None,
+                     is_cancelled: Optional[Callable[[], bool]] = None, width: int = ACTIVITY_WIDTH,
+                     report_every: int = 100) -> Optional[np.ndarray]:
+    analyser = ActivityAnalyser(width)
+    if scan_frames(video_path, [analyser], progress_callback, is_cancelled, report_every=report_every) is None:
+        return None
+    return analyser.result()
+
+def activity_threshold(scores: np.ndarray, sensitivity: float = 3.0) -> float:
+    if len(scores) < 2:
+        return MIN_THRESHOLD
+    values = scores[1:]
+    median = float(np.median(values))
+    mad = float(np.median(np.abs(values - median))) * 1.4826
+    return max(MIN_THRESHOLD, median + sensitivity * mad)
+
+def active_segments(scores: np.ndarray, threshold: Optional[float] = None,
+                    merge_gap: int = MERGE_GAP_FRAMES) -> np.ndarray:
+    if threshold is None:
+        threshold = activity_threshold(scores)
+    active = np.asarray(scores) > threshold
+    if not active.any():
+        return np.empty((0, 2), dtype=np.int64)
+    
+    edges = np.diff(np.concatenate([[0], active.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    
+    keep = np.concatenate([[True], starts[1:] - ends[:-1] > merge_gap])
+    merged_starts = starts[keep]
+    merged_ends = np.concatenate([ends[:-1][keep[1:]], ends[-1:]])
+    return np.stack([merged_starts, merged_ends], axis=1)
+
+def next_active_frame(segments: np.ndarray, current: int, forward: bool = True) -> Optional[int]:
+    if len(segments) == 0:
+        return None
+    starts = segments[:, 0]
+    if forward:
+        index = np.searchsorted(starts, current, side='right')
+        return int(starts[index]) if index < len(starts) else None
+    index = np.searchsorted(starts, current, side='left') - 1
+    return int(starts[index]) if index >= 0 else None
@@ -0,0 +1,36 @@
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from core.activity import ActivityAnalyser
+from core.integrity import IntegrityAnalyser, integrity_cache_kind
+from core.quality import QualityAnalyser
+from core.sidecar import SidecarCache, load_or_compute
+from core.video_processor import scan_frames
+
+FRAME_ANALYSERS = {
+    'activity': lambda fps: ActivityAnalyser(),
+    'quality': lambda fps: QualityAnalyser(),
+    'integrity': lambda fps: IntegrityAnalyser(fps),
+}
+
+def analysis_cache_kinds(names: Sequence[str], fps: Optional[float] = None) -> Dict[str, str]:
+    return {name: integrity_cache_kind(fps) if name == 'integrity' else name for name in names}
+
+def analyse_video(video_path: str, names: Sequence[str], progress_callback: Optional[Callable[[int], None]] = None,
+                  is_cancelled: Optional[Callable[[], bool]] = None,
+                  fps: Optional[float] = None) -> Optional[Dict[str, np.ndarray]]:
+    analysers = {name: FRAME_ANALYSERS[name](fps) for name in names}
+    if scan_frames(video_path, list(analysers.values()), progress_callback, is_cancelled, fps) is None:
+        return None
+    return {name: analyser.result() for name, analyser in analysers.items()}
+
+def cached_analysis(video_path: str, cache: Optional[SidecarCache], names: Sequence[str] = tuple(FRAME_ANALYSERS),
+                    progress_callback: Optional[Callable[[int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None,
+                    fps: Optional[float] = None) -> Optional[Dict[str, np.ndarray]]:
+    results = load_or_compute(cache, analysis_cache_kinds(names, fps),
+                              lambda missing: analyse_video(video_path, missing, progress_callback, is_cancelled, fps))
+    if results is not None and progress_callback:
+        progress_callback(100)
+    return results
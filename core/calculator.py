@@ -1,7 +1,16 @@
+import gc
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
+
+from core.integrity import FLAG_DUPLICATE, content_frames, content_times
+from core.spatial_index import PointGridIndex
+from utils.profiler import profiled
+
+POINT_DTYPE = np.dtype([('x', '<i4'), ('y', '<i4'), ('frame', '<i4')])
 
 class Point:
+    __slots__ = ('x', 'y', 'frame_number')
+    
     def __init__(self, x: int, y: int, frame_number: int):
         self.x = x
         self.y = y
@@ -11,26 +20,112 @@ class Point:
         return f"Point(x={self.x}, y={self.y}, frame={self.frame_number})"
 
 class SpeedCalculator:
-    def __init__(self, fps: int, pixel_to_um_ratio: float):
+    def __init__(self, fps: float, pixel_to_um_ratio: float):
         self.fps = fps
         self.pixel_to_um_ratio = pixel_to_um_ratio
         self.points: List[Point] = []
+        self.index = PointGridIndex()
+        self.listeners = []
+        self.low_quality_frames: Optional[np.ndarray] = None
+        self.frame_integrity: Optional[np.ndarray] = None
+        self.content_frames: Optional[np.ndarray] = None
+        self.content_times: Optional[np.ndarray] = None
     
     def set_pixel_ratio(self, pixels: float, micrometers: float):
         if pixels > 0 and micrometers > 0:
             self.pixel_to_um_ratio = micrometers / pixels
     
+    def set_low_quality_frames(self, mask: Optional[np.ndarray]):
+        self.low_quality_frames = mask
+    
+    def is_low_quality_frame(self, frame_number: int) -> bool:
+        mask = self.low_quality_frames
+        return mask is not None and 0 <= frame_number < len(mask) and bool(mask[frame_number])
+    
+    def set_frame_integrity(self, records: Optional[np.ndarray]):
+        self.frame_integrity = records
+        self.content_frames = content_frames(records) if records is not None else None
+        self.content_times = content_times(records) if records is not None else None
+    
+    def is_timing_irregular(self, point1: Point, point2: Point) -> bool:
+        records = self.frame_integrity
+        first, last = sorted((point1.frame_number, point2.frame_number))
+        if records is None or first < 0 or last >= len(records):
+            return False
+        flags = records['flags']
+        return bool(flags[first] & FLAG_DUPLICATE) or bool(flags[first + 1:last + 1].any())
+    
+    def dropped_frames(self, point1: Point, point2: Point) -> int:
+        if self.frame_integrity is None:
+            return 0
+        first, last = sorted((point1.frame_number, point2.frame_number))
+        return int(self.frame_integrity['dropped'][first + 1:last + 1].sum())
+    
+    @profiled("calculator.add_point")
     def add_point(self, x: int, y: int, frame_number: int):
         point = Point(x, y, frame_number)
         self.points.append(point)
+        self.index.insert(point)
+        self._notify('add', len(self.points) - 1, point)
         return len(self.points) - 1
     
+    @profiled("calculator.remove_point")
     def remove_point(self, index: int):
         if 0 <= index < len(self.points):
-            self.points.pop(index)
+            point = self.points.pop(index)
+            self.index.remove(point)
+            self._notify('remove', index, point)
+    
+    @profiled("calculator.move_point")
+    def move_point(self, index: int, x: int, y: int):
+        if 0 <= index < len(self.points):
+            point = self.points[index]
+            point.x = x
+            point.y = y
+            self.index.update(point)
+            self._notify('move', index, point)
+    
+    @profiled("calculator.find_point")
+    def find_point(self, x: float, y: float, frame_number: int, radius: float) -> Optional[Point]:
+        return self.index.query(x, y, frame_number, radius)
+    
+    def index_of(self, point: Point) -> int:
+        return self.points.index(point)
     
     def clear_points(self):
         self.points.clear()
+        self.index.clear()
+        self._notify('clear', -1, None)
+    
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    def _notify(self, op: str, index: int, point):
+        for listener in self.listeners:
+            listener(op, index, point)
+    
+    def points_to_array(self) -> np.ndarray:
+        array = np.empty(len(self.points), dtype=POINT_DTYPE)
+        array['x'] = [p.x for p in self.points]
+        array['y'] = [p.y for p in self.points]
+        array['frame'] = [p.frame_number for p in self.points]
+        return array
+    
+    def load_points_array(self, array: np.ndarray):
+        xs, ys, frames = array['x'], array['y'], array['frame']
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.points = [Point(x, y, f) for x, y, f in zip(xs.tolist(), ys.tolist(), frames.tolist())]
+            self.index.rebuild(self.points, xs, ys, frames)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._notify('load', -1, array)
     
     def get_points(self) -> List[Point]:
         return self.points
@@ -45,9 +140,17 @@ class SpeedCalculator:
         return distance_pixels * self.pixel_to_um_ratio
     
     def calculate_time(self, point1: Point, point2: Point) -> float:
-        frame_diff = abs(point2.frame_number - point1.frame_number)
+        if not self.is_timing_irregular(point1, point2):
+            frame_diff = abs(point2.frame_number - point1.frame_number)
+        elif self.content_times is not None:
+            times = self.content_times
+            return abs(float(times[point2.frame_number] - times[point1.frame_number]))
+        else:
+            frames = self.content_frames
+            frame_diff = abs(int(frames[point2.frame_number]) - int(frames[point1.frame_number]))
         return frame_diff / self.fps if self.fps > 0 else 0
     
+    @profiled("calculator.calculate_speed")
     def calculate_speed(self, point1: Point, point2: Point) -> Dict:
         distance_pixels = self.calculate_distance_pixels(point1, point2)
         distance_um = self.calculate_distance_um(point1, point2)
@@ -65,9 +168,14 @@ class SpeedCalculator:
             'frame_diff': abs(point2.frame_number - point1.frame_number),
             'time_seconds': time_seconds,
             'speed_um_per_sec': speed_um_per_sec,
-            'speed_mm_per_sec': speed_mm_per_sec
+            'speed_mm_per_sec': speed_mm_per_sec,
+            'low_quality': (self.is_low_quality_frame(point1.frame_number) or
+                            self.is_low_quality_frame(point2.frame_number)),
+            'timing_irregular': self.is_timing_irregular(point1, point2),
+            'dropped_frames': self.dropped_frames(point1, point2)
         }
     
+    @profiled("calculator.calculate_all_consecutive")
     def calculate_all_consecutive(self) -> List[Dict]:
         if len(self.points) < 2:
             return []
@@ -80,6 +188,7 @@ class SpeedCalculator:
         
         return results
     
+    @profiled("calculator.get_summary_text")
     def get_summary_text(self) -> str:
         if len(self.points) < 2:
             return "En az 2 nokta seçmelisiniz."
@@ -90,7 +199,7 @@ class SpeedCalculator:
         lines.append("=" * 60)
         lines.append("HESAPLAMA SONUÇLARI")
         lines.append("=" * 60)
-        lines.append(f"FPS: {self.fps}")
+        lines.append(f"FPS: {self.fps:g}")
         lines.append(f"Piksel Oranı: {1/self.pixel_to_um_ratio:.2f} pixel = 1000 µm")
         lines.append(f"Toplam Nokta Sayısı: {len(self.points)}")
         lines.append("")
@@ -111,6 +220,14 @@ class SpeedCalculator:
             lines.append(f"Mesafe: {result['distance_pixels']:.2f} pixel")
             lines.append(f"Mesafe: {result['distance_um']:.2f} µm ({result['distance_mm']:.4f} mm)")
             lines.append(f"Hız: {result['speed_um_per_sec']:.2f} µm/s ({result['speed_mm_per_sec']:.4f} mm/s)")
+            if result['low_quality']:
+                lines.append("UYARI: Noktalardan biri düşük kaliteli (bulanık) bir frame üzerinde")
+            if result['timing_irregular']:
+                dropped = f" ({result['dropped_frames']} düşen frame)" if result['dropped_frames'] else ""
+                lines.append(f"UYARI: Aralıkta tekrarlanan veya düşen frame var{dropped}; "
+                             "zaman, frame zaman damgalarından düzeltildi")
+                if result['time_seconds'] == 0:
+                    lines.append("UYARI: İki nokta aynı görüntü içeriğinde; hız hesaplanamadı")
             lines.append("")
             
             total_distance_pixels += result['distance_pixels']
@@ -121,11 +238,17 @@ class SpeedCalculator:
             total_speed_mm += result['speed_mm_per_sec']
         
         num_pairs = len(results)
+        low_quality_pairs = sum(1 for result in results if result['low_quality'])
+        irregular_pairs = sum(1 for result in results if result['timing_irregular'])
         
         lines.append("=" * 60)
         lines.append("GENEL ORTALAMA")
         lines.append("=" * 60)
         lines.append(f"Nokta Çifti Sayısı: {num_pairs}")
+        if low_quality_pairs:
+            lines.append(f"Düşük Kaliteli Frame İçeren Çift: {low_quality_pairs}")
+        if irregular_pairs:
+            lines.append(f"Zamanlaması Düzeltilen Çift: {irregular_pairs}")
         lines.append("")
         lines.append(f"Ortalama Mesafe: {total_distance_pixels/num_pairs:.2f} pixel")
         lines.append(f"Ortalama Mesafe: {total_distance_um/num_pairs:.2f} µm ({total_distance_mm/num_pairs:.4f} mm)")
@@ -138,6 +261,7 @@ class SpeedCalculator:
         
         return "\n".join(lines)
     
+    @profiled("calculator.export_to_csv")
     def export_to_csv(self) -> str:
         if len(self.points) < 2:
             return ""
@@ -145,7 +269,7 @@ class SpeedCalculator:
         results = self.calculate_all_consecutive()
         
         lines = []
-        lines.append("Nokta Çifti,Frame1,X1,Y1,Frame2,X2,Y2,Frame Farkı,Zaman (s),Mesafe (pixel),Mesafe (µm),Mesafe (mm),Hız (µm/s),Hız (mm/s)")
+        lines.append("Nokta Çifti,Frame1,X1,Y1,Frame2,X2,Y2,Frame Farkı,Zaman (s),Mesafe (pixel),Mesafe (µm),Mesafe (mm),Hız (µm/s),Hız (mm/s),Kalite Uyarısı")
         
         total_distance_pixels = 0
         total_distance_um = 0
@@ -160,7 +284,11 @@ class SpeedCalculator:
             line += f"{result['point2'].frame_number},{result['point2'].x},{result['point2'].y},"
             line += f"{result['frame_diff']},{result['time_seconds']:.4f},"
             line += f"{result['distance_pixels']:.2f},{result['distance_um']:.2f},{result['distance_mm']:.4f},"
-            line += f"{result['speed_um_per_sec']:.2f},{result['speed_mm_per_sec']:.4f}"
+            line += f"{result['speed_um_per_sec']:.2f},{result['speed_mm_per_sec']:.4f},"
+            warnings = ["Bulanık"] if result['low_quality'] else []
+            if result['timing_irregular']:
+                warnings.append("Zamanlama")
+            line += ";".join(warnings)
             lines.append(line)
             
             total_distance_pixels += result['distance_pixels']
@@ -0,0 +1,276 @@
+import argparse
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from core.sidecar import user_cache_root
+
+DECODER_BACKENDS = {
+    'any': cv2.CAP_ANY,
+    'ffmpeg': cv2.CAP_FFMPEG,
+    'gstreamer': cv2.CAP_GSTREAMER,
+    'msmf': cv2.CAP_MSMF,
+    'avfoundation': cv2.CAP_AVFOUNDATION,
+    'mjpeg': cv2.CAP_OPENCV_MJPEG,
+}
+
+HW_ACCELERATION = {
+    'none': cv2.VIDEO_ACCELERATION_NONE,
+    'any': cv2.VIDEO_ACCELERATION_ANY,
+}
+
+ACCESS_MODES = ('random', 'sequential')
+
+@dataclass
+class DecoderConfig:
+    backend: str = 'any'
+    threads: int = 0
+    hw_acceleration: str = 'none'
+    
+    @property
+    def label(self) -> str:
+        threads = self.threads if self.threads > 0 else 'auto'
+        return f"{self.backend} / threads {threads} / hw {self.hw_acceleration}"
+    
+    def open_params(self) -> List[int]:
+        params = []
+        if self.threads > 0:
+            params += [cv2.CAP_PROP_N_THREADS, self.threads]
+        if self.hw_acceleration != 'none':
+            params += [cv2.CAP_PROP_HW_ACCELERATION, HW_ACCELERATION[self.hw_acceleration]]
+        return params
+    
+    def open(self, video_path: str, fallback: bool = True) -> cv2.VideoCapture:
+        api = DECODER_BACKENDS.get(self.backend, cv2.CAP_ANY)
+        try:
+            cap = cv2.VideoCapture(video_path, api, self.open_params())
+        except cv2.error:
+            cap = cv2.VideoCapture()
+        if fallback and not cap.isOpened() and self != DecoderConfig():
+            cap.release()
+            cap = cv2.VideoCapture(video_path)
+        return cap
+
+def available_backends() -> List[str]:
+    registered = set(cv2.videoio_registry.getStreamBackends())
+    return [name for name, api in DECODER_BACKENDS.items() if name == 'any' or api in registered]
+
+def candidate_configs(video_path: Optional[str] = None) -> List[DecoderConfig]:
+    backends = [name for name in available_backends() if name != 'any']
+    if video_path and Path(video_path).suffix.lower() != '.avi' and 'mjpeg' in backends:
+        backends.remove('mjpeg')
+    
+    cpu_count = os.cpu_count() or 1
+    thread_options = sorted({0, 1, min(4, cpu_count), cpu_count})
+    return [DecoderConfig(backend, threads) for backend in backends for threads in thread_options]
+
+def seek_sample(frame: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(frame[::16, ::16])
+
+def measure_config(video_path: str, config: DecoderConfig, sequential_frames: int = 60,
+                   random_samples: int = 8, seed: int = 0) -> Optional[Dict[str, float]]:
+    cap = config.open(video_path, fallback=False)
+    try:
+        if not cap.isOpened():
+            return None
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        
+        start = time.perf_counter()
+        samples = []
+        for _ in range(sequential_frames):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            samples.append(seek_sample(frame))
+        sequential_seconds = time.perf_counter() - start
+        decoded = len(samples)
+        if decoded == 0:
+            return None
+        
+        rng = np.random.default_rng(seed)
+        targets = rng.integers(0, max(1, total_frames), size=random_samples)
+        targets[0] = decoded // 2
+        start = time.perf_counter()
+        for target in targets.tolist():
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            ret, frame = cap.read()
+            if not ret or int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != target + 1:
+                return None
+            if target < decoded and not np.array_equal(seek_sample(frame), samples[target]):
+                return None
+        random_seconds = time.perf_counter() - start
+    finally:
+        cap.release()
+    
+    return {
+        'sequential_fps': decoded / sequential_seconds if sequential_seconds > 0 else 0.0,
+        'random_fps': random_samples / random_seconds if random_seconds > 0 else 0.0,
+    }
+
+def video_codec(video_path: str) -> Optional[str]:
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return None
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    finally:
+        cap.release()
+    codec = "".join(chr((fourcc >> shift) & 0xFF) for shift in (0, 8, 16, 24)).strip("\x00 ").lower()
+    return f"{codec or 'unknown'}{Path(video_path).suffix.lower()}"
+
+def autotune(video_path: str, candidates: Optional[List[DecoderConfig]] = None,
+             progress_callback: Optional[Callable[[int], None]] = None,
+             is_cancelled: Optional[Callable[[], bool]] = None, **measure_options) -> Optional[Dict]:
+    candidates = candidates if candidates is not None else candidate_configs(video_path)
+    measured = []
+    for i, config in enumerate(candidates):
+        if is_cancelled and is_cancelled():
+            return None
+        result = measure_config(video_path, config, **measure_options)
+        if result is not None:
+            measured.append((config, result))
+        if progress_callback:
+            progress_callback(int((i + 1) * 100 / len(candidates)))
+    
+    if not measured:
+        return None
+    
+    best_sequential = max(measured, key=lambda item: item[1]['sequential_fps'])
+    best_random = max(measured, key=lambda item: item[1]['random_fps'])
+    return {
+        'sequential': asdict(best_sequential[0]),
+        'random': asdict(best_random[0]),
+        'measurements': [dict(asdict(config), **result) for config, result in measured],
+        'tuned': time.time(),
+    }
+
+class DecoderSettings:
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else user_cache_root() / 'decoder.json'
+        self.data = {'auto_tune': True, 'default': {}, 'codecs': {}, 'files': {}}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self.data.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+    
+    @staticmethod
+    def _key(video_path: str) -> str:
+        return str(Path(video_path).resolve())
+    
+    @property
+    def auto_tune(self) -> bool:
+        return bool(self.data.get('auto_tune', True))
+    
+    def get(self, video_path: str, mode: str = 'sequential') -> Optional[DecoderConfig]:
+        with self._lock:
+            entry = self.data['files'].get(self._key(video_path), {}).get(mode)
+            entry = entry or self.data['default'].get(mode)
+        if not entry:
+            return None
+        return DecoderConfig(**{key: entry[key] for key in ('backend', 'threads', 'hw_acceleration') if key in entry})
+    
+    def has_file(self, video_path: str) -> bool:
+        with self._lock:
+            return self._key(video_path) in self.data['files']
+    
+    def file_entry(self, video_path: str) -> Optional[Dict]:
+        with self._lock:
+            return self.data['files'].get(self._key(video_path))
+    
+    def codec_entry(self, codec: str) -> Optional[Dict]:
+        with self._lock:
+            return self.data.setdefault('codecs', {}).get(codec)
+    
+    def set_codec(self, codec: str, entry: Dict):
+        with self._lock:
+            self.data.setdefault('codecs', {})[codec] = entry
+        self.save()
+    
+    def set_file(self, video_path: str, entry: Dict):
+        with self._lock:
+            self.data['files'][self._key(video_path)] = entry
+        self.save()
+    
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+_settings = None
+_settings_lock = threading.Lock()
+
+def decoder_settings() -> DecoderSettings:
+    global _settings
+    with _settings_lock:
+        if _settings is None:
+            _settings = DecoderSettings()
+        return _settings
+
+def format_measurements(entry: Dict) -> str:
+    lines = []
+    for row in sorted(entry.get('measurements', []), key=lambda r: -r['sequential_fps']):
+        config = DecoderConfig(row['backend'], row['threads'], row['hw_acceleration'])
+        lines.append(f"{config.label:40s} sequential {row['sequential_fps']:8.1f} fps   "
+                     f"random {row['random_fps']:7.1f} fps")
+    for mode in ACCESS_MODES:
+        if entry.get(mode):
+            lines.append(f"{mode}: {DecoderConfig(**entry[mode]).label}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hız Analiz decoder backend ayarları")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    tune = subparsers.add_parser('tune')
+    tune.add_argument('videos', nargs='+')
+    tune.add_argument('--frames', type=int, default=120)
+    tune.add_argument('--seeks', type=int, default=16)
+    
+    show = subparsers.add_parser('show')
+    show.add_argument('videos', nargs='+')
+    
+    setter = subparsers.add_parser('set')
+    setter.add_argument('videos', nargs='+')
+    setter.add_argument('--mode', choices=ACCESS_MODES + ('both',), default='both')
+    setter.add_argument('--backend', choices=sorted(DECODER_BACKENDS), default='any')
+    setter.add_argument('--threads', type=int, default=0)
+    setter.add_argument('--hw', choices=sorted(HW_ACCELERATION), default='none')
+    
+    args = parser.parse_args(argv)
+    settings = decoder_settings()
+    
+    for video_path in args.videos:
+        print(video_path)
+        if args.command == 'tune':
+            entry = autotune(video_path, sequential_frames=args.frames, random_samples=args.seeks)
+            if entry is None:
+                print("  could not open with any backend")
+                continue
+            settings.set_file(video_path, entry)
+            print(format_measurements(entry))
+        elif args.command == 'set':
+            entry = dict(settings.file_entry(video_path) or {})
+            config = asdict(DecoderConfig(args.backend, args.threads, args.hw))
+            for mode in (ACCESS_MODES if args.mode == 'both' else (args.mode,)):
+                entry[mode] = config
+            settings.set_file(video_path, entry)
+            print(format_measurements(entry))
+        else:
+            entry = settings.file_entry(video_path)
+            print(format_measurements(entry) if entry else "  default backend (not tuned)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from core.decoder_config import DecoderConfig, available_backends, decoder_settings
+from core.readers import is_reader_input
+from core.video_processor import open_capture
+
+POOL_MEMORY_MB = 512
+POOL_PREFETCH = 8
+MIN_STREAM_FRAMES = 4
+
+class DecoderStream:
+    def __init__(self, pool: 'DecoderPool', video_path: str, fps: Optional[float] = None,
+                 config: Optional[DecoderConfig] = None):
+        self.pool = pool
+        self.video_path = video_path
+        self.cap = open_capture(video_path, fps, 'random', config)
+        if not self.cap.isOpened():
+            self.cap.release()
+            raise ValueError("Video dosyası açılamadı!")
+        
+        self.fps = float(fps or self.cap.get(cv2.CAP_PROP_FPS) or 30.0)
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.frame_bytes = max(1, self.width * self.height * 3)
+        self.capacity = MIN_STREAM_FRAMES
+        self.prefetch = 0
+        self.frames = OrderedDict()
+        self.futures = {}
+        self.queue = deque()
+        self.position = 0
+        self.inflight = None
+        self.scheduled = False
+        self.closed = False
+        self.decoded_frames = 0
+        self.cache_hits = 0
+        self.lock = threading.Lock()
+    
+    @property
+    def duration(self) -> float:
+        return self.total_frames / self.fps if self.fps > 0 else 0.0
+    
+    @property
+    def cached_bytes(self) -> int:
+        return len(self.frames) * self.frame_bytes
+    
+    def set_budget(self, capacity: int, prefetch: int):
+        with self.lock:
+            self.capacity = max(MIN_STREAM_FRAMES, capacity)
+            self.prefetch = max(0, min(prefetch, self.capacity // 2))
+            self._evict()
+    
+    def _evict(self):
+        while len(self.frames) > self.capacity:
+            self.frames.popitem(last=False)
+    
+    def _pending(self, frame_number: int) -> Future:
+        future = self.futures.get(frame_number)
+        if future is None:
+            future = Future()
+            self.futures[frame_number] = future
+        return future
+    
+    def request(self, frame_number: int, direction: int = 1) -> Future:
+        frame_number = min(max(0, frame_number), max(0, self.total_frames - 1))
+        with self.lock:
+            frame = self.frames.get(frame_number)
+            if frame is not None:
+                self.frames.move_to_end(frame_number)
+                self.cache_hits += 1
+                future = Future()
+                future.set_result(frame)
+            else:
+                future = self._pending(frame_number)
+            
+            step = 1 if direction >= 0 else -1
+            wanted = [] if frame is not None or frame_number == self.inflight else [frame_number]
+            for k in range(1, self.prefetch + 1):
+                upcoming = frame_number + k * step
+                if (0 <= upcoming < self.total_frames and upcoming not in self.frames
+                        and upcoming != self.inflight):
+                    wanted.append(upcoming)
+            
+            for stale in set(self.queue) - set(wanted):
+                stale_future = self.futures.pop(stale, None)
+                if stale_future is not None:
+                    stale_future.cancel()
+            for upcoming in wanted:
+                self._pending(upcoming)
+            self.queue = deque(wanted)
+        
+        self.pool._schedule(self)
+        return future
+    
+    def get(self, frame_number: int, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        return self.request(frame_number).result(timeout)
+    
+    def _read(self, frame_number: int) -> Optional[np.ndarray]:
+        if frame_number != self.position:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        ret, frame = self.cap.read()
+        if not ret:
+            self.position = -1
+            return None
+        self.position = frame_number + 1
+        self.decoded_frames += 1
+        return frame
+    
+    def _decode_next(self):
+        with self.lock:
+            if self.closed or not self.queue:
+                return
+            frame_number = self.queue.popleft()
+            self.inflight = frame_number
+        
+        frame = self._read(frame_number)
+        
+        with self.lock:
+            self.inflight = None
+            future = self.futures.pop(frame_number, None)
+            if frame is not None:
+                self.frames[frame_number] = frame
+                self._evict()
+        if future is not None and future.set_running_or_notify_cancel():
+            future.set_result(frame)
+    
+    def close(self):
+        with self.lock:
+            self.closed = True
+            for future in self.futures.values():
+                future.cancel()
+            self.futures.clear()
+            self.queue.clear()
+            self.frames.clear()
+            release = not self.scheduled
+        if release:
+            self.cap.release()
+
+class DecoderPool:
+    def __init__(self, memory_mb: int = POOL_MEMORY_MB, max_workers: Optional[int] = None,
+                 expected_streams: int = 1, prefetch: int = POOL_PREFETCH):
+        cpu_count = os.cpu_count() or 1
+        self.memory_bytes = memory_mb * 1024 * 1024
+        self.prefetch = prefetch
+        self.decoder_threads = max(1, cpu_count // max(1, expected_streams))
+        self.default_backend = 'ffmpeg' if 'ffmpeg' in available_backends() else 'any'
+        self.streams: List[DecoderStream] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or min(4, cpu_count))
+        self._lock = threading.Lock()
+    
+    def open(self, video_path: str, fps: Optional[float] = None) -> DecoderStream:
+        config = None
+        if not is_reader_input(video_path):
+            config = decoder_settings().get(video_path, 'random') or DecoderConfig(self.default_backend)
+            if config.backend != 'mjpeg':
+                config = replace(config, threads=self.decoder_threads)
+        stream = DecoderStream(self, video_path, fps, config)
+        with self._lock:
+            self.streams.append(stream)
+        self.rebalance()
+        return stream
+    
+    def close(self, stream: DecoderStream):
+        with self._lock:
+            if stream in self.streams:
+                self.streams.remove(stream)
+        stream.close()
+        self.rebalance()
+    
+    def rebalance(self):
+        with self._lock:
+            streams = list(self.streams)
+        if not streams:
+            return
+        share = self.memory_bytes // len(streams)
+        for stream in streams:
+            capacity = share // stream.frame_bytes
+            stream.set_budget(capacity, min(self.prefetch, capacity // 2))
+    
+    def _schedule(self, stream: DecoderStream):
+        with stream.lock:
+            if stream.scheduled or stream.closed or not stream.queue:
+                return
+            stream.scheduled = True
+        self._executor.submit(self._pump, stream)
+    
+    def _pump(self, stream: DecoderStream):
+        stream._decode_next()
+        with stream.lock:
+            stream.scheduled = False
+            closed = stream.closed
+        if closed:
+            stream.cap.release()
+        else:
+            self._schedule(stream)
+    
+    def stats(self) -> List[dict]:
+        with self._lock:
+            streams = list(self.streams)
+        return [{
+            'video_path': stream.video_path,
+            'cached_frames': len(stream.frames),
+            'capacity': stream.capacity,
+            'decoded_frames': stream.decoded_frames,
+            'cache_hits': stream.cache_hits,
+        } for stream in streams]
+    
+    def shutdown(self):
+        with self._lock:
+            streams = list(self.streams)
+            self.streams.clear()
+        for stream in streams:
+            stream.close()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for stream in streams:
+            stream.cap.release()
@@ -0,0 +1,202 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.tiles import TileCache
+
+ENHANCE_CACHE_BYTES = 512 * 1024 * 1024
+FLATTEN_DOWNSCALE = 8
+DENOISE_TEMPLATE_SIZE = 5
+DENOISE_SEARCH_SIZE = 11
+
+@dataclass
+class FilterSpec:
+    kind: str
+    label: str
+    func: Callable
+    params: Dict[str, Tuple[float, float, float, float]]
+    expensive: bool = False
+    
+    @property
+    def defaults(self) -> Dict[str, float]:
+        return {name: spec[0] for name, spec in self.params.items()}
+
+FILTERS: Dict[str, FilterSpec] = {}
+
+def register_filter(kind: str, label: str, expensive: bool = False, **params):
+    def decorator(func):
+        FILTERS[kind] = FilterSpec(kind, label, func, params, expensive)
+        return func
+    return decorator
+
+def _on_luminance(frame: np.ndarray, func: Callable) -> np.ndarray:
+    if frame.ndim == 2:
+        return func(frame)
+    lightness, a, b = cv2.split(cv2.cvtColor(frame, cv2.COLOR_BGR2LAB))
+    return cv2.cvtColor(cv2.merge((func(lightness), a, b)), cv2.COLOR_LAB2BGR)
+
+@register_filter('flatten', "Background flattening", sigma=(60.0, 5.0, 400.0, 5.0))
+def flatten_background(frame: np.ndarray, sigma: float) -> np.ndarray:
+    h, w = frame.shape[:2]
+    small = cv2.resize(frame, (max(1, w // FLATTEN_DOWNSCALE), max(1, h // FLATTEN_DOWNSCALE)),
+                       interpolation=cv2.INTER_AREA).astype(np.float32)
+    small = cv2.GaussianBlur(small, (0, 0), max(0.5, sigma / FLATTEN_DOWNSCALE))
+    background = cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+    np.maximum(background, 1.0, out=background)
+    scale = background.reshape(-1, background.shape[-1] if frame.ndim == 3 else 1).mean(axis=0)
+    return cv2.convertScaleAbs(frame.astype(np.float32) / background * scale.astype(np.float32))
+
+@register_filter('denoise', "Denoise", expensive=True, strength=(5.0, 1.0, 30.0, 1.0))
+def denoise(frame: np.ndarray, strength: float) -> np.ndarray:
+    return _on_luminance(frame, lambda channel: cv2.fastNlMeansDenoising(
+        channel, None, strength, DENOISE_TEMPLATE_SIZE, DENOISE_SEARCH_SIZE))
+
+@register_filter('levels', "Brightness / contrast / gamma",
+                 contrast=(1.0, 0.0, 3.0, 0.1), brightness=(0.0, -128.0, 128.0, 1.0), gamma=(1.0, 0.2, 5.0, 0.1))
+def adjust_levels(frame: np.ndarray, contrast: float, brightness: float, gamma: float) -> np.ndarray:
+    values = np.arange(256, dtype=np.float64) / 255.0
+    lut = np.rint(np.clip(values ** (1.0 / gamma) * 255.0 * contrast + brightness, 0, 255)).astype(np.uint8)
+    return cv2.LUT(frame, lut)
+
+@register_filter('clahe', "CLAHE", clip_limit=(2.0, 0.5, 20.0, 0.5), tiles=(8.0, 2.0, 32.0, 1.0))
+def equalize(frame: np.ndarray, clip_limit: float, tiles: float) -> np.ndarray:
+    clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(int(tiles), int(tiles)))
+    return _on_luminance(frame, clahe.apply)
+
+@register_filter('unsharp', "Unsharp mask", amount=(1.0, 0.1, 5.0, 0.1), sigma=(2.0, 0.5, 20.0, 0.5))
+def unsharp_mask(frame: np.ndarray, amount: float, sigma: float) -> np.ndarray:
+    blurred = cv2.GaussianBlur(frame, (0, 0), sigma)
+    return cv2.addWeighted(frame, 1.0 + amount, blurred, -amount, 0)
+
+@dataclass
+class FilterStage:
+    kind: str
+    enabled: bool = False
+    params: Dict[str, float] = field(default_factory=dict)
+    
+    @property
+    def spec(self) -> FilterSpec:
+        return FILTERS[self.kind]
+    
+    @property
+    def values(self) -> Dict[str, float]:
+        return dict(self.spec.defaults, **self.params)
+    
+    @property
+    def is_identity(self) -> bool:
+        return not self.enabled or (self.kind == 'levels' and self.values == self.spec.defaults)
+    
+    def key(self) -> Tuple:
+        return (self.kind,) + tuple(sorted(self.values.items()))
+    
+    def apply(self, frame: np.ndarray) -> np.ndarray:
+        return self.spec.func(frame, **self.values)
+
+def default_stages() -> List[FilterStage]:
+    return [FilterStage(kind, enabled=(kind == 'levels')) for kind in FILTERS]
+
+class EnhancementChain:
+    def __init__(self, stages: Optional[List[FilterStage]] = None, cache_bytes: int = ENHANCE_CACHE_BYTES):
+        self.stages = stages if stages is not None else default_stages()
+        self.cache = TileCache(cache_bytes, name="enhance_cache")
+        self.lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Optional[Future] = None
+    
+    def stage(self, kind: str) -> Optional[FilterStage]:
+        return next((stage for stage in self.stages if stage.kind == kind), None)
+    
+    def set_stage(self, kind: str, enabled: Optional[bool] = None, **params):
+        with self.lock:
+            stage = self.stage(kind)
+            if stage is None:
+                stage = FilterStage(kind)
+                self.stages.append(stage)
+            if enabled is not None:
+                stage.enabled = enabled
+            stage.params = dict(stage.params, **params)
+    
+    def active_stages(self) -> List[FilterStage]:
+        with self.lock:
+            return [FilterStage(stage.kind, True, dict(stage.params))
+                    for stage in self.stages if not stage.is_identity]
+    
+    @property
+    def is_identity(self) -> bool:
+        return not self.active_stages()
+    
+    @property
+    def is_expensive(self) -> bool:
+        return any(stage.spec.expensive for stage in self.active_stages())
+    
+    def key(self) -> Tuple:
+        return tuple(stage.key() for stage in self.active_stages())
+    
+    def cached(self, frame_key: Hashable) -> Optional[np.ndarray]:
+        stages = self.active_stages()
+        if not stages:
+            return None
+        with self.lock:
+            return self.cache.get((frame_key,) + tuple(stage.key() for stage in stages))
+    
+    def apply(self, frame: np.ndarray, frame_key: Optional[Hashable] = None) -> np.ndarray:
+        stages = self.active_stages()
+        if frame_key is None:
+            for stage in stages:
+                frame = stage.apply(frame)
+            return frame
+        
+        keys = []
+        for stage in stages:
+            keys.append((keys[-1] if keys else (frame_key,)) + (stage.key(),))
+        start = 0
+        with self.lock:
+            for index in range(len(keys) - 1, -1, -1):
+                cached = self.cache.get(keys[index])
+                if cached is not None:
+                    frame, start = cached, index + 1
+                    break
+        for index in range(start, len(stages)):
+            frame = stages[index].apply(frame)
+            with self.lock:
+                self.cache.put(keys[index], frame)
+        return frame
+    
+    def submit(self, frame: np.ndarray, frame_key: Optional[Hashable] = None) -> Future:
+        with self.lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="enhance")
+            if self._pending is not None:
+                self._pending.cancel()
+            self._pending = self._executor.submit(self.apply, frame, frame_key)
+            return self._pending
+    
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+    
+    def shutdown(self):
+        with self.lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def snapshot(self) -> 'EnhancementChain':
+        return EnhancementChain(self.active_stages(), cache_bytes=0)
+    
+    def to_list(self) -> List[Dict]:
+        with self.lock:
+            return [{'kind': stage.kind, 'enabled': stage.enabled, 'params': dict(stage.params)}
+                    for stage in self.stages]
+    
+    def load_list(self, entries: List[Dict]):
+        stages = [FilterStage(entry['kind'], bool(entry.get('enabled')), dict(entry.get('params', {})))
+                  for entry in entries if entry.get('kind') in FILTERS]
+        known = {stage.kind for stage in stages}
+        stages += [stage for stage in default_stages() if stage.kind not in known]
+        with self.lock:
+            self.stages = stages
@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import cv2
+
+from core.enhance import EnhancementChain
+from core.overlay import draw_points
+from core.video_processor import open_capture
+
+EXPORT_CODECS = {'.mp4': 'mp4v', '.avi': 'MJPG', '.mkv': 'mp4v', '.mov': 'mp4v'}
+EXPORT_QUEUE_SIZE = 8
+
+_END = object()
+
+class AnnotatedVideoExporter:
+    def __init__(self, video_path: str, output_path: str, start_frame: int, end_frame: int,
+                 points: Sequence, point_size: int = 8, speed_labels: Optional[List[str]] = None,
+                 enhancement: Optional[EnhancementChain] = None, fps: Optional[float] = None,
+                 codec: Optional[str] = None, queue_size: int = EXPORT_QUEUE_SIZE):
+        self.video_path = video_path
+        self.output_path = output_path
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.points = list(points)
+        self.point_size = point_size
+        self.speed_labels = speed_labels
+        self.enhancement = enhancement
+        self.fps = fps
+        self.codec = codec or EXPORT_CODECS.get(Path(output_path).suffix.lower(), 'mp4v')
+        self.decoded = queue.Queue(maxsize=queue_size)
+        self.rendered = queue.Queue(maxsize=queue_size)
+        self.frames_written = 0
+        self.stage_seconds = {'decode': 0.0, 'render': 0.0, 'encode': 0.0}
+        self._stop_event = threading.Event()
+        self._cancelled = False
+        self._error = None
+    
+    @property
+    def total_frames(self) -> int:
+        return max(0, self.end_frame - self.start_frame + 1)
+    
+    def cancel(self):
+        self._cancelled = True
+        self._stop_event.set()
+    
+    def _fail(self, error: Exception):
+        if self._error is None:
+            self._error = error
+        self._stop_event.set()
+    
+    def _put(self, target: queue.Queue, item) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                target.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _get(self, source: queue.Queue):
+        while not self._stop_event.is_set():
+            try:
+                return source.get(timeout=0.05)
+            except queue.Empty:
+                continue
+        return _END
+    
+    def _decode(self):
+        cap = open_capture(self.video_path, self.fps, mode='sequential')
+        try:
+            if not cap.isOpened():
+                raise ValueError("Video dosyası açılamadı!")
+            if self.start_frame > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+            for frame_number in range(self.start_frame, self.end_frame + 1):
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                self.stage_seconds['decode'] += time.perf_counter() - start
+                if not ret or not self._put(self.decoded, (frame_number, frame)):
+                    break
+        except Exception as e:
+            self._fail(e)
+        finally:
+            cap.release()
+            self._put(self.decoded, _END)
+    
+    def _render(self):
+        try:
+            while True:
+                item = self._get(self.decoded)
+                if item is _END:
+                    break
+                frame_number, frame = item
+                start = time.perf_counter()
+                if self.enhancement is not None:
+                    frame = self.enhancement.apply(frame)
+                draw_points(frame, self.points, self.point_size, speed_labels=self.speed_labels)
+                self.stage_seconds['render'] += time.perf_counter() - start
+                if not self._put(self.rendered, (frame_number, frame)):
+                    break
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(self.rendered, _END)
+    
+    def run(self, progress_callback: Optional[Callable[[int, int], None]] = None,
+            is_cancelled: Optional[Callable[[], bool]] = None) -> Dict:
+        probe = open_capture(self.video_path, self.fps, mode='sequential')
+        fps = self.fps or probe.get(cv2.CAP_PROP_FPS) or 30.0
+        width = int(probe.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(probe.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        probe.release()
+        
+        writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*self.codec), fps, (width, height))
+        if not writer.isOpened():
+            raise ValueError(f"Çıktı dosyası oluşturulamadı: {self.output_path}")
+        
+        threads = [threading.Thread(target=self._decode, daemon=True),
+                   threading.Thread(target=self._render, daemon=True)]
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        
+        try:
+            while True:
+                if is_cancelled and is_cancelled():
+                    self.cancel()
+                item = self._get(self.rendered)
+                if item is _END:
+                    break
+                _, frame = item
+                start = time.perf_counter()
+                writer.write(frame)
+                self.stage_seconds['encode'] += time.perf_counter() - start
+                self.frames_written += 1
+                if progress_callback:
+                    progress_callback(self.frames_written, self.total_frames)
+        finally:
+            self._stop_event.set()
+            for thread in threads:
+                thread.join(timeout=5)
+            writer.release()
+        
+        if self._error is not None:
+            raise self._error
+        
+        elapsed = time.perf_counter() - start_time
+        return {
+            'frames': self.frames_written,
+            'seconds': elapsed,
+            'fps': self.frames_written / elapsed if elapsed > 0 else 0.0,
+            'stage_seconds': dict(self.stage_seconds),
+            'cancelled': self._cancelled,
+            'missing_frames': 0 if self._cancelled else self.total_frames - self.frames_written,
+        }
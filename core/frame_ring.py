@@ -0,0 +1,364 @@
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.projection import split_range
+from core.video_processor import open_capture
+
+RING_SLOTS = 16
+RING_POLL_SECONDS = 0.0005
+RING_ALIGNMENT = 64
+SKIPPED_FRAME = -1
+COUNTERS = ('write_cursor', 'read_cursor', 'published', 'consumed', 'producers_done', 'peak_occupancy', 'cancelled')
+TIMERS = ('producer_wait', 'consumer_wait', 'decode', 'analysis')
+
+@dataclass(frozen=True)
+class RingSpec:
+    name: str
+    slots: int
+    shape: Tuple[int, ...]
+    dtype: str
+    producers: int
+    
+    @property
+    def frame_bytes(self) -> int:
+        return int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+    
+    @property
+    def data_offset(self) -> int:
+        control = (3 * self.slots + len(COUNTERS) + len(TIMERS)) * 8
+        return -(-control // RING_ALIGNMENT) * RING_ALIGNMENT
+    
+    @property
+    def size(self) -> int:
+        return self.data_offset + self.slots * self.frame_bytes
+
+class FrameRing:
+    def __init__(self, spec: RingSpec, lock, shm: shared_memory.SharedMemory, owner: bool = False):
+        self.spec = spec
+        self.lock = lock
+        self.shm = shm
+        self.owner = owner
+        slots = spec.slots
+        control = np.ndarray(3 * slots + len(COUNTERS), dtype=np.int64, buffer=shm.buf)
+        self.ready = control[:slots]
+        self.done = control[slots:2 * slots]
+        self.frame_numbers = control[2 * slots:3 * slots]
+        self.counters = control[3 * slots:]
+        self.timers = np.ndarray(len(TIMERS), dtype=np.float64, buffer=shm.buf, offset=control.nbytes)
+        self.frames = np.ndarray((slots,) + tuple(spec.shape), dtype=spec.dtype, buffer=shm.buf,
+                                 offset=spec.data_offset)
+    
+    @classmethod
+    def create(cls, shape: Tuple[int, ...], dtype=np.uint8, slots: int = RING_SLOTS, producers: int = 1,
+               context=None) -> 'FrameRing':
+        spec = RingSpec(f"hiz_ring_{os.getpid()}_{uuid.uuid4().hex[:8]}", slots, tuple(shape),
+                        np.dtype(dtype).str, producers)
+        shm = shared_memory.SharedMemory(name=spec.name, create=True, size=spec.size)
+        ring = cls(spec, (context or multiprocessing).Lock(), shm, owner=True)
+        ring.ready[:] = -1
+        ring.done[:] = np.arange(slots) - slots
+        ring.frame_numbers[:] = SKIPPED_FRAME
+        ring.counters[:] = 0
+        ring.timers[:] = 0
+        return ring
+    
+    @classmethod
+    def attach(cls, spec: RingSpec, lock) -> 'FrameRing':
+        return cls(spec, lock, shared_memory.SharedMemory(name=spec.name))
+    
+    @property
+    def handle(self) -> Tuple[RingSpec, object]:
+        return self.spec, self.lock
+    
+    def counter(self, name: str) -> int:
+        return int(self.counters[COUNTERS.index(name)])
+    
+    def _increment(self, name: str, amount: int = 1) -> int:
+        index = COUNTERS.index(name)
+        value = int(self.counters[index])
+        self.counters[index] = value + amount
+        return value
+    
+    def add_time(self, name: str, seconds: float):
+        with self.lock:
+            self.timers[TIMERS.index(name)] += seconds
+    
+    def _claim(self, cursor: str) -> int:
+        with self.lock:
+            return self._increment(cursor)
+    
+    def acquire_write(self) -> Optional[Tuple[int, np.ndarray]]:
+        sequence = self._claim('write_cursor')
+        slot = sequence % self.spec.slots
+        start = time.perf_counter()
+        while True:
+            with self.lock:
+                if self.done[slot] == sequence - self.spec.slots:
+                    break
+                if self.counter('cancelled'):
+                    return None
+            time.sleep(RING_POLL_SECONDS)
+        self.add_time('producer_wait', time.perf_counter() - start)
+        return sequence, self.frames[slot]
+    
+    def publish(self, sequence: int, frame_number: int):
+        slot = sequence % self.spec.slots
+        with self.lock:
+            self.frame_numbers[slot] = frame_number
+            self.ready[slot] = sequence
+            published = self._increment('published') + 1
+            occupancy = published - self.counter('consumed')
+            if occupancy > self.counter('peak_occupancy'):
+                self.counters[COUNTERS.index('peak_occupancy')] = occupancy
+    
+    def producer_finished(self):
+        with self.lock:
+            self._increment('producers_done')
+    
+    def acquire_read(self) -> Optional[Tuple[int, int, np.ndarray]]:
+        start = time.perf_counter()
+        while True:
+            sequence = self._claim('read_cursor')
+            slot = sequence % self.spec.slots
+            while True:
+                with self.lock:
+                    if self.ready[slot] == sequence:
+                        frame_number = int(self.frame_numbers[slot])
+                        break
+                    if self.counter('producers_done') >= self.spec.producers and (
+                            sequence >= self.counter('write_cursor') or self.counter('cancelled')):
+                        self.timers[TIMERS.index('consumer_wait')] += time.perf_counter() - start
+                        return None
+                time.sleep(RING_POLL_SECONDS)
+            
+            if frame_number != SKIPPED_FRAME:
+                self.add_time('consumer_wait', time.perf_counter() - start)
+                return sequence, frame_number, self.frames[slot]
+            self.release(sequence, consumed=False)
+    
+    def release(self, sequence: int, consumed: bool = True):
+        with self.lock:
+            self.done[sequence % self.spec.slots] = sequence
+            if consumed:
+                self._increment('consumed')
+    
+    def cancel(self):
+        with self.lock:
+            self.counters[COUNTERS.index('cancelled')] = 1
+    
+    @property
+    def is_cancelled(self) -> bool:
+        return bool(self.counter('cancelled'))
+    
+    def stats(self, elapsed: Optional[float] = None) -> Dict:
+        with self.lock:
+            counters = dict(zip(COUNTERS, self.counters.tolist()))
+            timers = dict(zip(TIMERS, self.timers.tolist()))
+        stats = {
+            'slots': self.spec.slots,
+            'slot_bytes': self.spec.frame_bytes,
+            'published': counters['published'],
+            'consumed': counters['consumed'],
+            'in_flight': counters['published'] - counters['consumed'],
+            'peak_occupancy': counters['peak_occupancy'],
+            'producer_wait_seconds': timers['producer_wait'],
+            'consumer_wait_seconds': timers['consumer_wait'],
+            'decode_seconds': timers['decode'],
+            'analysis_seconds': timers['analysis'],
+            'bottleneck': 'analysis' if timers['producer_wait'] > timers['consumer_wait'] else 'decode',
+        }
+        if elapsed:
+            stats['fps'] = counters['consumed'] / elapsed
+            stats['megabytes_per_sec'] = counters['consumed'] * self.spec.frame_bytes / elapsed / 1e6
+        return stats
+    
+    def close(self):
+        self.ready = self.done = self.frame_numbers = self.counters = self.timers = self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+_worker_ring: Optional[FrameRing] = None
+
+def _attach_worker(spec: RingSpec, lock):
+    global _worker_ring
+    _worker_ring = FrameRing.attach(spec, lock)
+
+def decode_segment(video_path: str, first: int, last: int, fps: Optional[float] = None) -> int:
+    ring = _worker_ring
+    cap = open_capture(video_path, fps, mode='sequential')
+    decoded = 0
+    try:
+        if first > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+        for frame_number in range(first, last + 1):
+            if ring.is_cancelled:
+                break
+            claimed = ring.acquire_write()
+            if claimed is None:
+                break
+            sequence, view = claimed
+            published = SKIPPED_FRAME
+            start = time.perf_counter()
+            try:
+                ret, frame = cap.read(view) if isinstance(cap, cv2.VideoCapture) else cap.read()
+                if ret and frame is not view:
+                    if frame.shape != view.shape:
+                        raise ValueError("Frame boyutu halka ile uyuşmuyor!")
+                    np.copyto(view, frame)
+                if ret:
+                    published = frame_number
+            finally:
+                ring.add_time('decode', time.perf_counter() - start)
+                ring.publish(sequence, published)
+            if not ret:
+                break
+            decoded += 1
+    finally:
+        cap.release()
+        ring.producer_finished()
+    return decoded
+
+def analyze_frames(analyze: Callable[[int, np.ndarray], object]) -> Dict[int, object]:
+    ring = _worker_ring
+    results = {}
+    while True:
+        item = ring.acquire_read()
+        if item is None:
+            break
+        sequence, frame_number, view = item
+        start = time.perf_counter()
+        try:
+            results[frame_number] = analyze(frame_number, view)
+        finally:
+            ring.add_time('analysis', time.perf_counter() - start)
+            ring.release(sequence)
+    return results
+
+def frame_mean(frame_number: int, frame: np.ndarray) -> float:
+    channels = frame.shape[2] if frame.ndim == 3 else 1
+    return float(np.mean(cv2.mean(frame)[:channels]))
+
+def frame_sharpness(frame_number: int, frame: np.ndarray) -> float:
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    return float(cv2.Laplacian(gray, cv2.CV_32F).var())
+
+ANALYSES = {'mean': frame_mean, 'sharpness': frame_sharpness}
+
+def probe_frame(video_path: str, fps: Optional[float] = None) -> Tuple[Tuple[int, ...], np.dtype]:
+    cap = open_capture(video_path, fps)
+    try:
+        ret, frame = cap.read()
+    finally:
+        cap.release()
+    if not ret:
+        raise ValueError("Video dosyası açılamadı!")
+    return frame.shape, frame.dtype
+
+class RingPipeline:
+    def __init__(self, video_path: str, analyze: Callable[[int, np.ndarray], object], start_frame: int,
+                 end_frame: int, decoders: int = 1, workers: Optional[int] = None, slots: Optional[int] = None,
+                 fps: Optional[float] = None):
+        self.video_path = video_path
+        self.analyze = analyze
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.decoders = max(1, decoders)
+        self.workers = max(1, workers or (os.cpu_count() or 2) - self.decoders)
+        self.slots = slots or max(RING_SLOTS, 2 * (self.decoders + self.workers))
+        self.fps = fps
+        self.ring: Optional[FrameRing] = None
+        self._stop_event = threading.Event()
+    
+    @property
+    def total_frames(self) -> int:
+        return self.end_frame - self.start_frame + 1
+    
+    def cancel(self):
+        self._stop_event.set()
+        if self.ring is not None:
+            self.ring.cancel()
+    
+    def run(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        shape, dtype = probe_frame(self.video_path, self.fps)
+        context = multiprocessing.get_context('spawn')
+        segments = split_range(self.start_frame, self.end_frame, 1, self.decoders)
+        self.ring = FrameRing.create(shape, dtype, self.slots, len(segments), context)
+        if self._stop_event.is_set():
+            self.ring.cancel()
+        start_time = time.perf_counter()
+        results = {}
+        try:
+            with ProcessPoolExecutor(max_workers=len(segments) + self.workers, mp_context=context,
+                                     initializer=_attach_worker, initargs=self.ring.handle) as executor:
+                futures = [executor.submit(decode_segment, self.video_path, first, last, self.fps)
+                           for first, last in segments]
+                futures += [executor.submit(analyze_frames, self.analyze) for _ in range(self.workers)]
+                pending = set(futures)
+                while pending:
+                    finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        if future.exception() is not None:
+                            self.ring.cancel()
+                    if progress_callback:
+                        progress_callback(self.ring.counter('consumed'), self.total_frames)
+                for future in futures[len(segments):]:
+                    results.update(future.result())
+                for future in futures[:len(segments)]:
+                    future.result()
+            elapsed = time.perf_counter() - start_time
+            stats = self.ring.stats(elapsed)
+        finally:
+            self.ring.close()
+            self.ring = None
+        
+        stats.update({
+            'results': results,
+            'frames': len(results),
+            'seconds': elapsed,
+            'decoders': len(segments),
+            'workers': self.workers,
+            'cancelled': self._stop_event.is_set(),
+        })
+        return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hız Analiz paylaşımlı bellek frame halkası")
+    parser.add_argument('video')
+    parser.add_argument('--analysis', choices=sorted(ANALYSES), default='mean')
+    parser.add_argument('--start', type=int, default=0)
+    parser.add_argument('--end', type=int, default=None)
+    parser.add_argument('--decoders', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--slots', type=int, default=None)
+    args = parser.parse_args(argv)
+    
+    end = args.end
+    if end is None:
+        cap = open_capture(args.video)
+        end = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) - 1
+        cap.release()
+    pipeline = RingPipeline(args.video, ANALYSES[args.analysis], args.start, end, args.decoders, args.workers,
+                            args.slots)
+    stats = pipeline.run()
+    print(f"{stats['frames']} frames in {stats['seconds']:.2f} s ({stats['fps']:.0f} fps, "
+          f"{stats['megabytes_per_sec']:.0f} MB/s) with {stats['decoders']} decoders, {stats['workers']} workers")
+    print(f"Ring: {stats['slots']} slots x {stats['slot_bytes'] / 1e6:.1f} MB, peak occupancy "
+          f"{stats['peak_occupancy']}")
+    print(f"Decode {stats['decode_seconds']:.2f} s, analysis {stats['analysis_seconds']:.2f} s, "
+          f"decoders waited {stats['producer_wait_seconds']:.2f} s, workers waited "
+          f"{stats['consumer_wait_seconds']:.2f} s -> bottleneck: {stats['bottleneck']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from typing import Callable, Dict, Optional
+
+import cv2
+import numpy as np
+
+from core.video_processor import scan_frames
+
+INTEGRITY_DTYPE = np.dtype([('timestamp', '<f8'), ('changed', '<f4'), ('dropped', '<u2'), ('flags', 'u1')])
+FLAG_DUPLICATE = 1
+FLAG_GAP = 2
+INTEGRITY_STRIDE = 4
+DUPLICATE_TOLERANCE = 2
+DUPLICATE_MAX_CHANGED = 0.0005
+MAX_DUPLICATE_RUN = 3
+GAP_RATIO = 1.5
+
+def integrity_cache_kind(fps: Optional[float] = None) -> str:
+    return f"integrity_{fps:g}fps" if fps else "integrity"
+
+def fingerprint(frame: np.ndarray, stride: int = INTEGRITY_STRIDE) -> np.ndarray:
+    return np.ascontiguousarray(frame[::stride, ::stride])
+
+def changed_fraction(sample: np.ndarray, previous: np.ndarray, tolerance: int = DUPLICATE_TOLERANCE) -> float:
+    diff = cv2.absdiff(sample, previous)
+    return np.count_nonzero(diff > tolerance) / diff.size
+
+class IntegrityAnalyser:
+    def __init__(self, fps: Optional[float] = None, stride: int = INTEGRITY_STRIDE):
+        self.fps = fps
+        self.stride = stride
+        self.records = np.zeros(1, dtype=INTEGRITY_DTYPE)
+        self.previous = None
+        self.count = 0
+    
+    def start(self, cap):
+        self.fps = float(self.fps or cap.get(cv2.CAP_PROP_FPS) or 0)
+        self.records = np.zeros(max(1, int(cap.get(cv2.CAP_PROP_FRAME_COUNT))), dtype=INTEGRITY_DTYPE)
+    
+    def add(self, frame: np.ndarray, timestamp: float):
+        records = self.records
+        if self.count >= len(records):
+            records = self.records = np.concatenate([records, np.zeros(len(records), dtype=INTEGRITY_DTYPE)])
+        sample = fingerprint(frame, self.stride)
+        records['timestamp'][self.count] = timestamp
+        records['changed'][self.count] = 1.0 if self.previous is None else changed_fraction(sample, self.previous)
+        self.previous = sample
+        self.count += 1
+    
+    def result(self) -> np.ndarray:
+        return mark_frames(self.records[:self.count].copy(), float(self.fps or 0))
+
+def compute_integrity(video_path: str, progress_callback: Optional[Callable[[int], None]] = None,
+                      is_cancelled: Optional[Callable[[], bool]] = None, fps: Optional[float] = None,
+                      stride: int = INTEGRITY_STRIDE, report_every: int = 100) -> Optional[np.ndarray]:
+    analyser = IntegrityAnalyser(fps, stride)
+    if scan_frames(video_path, [analyser], progress_callback, is_cancelled, fps, report_every) is None:
+        return None
+    return analyser.result()
+
+def frame_interval(timestamps: np.ndarray, fps: float) -> float:
+    deltas = np.diff(timestamps)
+    deltas = deltas[deltas > 0]
+    if len(deltas):
+        return float(np.median(deltas))
+    return 1.0 / fps if fps > 0 else 0.0
+
+def repeated_runs(repeated: np.ndarray) -> np.ndarray:
+    edges = np.diff(np.concatenate([[0], repeated.astype(np.int8), [0]]))
+    return np.column_stack([np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)])
+
+def mark_frames(records: np.ndarray, fps: float) -> np.ndarray:
+    if len(records) == 0:
+        return records
+    
+    timestamps = records['timestamp']
+    if np.count_nonzero(np.diff(timestamps) > 0) < (len(records) - 1) / 2:
+        timestamps[:] = np.arange(len(records)) / fps if fps > 0 else np.nan
+    
+    flags = np.zeros(len(records), dtype=np.uint8)
+    for start, end in repeated_runs(records['changed'] <= DUPLICATE_MAX_CHANGED):
+        if end - start <= MAX_DUPLICATE_RUN:
+            flags[start:end] |= FLAG_DUPLICATE
+    
+    interval = frame_interval(timestamps, fps)
+    if interval > 0:
+        deltas = np.diff(timestamps)
+        gaps = np.flatnonzero(deltas > interval * GAP_RATIO) + 1
+        dropped = np.rint(deltas[gaps - 1] / interval) - 1
+        records['dropped'][gaps] = np.clip(dropped, 1, np.iinfo(np.uint16).max)
+        flags[gaps] |= FLAG_GAP
+    records['flags'] = flags
+    return records
+
+def duplicate_mask(records: np.ndarray) -> np.ndarray:
+    return (records['flags'] & FLAG_DUPLICATE) != 0
+
+def irregular_mask(records: np.ndarray) -> np.ndarray:
+    return records['flags'] != 0
+
+def content_frames(records: np.ndarray) -> np.ndarray:
+    originals = np.arange(len(records))
+    originals[duplicate_mask(records)] = 0
+    return np.maximum.accumulate(originals)
+
+def content_times(records: np.ndarray) -> Optional[np.ndarray]:
+    timestamps = records['timestamp']
+    if not np.isfinite(timestamps).all():
+        return None
+    return timestamps[content_frames(records)]
+
+def integrity_summary(records: np.ndarray) -> Dict:
+    return {
+        'frames': len(records),
+        'duplicates': int(duplicate_mask(records).sum()),
+        'gaps': int(np.count_nonzero(records['flags'] & FLAG_GAP)),
+        'dropped': int(records['dropped'].sum()),
+        'interval': frame_interval(records['timestamp'], 0.0) if len(records) else 0.0,
+    }
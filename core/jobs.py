@@ -0,0 +1,352 @@
+import argparse
+import csv
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.activity import active_segments
+from core.analysis import cached_analysis
+from core.calculator import SpeedCalculator
+from core.integrity import integrity_cache_kind, integrity_summary
+from core.quality import low_quality_mask
+from core.sidecar import SidecarCache
+from core.video_processor import VideoProcessor, count_frames, open_capture
+
+TASK_HANDLERS: Dict[str, Callable] = {}
+
+def register_task(kind: str):
+    def decorator(func):
+        TASK_HANDLERS[kind] = func
+        return func
+    return decorator
+
+@dataclass
+class Task:
+    task_id: str
+    kind: str
+    video_path: str
+    frame_range: Optional[Tuple[int, int]] = None
+    params: Dict = field(default_factory=dict)
+    resources: Dict[str, int] = field(default_factory=lambda: {'cpu': 1})
+    
+    @property
+    def weight(self) -> int:
+        if self.frame_range:
+            return max(1, self.frame_range[1] - self.frame_range[0])
+        return max(1, int(self.params.get('weight', 1)))
+
+def video_task(kind: str, video_path: str, resources: Optional[Dict[str, int]] = None, **params) -> Task:
+    return Task(f"{kind}:{Path(video_path).resolve()}", kind, str(video_path),
+                params=params, resources=resources or {'cpu': 1})
+
+def frame_range_tasks(kind: str, video_path: str, chunk_frames: int = 1000,
+                      resources: Optional[Dict[str, int]] = None, **params) -> List[Task]:
+    processor = VideoProcessor()
+    processor.load_video(video_path)
+    total_frames = processor.total_frames
+    processor.release()
+    
+    resolved = Path(video_path).resolve()
+    return [
+        Task(f"{kind}:{resolved}:{start}-{min(start + chunk_frames, total_frames)}", kind, str(video_path),
+             frame_range=(start, min(start + chunk_frames, total_frames)), params=params,
+             resources=resources or {'cpu': 1, 'io': 1})
+        for start in range(0, total_frames, chunk_frames)
+    ]
+
+def task_cache(task: Task) -> Optional[SidecarCache]:
+    if not task.params.get('use_cache'):
+        return None
+    try:
+        return SidecarCache(task.video_path)
+    except OSError:
+        return None
+
+def cached_scores(task: Task, name: str, fps: Optional[float] = None) -> np.ndarray:
+    results = cached_analysis(task.video_path, task_cache(task), (name,), fps=fps)
+    if results is None:
+        raise ValueError("Video dosyası açılamadı!")
+    return results[name]
+
+@register_task('frame_count')
+def run_frame_count(task: Task) -> Dict:
+    cache = task_cache(task)
+    cached = cache.load_json("frame_count") if cache is not None else None
+    if cached:
+        return {'frames': cached['frames']}
+    frames = count_frames(task.video_path)
+    if frames is not None and cache is not None:
+        cache.save_json("frame_count", {'frames': frames})
+    return {'frames': frames}
+
+@register_task('activity')
+def run_activity(task: Task) -> Dict:
+    scores = cached_scores(task, "activity")
+    return {'frames': len(scores), 'segments': active_segments(scores).tolist()}
+
+@register_task('quality')
+def run_quality(task: Task) -> Dict:
+    scores = cached_scores(task, "quality")
+    mask = low_quality_mask(scores)
+    return {
+        'frames': len(scores),
+        'low_quality_frames': int(mask.sum()),
+        'median_sharpness': float(np.median(scores['sharpness'])) if len(scores) else None,
+    }
+
+@register_task('integrity')
+def run_integrity(task: Task) -> Dict:
+    records = cached_scores(task, "integrity", task.params.get('fps'))
+    return integrity_summary(records)
+
+@register_task('frame_means')
+def run_frame_means(task: Task) -> Dict:
+    start, end = task.frame_range
+    cap = open_capture(task.video_path)
+    means = []
+    try:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        for _ in range(start, end):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            means.append(float(frame.mean()))
+    finally:
+        cap.release()
+    return {'start': start, 'means': means}
+
+@register_task('speed')
+def run_speed(task: Task) -> Dict:
+    points_path = task.params['points_path']
+    calibration = {}
+    points = None
+    if points_path.endswith('.hiz'):
+        from core.project import Project
+        project, points = Project.load(points_path)
+        calibration = project.calibration
+    pixel_value = float(task.params.get('pixel_value', calibration.get('pixel_value', 546)))
+    um_value = float(task.params.get('um_value', calibration.get('um_value', 1000)))
+    
+    fps = task.params.get('fps', calibration.get('fps'))
+    processor = VideoProcessor()
+    processor.load_video(task.video_path, fps)
+    calculator = SpeedCalculator(processor.fps, um_value / pixel_value)
+    processor.release()
+    
+    if points is not None:
+        calculator.load_points_array(points)
+    else:
+        with open(points_path, encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                calculator.add_point(int(float(row['x'])), int(float(row['y'])), int(row['frame']))
+    
+    cache = task_cache(task)
+    if cache is not None:
+        calculator.set_frame_integrity(cache.load_array(integrity_cache_kind(fps)))
+    
+    results = calculator.calculate_all_consecutive()
+    speeds = [float(r['speed_um_per_sec']) for r in results]
+    return {
+        'pairs': len(results),
+        'timing_irregular_pairs': sum(1 for r in results if r['timing_irregular']),
+        'mean_speed_um_per_sec': float(np.mean(speeds)) if speeds else None,
+        'speeds_um_per_sec': speeds,
+    }
+
+def execute_task(task_data: Dict) -> Dict:
+    task = Task(**task_data)
+    if task.frame_range is not None:
+        task.frame_range = tuple(task.frame_range)
+    handler = TASK_HANDLERS.get(task.kind)
+    if handler is None:
+        raise ValueError(f"Bilinmeyen görev türü: {task.kind}")
+    return handler(task)
+
+class JobJournal:
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.completed: Dict[str, Dict] = {}
+        self.failed: Dict[str, str] = {}
+        if self.path.exists():
+            self._load()
+    
+    def _load(self):
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('status') == 'done':
+                    self.completed[entry['task_id']] = entry.get('result')
+                    self.failed.pop(entry['task_id'], None)
+                elif entry.get('status') == 'failed':
+                    self.failed[entry['task_id']] = entry.get('error', '')
+    
+    def append(self, entry: Dict):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if entry['status'] == 'done':
+            self.completed[entry['task_id']] = entry.get('result')
+        else:
+            self.failed[entry['task_id']] = entry.get('error', '')
+
+@dataclass
+class JobProgress:
+    total_tasks: int = 0
+    done_tasks: int = 0
+    failed_tasks: int = 0
+    running_tasks: int = 0
+    total_weight: int = 0
+    done_weight: int = 0
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def throughput(self) -> float:
+        return self.done_weight / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+    
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.throughput
+        if rate <= 0:
+            return None
+        return (self.total_weight - self.done_weight) / rate
+    
+    def as_dict(self) -> Dict:
+        data = asdict(self)
+        data['throughput'] = self.throughput
+        data['eta_seconds'] = self.eta_seconds
+        return data
+
+class JobScheduler:
+    def __init__(self, journal_path: str, max_workers: Optional[int] = None,
+                 resource_limits: Optional[Dict[str, int]] = None, use_processes: bool = True):
+        self.journal = JobJournal(journal_path)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.resource_limits = resource_limits or {'cpu': self.max_workers, 'io': 2}
+        self.use_processes = use_processes
+        self.tasks: List[Task] = []
+        self.progress = JobProgress()
+        self._cancelled = False
+    
+    def add(self, tasks):
+        tasks = list(tasks)
+        for task in tasks:
+            for name, amount in task.resources.items():
+                if amount > self.resource_limits.get(name, amount):
+                    raise ValueError(f"Görev kaynak sınırını aşıyor: {task.task_id} ({name}={amount}, "
+                                     f"sınır {self.resource_limits[name]})")
+        self.tasks.extend(tasks)
+    
+    def cancel(self):
+        self._cancelled = True
+    
+    def _fits(self, task: Task, in_use: Dict[str, int]) -> bool:
+        return all(in_use.get(name, 0) + amount <= self.resource_limits.get(name, amount)
+                   for name, amount in task.resources.items())
+    
+    def run(self, progress_callback: Optional[Callable[[JobProgress], None]] = None) -> Dict[str, Dict]:
+        pending = [task for task in self.tasks if task.task_id not in self.journal.completed]
+        self.progress = JobProgress(
+            total_tasks=len(pending),
+            total_weight=sum(task.weight for task in pending)
+        )
+        start_time = time.perf_counter()
+        in_use: Dict[str, int] = {}
+        running = {}
+        
+        executor_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+        with executor_class(max_workers=self.max_workers) as executor:
+            while (pending and not self._cancelled) or running:
+                if not self._cancelled:
+                    for task in list(pending):
+                        if len(running) >= self.max_workers:
+                            break
+                        if not self._fits(task, in_use):
+                            continue
+                        for name, amount in task.resources.items():
+                            in_use[name] = in_use.get(name, 0) + amount
+                        future = executor.submit(execute_task, asdict(task))
+                        running[future] = (task, time.perf_counter())
+                        pending.remove(task)
+                
+                if not running:
+                    break
+                
+                finished, _ = wait(list(running), timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task, task_start = running.pop(future)
+                    for name, amount in task.resources.items():
+                        in_use[name] -= amount
+                    
+                    entry = {'task_id': task.task_id, 'kind': task.kind,
+                             'elapsed': time.perf_counter() - task_start}
+                    try:
+                        entry['result'] = future.result()
+                        entry['status'] = 'done'
+                        self.progress.done_tasks += 1
+                    except Exception as e:
+                        entry['status'] = 'failed'
+                        entry['error'] = "".join(traceback.format_exception_only(type(e), e)).strip()
+                        self.progress.failed_tasks += 1
+                    self.progress.done_weight += task.weight
+                    self.journal.append(entry)
+                
+                self.progress.running_tasks = len(running)
+                self.progress.elapsed_seconds = time.perf_counter() - start_time
+                if progress_callback:
+                    progress_callback(self.progress)
+        
+        return {task.task_id: self.journal.completed.get(task.task_id) for task in self.tasks}
+
+def format_progress(progress: JobProgress) -> str:
+    eta = progress.eta_seconds
+    eta_text = f"{eta:.0f}s" if eta is not None else "?"
+    return (f"{progress.done_tasks + progress.failed_tasks}/{progress.total_tasks} tasks "
+            f"({progress.failed_tasks} failed, {progress.running_tasks} running) "
+            f"{progress.throughput:.1f} units/s ETA {eta_text}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hız Analiz toplu iş zamanlayıcı")
+    parser.add_argument('kind', choices=sorted(TASK_HANDLERS))
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--journal', required=True)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cpu-limit', type=int, default=None)
+    parser.add_argument('--io-limit', type=int, default=2)
+    parser.add_argument('--chunk-frames', type=int, default=1000)
+    parser.add_argument('--points-suffix', default='.hiz')
+    parser.add_argument('--use-cache', action='store_true')
+    args = parser.parse_args(argv)
+    
+    workers = args.workers or os.cpu_count() or 1
+    scheduler = JobScheduler(args.journal, workers, {'cpu': args.cpu_limit or workers, 'io': args.io_limit})
+    
+    for video_path in args.videos:
+        if args.kind == 'frame_means':
+            scheduler.add(frame_range_tasks(args.kind, video_path, args.chunk_frames))
+        elif args.kind == 'speed':
+            points_path = str(Path(video_path).with_suffix(args.points_suffix))
+            scheduler.add([video_task(args.kind, video_path, points_path=points_path)])
+        else:
+            scheduler.add([video_task(args.kind, video_path, resources={'cpu': 1, 'io': 1},
+                                      use_cache=args.use_cache)])
+    
+    skipped = sum(1 for task in scheduler.tasks if task.task_id in scheduler.journal.completed)
+    if skipped:
+        print(f"Resuming: {skipped} tasks already completed")
+    scheduler.run(lambda progress: print(format_progress(progress), flush=True))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import cv2
+import numpy as np
+
+from core.export import EXPORT_CODECS
+from core.integrity import INTEGRITY_DTYPE, frame_interval, mark_frames
+from core.video_processor import VideoProcessor
+
+DEFAULT_BUFFER_SECONDS = 30
+DEFAULT_LIVE_FPS = 30.0
+MAX_RING_BYTES = 2 * 1024 ** 3
+GAP_TOLERANCE = 1.5
+
+def parse_live_source(source: str):
+    source = source.strip()
+    if source.isdigit():
+        return int(source)
+    return source
+
+def is_stream_source(source) -> bool:
+    return isinstance(source, int) or '://' in str(source)
+
+class RealtimeFileSource:
+    def __init__(self, video_path: str, fps: Optional[float] = None, loop: bool = True):
+        self.cap = cv2.VideoCapture(video_path)
+        self.fps = float(fps or self.cap.get(cv2.CAP_PROP_FPS) or DEFAULT_LIVE_FPS)
+        self.loop = loop
+        self.frame_index = 0
+        self.start_time = None
+    
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+    
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        return self.cap.get(prop)
+    
+    def read(self):
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+        due = self.start_time + self.frame_index / self.fps
+        if due > now:
+            time.sleep(due - now)
+        else:
+            late = int((now - due) * self.fps)
+            for _ in range(late):
+                self.cap.grab()
+            self.frame_index += late
+        
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        self.frame_index += 1
+        return ret, frame
+    
+    def release(self):
+        self.cap.release()
+
+def open_live_source(source, fps: Optional[float] = None):
+    if is_stream_source(source):
+        return cv2.VideoCapture(source)
+    return RealtimeFileSource(str(source), fps)
+
+class FrameRing:
+    def __init__(self, capacity: int, shape, dtype=np.uint8):
+        self.capacity = capacity
+        self.frames = np.empty((capacity,) + tuple(shape), dtype=dtype)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.next_id = 0
+        self.held = False
+        self.overruns = 0
+        self.lock = threading.Lock()
+    
+    @property
+    def oldest_id(self) -> int:
+        return max(0, self.next_id - self.capacity)
+    
+    def __len__(self) -> int:
+        return self.next_id - self.oldest_id
+    
+    def push(self, frame: np.ndarray, timestamp: float) -> bool:
+        with self.lock:
+            if self.held:
+                self.overruns += 1
+                return False
+            slot = self.next_id % self.capacity
+            self.frames[slot] = frame
+            self.timestamps[slot] = timestamp
+            self.next_id += 1
+            return True
+    
+    def hold(self, held: bool = True):
+        with self.lock:
+            self.held = held
+    
+    def get(self, frame_id: int) -> Optional[np.ndarray]:
+        with self.lock:
+            if not self.oldest_id <= frame_id < self.next_id:
+                return None
+            return self.frames[frame_id % self.capacity].copy()
+    
+    def timestamp(self, frame_id: int) -> Optional[float]:
+        with self.lock:
+            if not self.oldest_id <= frame_id < self.next_id:
+                return None
+            return float(self.timestamps[frame_id % self.capacity])
+    
+    def timestamps_for(self, frame_ids: np.ndarray) -> np.ndarray:
+        with self.lock:
+            return self.timestamps[frame_ids % self.capacity]
+    
+    def ids_since(self, seconds: Optional[float] = None) -> np.ndarray:
+        with self.lock:
+            ids = np.arange(self.oldest_id, self.next_id, dtype=np.int64)
+            if seconds is None or len(ids) == 0:
+                return ids
+            stamps = self.timestamps[ids % self.capacity]
+            return ids[stamps >= stamps[-1] - seconds]
+
+class LiveCapture:
+    def __init__(self, source, buffer_seconds: float = DEFAULT_BUFFER_SECONDS, fps: Optional[float] = None):
+        self.source = source
+        self.buffer_seconds = buffer_seconds
+        self.cap = open_live_source(source, fps)
+        if not self.cap.isOpened():
+            self.cap.release()
+            raise ValueError("Canlı kaynak açılamadı!")
+        
+        self.nominal_fps = float(fps or self.cap.get(cv2.CAP_PROP_FPS) or DEFAULT_LIVE_FPS)
+        ret, frame = self.cap.read()
+        if not ret:
+            self.cap.release()
+            raise ValueError("Canlı kaynaktan frame okunamadı!")
+        
+        capacity = max(2, int(np.ceil(buffer_seconds * self.nominal_fps)))
+        capacity = min(capacity, max(2, MAX_RING_BYTES // frame.nbytes))
+        self.ring = FrameRing(capacity, frame.shape, frame.dtype)
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.interval_count = 0
+        self.interval_mean = 0.0
+        self.interval_m2 = 0.0
+        self.max_jitter = 0.0
+        self.last_timestamp = None
+        self.error = None
+        self._stop_event = threading.Event()
+        self._record(frame, time.perf_counter())
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    @property
+    def label(self) -> str:
+        if isinstance(self.source, int):
+            return f"Camera {self.source}"
+        return Path(str(self.source)).name if not is_stream_source(self.source) else str(self.source)
+    
+    @property
+    def shape(self):
+        return self.ring.frames.shape[1:]
+    
+    def start(self):
+        self.last_timestamp = None
+        self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self.cap.release()
+    
+    def _record(self, frame: np.ndarray, timestamp: float):
+        if self.last_timestamp is not None:
+            interval = timestamp - self.last_timestamp
+            expected = 1.0 / self.nominal_fps
+            if interval > GAP_TOLERANCE * expected:
+                self.frames_dropped += int(round(interval / expected)) - 1
+            self.max_jitter = max(self.max_jitter, abs(interval - expected))
+            self.interval_count += 1
+            delta = interval - self.interval_mean
+            self.interval_mean += delta / self.interval_count
+            self.interval_m2 += delta * (interval - self.interval_mean)
+        self.last_timestamp = timestamp
+        self.frames_captured += 1
+        if not self.ring.push(frame, timestamp):
+            self.frames_dropped += 1
+    
+    def _run(self):
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                if frame.shape != self.shape:
+                    raise ValueError("Canlı kaynak frame boyutu değişti!")
+                self._record(frame, time.perf_counter())
+        except Exception as e:
+            self.error = e
+    
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+    
+    def measured_fps(self) -> float:
+        return 1.0 / self.interval_mean if self.interval_mean > 0 else self.nominal_fps
+    
+    def stats(self) -> Dict:
+        jitter = np.sqrt(self.interval_m2 / self.interval_count) if self.interval_count > 1 else 0.0
+        return {
+            'captured': self.frames_captured,
+            'dropped': self.frames_dropped,
+            'overruns': self.ring.overruns,
+            'fps': self.measured_fps(),
+            'jitter_ms': jitter * 1000,
+            'max_jitter_ms': self.max_jitter * 1000,
+            'buffered': len(self.ring),
+            'capacity': self.ring.capacity,
+        }
+
+class LiveProcessor(VideoProcessor):
+    is_live = True
+    
+    def __init__(self, capture: LiveCapture):
+        super().__init__()
+        self.capture = capture
+        self.video_path = capture.label
+        self.fps = capture.nominal_fps
+        self.height, self.width = capture.shape[:2]
+        self.backend_name = "Live"
+        self.frame_ids = np.zeros(0, dtype=np.int64)
+        self.frame_integrity = None
+        self.paused = False
+        self.show_latest()
+    
+    def show_latest(self) -> bool:
+        ring = self.capture.ring
+        frame = ring.get(ring.next_id - 1)
+        if frame is None:
+            return False
+        self.total_frames = max(1, len(ring))
+        self.set_current_frame(self.total_frames - 1, frame)
+        return True
+    
+    def pause(self):
+        self.capture.ring.hold(True)
+        self.paused = True
+        self.frame_ids = self.capture.ring.ids_since()
+        stamps = self.capture.ring.timestamps_for(self.frame_ids)
+        records = np.zeros(len(stamps), dtype=INTEGRITY_DTYPE)
+        records['timestamp'] = stamps - stamps[0]
+        records['changed'] = 1.0
+        self.frame_integrity = mark_frames(records, self.capture.nominal_fps)
+        interval = frame_interval(stamps, self.capture.measured_fps())
+        self.fps = 1.0 / interval if interval > 0 else self.capture.measured_fps()
+        self.total_frames = len(self.frame_ids)
+        self.get_frame(self.total_frames - 1)
+    
+    def resume(self):
+        self.paused = False
+        self.frame_ids = np.zeros(0, dtype=np.int64)
+        self.frame_integrity = None
+        self.capture.ring.hold(False)
+    
+    def get_frame(self, frame_number):
+        if not self.paused or not 0 <= frame_number < len(self.frame_ids):
+            return None
+        frame = self.capture.ring.get(int(self.frame_ids[frame_number]))
+        if frame is not None:
+            self.set_current_frame(frame_number, frame)
+        return frame
+    
+    def frame_timestamp(self, frame_number):
+        if not 0 <= frame_number < len(self.frame_ids):
+            return None
+        return self.capture.ring.timestamp(int(self.frame_ids[frame_number]))
+    
+    def reopen(self, config=None):
+        return False
+    
+    def release(self):
+        self.capture.stop()
+
+class RingExporter:
+    def __init__(self, capture: LiveCapture, output_path: str, seconds: Optional[float] = None,
+                 codec: Optional[str] = None):
+        self.capture = capture
+        self.output_path = output_path
+        self.seconds = seconds
+        self.codec = codec or EXPORT_CODECS.get(Path(output_path).suffix.lower(), 'mp4v')
+        self.frame_ids = capture.ring.ids_since(seconds)
+        self.frames_written = 0
+        self._stop_event = threading.Event()
+    
+    @property
+    def total_frames(self) -> int:
+        return len(self.frame_ids)
+    
+    def cancel(self):
+        self._stop_event.set()
+    
+    def run(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        ring = self.capture.ring
+        was_held = ring.held
+        ring.hold(True)
+        start_time = time.perf_counter()
+        try:
+            if len(self.frame_ids) == 0:
+                raise ValueError("Tamponda kayıt edilecek frame yok!")
+            available = self.frame_ids[self.frame_ids >= ring.oldest_id]
+            interval = frame_interval(ring.timestamps_for(available), self.capture.measured_fps())
+            fps = 1.0 / interval if interval > 0 else self.capture.measured_fps()
+            
+            height, width = self.capture.shape[:2]
+            writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*self.codec), fps,
+                                     (width, height), len(self.capture.shape) == 3)
+            if not writer.isOpened():
+                raise ValueError(f"Çıktı dosyası oluşturulamadı: {self.output_path}")
+            try:
+                for frame_id in self.frame_ids:
+                    if self._stop_event.is_set():
+                        break
+                    frame = ring.get(int(frame_id))
+                    if frame is None:
+                        continue
+                    writer.write(frame)
+                    self.frames_written += 1
+                    if progress_callback and self.frames_written % 10 == 0:
+                        progress_callback(self.frames_written, self.total_frames)
+            finally:
+                writer.release()
+        finally:
+            ring.hold(was_held)
+        
+        elapsed = time.perf_counter() - start_time
+        return {
+            'path': self.output_path,
+            'frames': self.frames_written,
+            'seconds': elapsed,
+            'fps': self.frames_written / elapsed if elapsed > 0 else 0.0,
+            'video_fps': fps,
+            'cancelled': self._stop_event.is_set(),
+            'missing_frames': 0 if self._stop_event.is_set() else self.total_frames - self.frames_written,
+        }
@@ -0,0 +1,66 @@
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+LAST_POINT_COLOR = (0, 255, 0)
+POINT_COLOR = (0, 150, 255)
+HOVER_COLOR = (255, 0, 255)
+LINE_COLOR = (255, 200, 0)
+OUTLINE_COLOR = (255, 255, 255)
+TRACK_COLORS = ((255, 200, 0), (0, 200, 255), (120, 255, 120), (255, 120, 200), (200, 160, 255), (80, 180, 255))
+
+def draw_points(frame: np.ndarray, points: Sequence, point_size: int, origin=(0, 0), factor=1,
+                hovered=None, speed_labels: Optional[List[str]] = None) -> np.ndarray:
+    origin_x, origin_y = origin
+    scaled_size = max(1, point_size // factor)
+    
+    def to_view(point):
+        return (int((point.x - origin_x) / factor), int((point.y - origin_y) / factor))
+    
+    for i, point in enumerate(points):
+        color = LAST_POINT_COLOR if i == len(points) - 1 else POINT_COLOR
+        if point is hovered:
+            color = HOVER_COLOR
+        center = to_view(point)
+        cv2.circle(frame, center, scaled_size, color, -1)
+        cv2.circle(frame, center, scaled_size + max(1, 2 // factor), OUTLINE_COLOR, max(1, 2 // factor))
+        
+        label = f"{i+1}"
+        label_offset = (point_size + 7) // factor
+        font_scale = 0.8 / factor
+        cv2.putText(frame, label, (center[0] + label_offset, center[1] - label_offset),
+                   cv2.FONT_HERSHEY_SIMPLEX, font_scale, OUTLINE_COLOR, max(1, 2 // factor))
+        cv2.putText(frame, label, (center[0] + label_offset, center[1] - label_offset),
+                   cv2.FONT_HERSHEY_SIMPLEX, font_scale, color, 1)
+    
+    for i in range(len(points) - 1):
+        line_thickness = max(1, max(2, point_size // 4) // factor)
+        cv2.line(frame, to_view(points[i]), to_view(points[i + 1]), LINE_COLOR, line_thickness)
+    
+    if speed_labels:
+        font_scale = 0.6 / factor
+        for i, text in enumerate(speed_labels[:max(0, len(points) - 1)]):
+            start, end = to_view(points[i]), to_view(points[i + 1])
+            anchor = ((start[0] + end[0]) // 2 + 6, (start[1] + end[1]) // 2 - 6)
+            cv2.putText(frame, text, anchor, cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 0), 3)
+            cv2.putText(frame, text, anchor, cv2.FONT_HERSHEY_SIMPLEX, font_scale, LINE_COLOR, 1)
+    
+    return frame
+
+def draw_tracks(frame: np.ndarray, trails: Sequence[np.ndarray], track_ids: np.ndarray, origin=(0, 0),
+                factor=1, head_size: int = 3) -> np.ndarray:
+    origin = np.asarray(origin, dtype=np.float32)
+    colors = np.asarray(track_ids) % len(TRACK_COLORS)
+    views = [np.rint((trail - origin) / factor).astype(np.int32) for trail in trails]
+    for color_index, color in enumerate(TRACK_COLORS):
+        selected = [views[i] for i in np.flatnonzero(colors == color_index)]
+        if not selected:
+            continue
+        cv2.polylines(frame, selected, False, color, 1, cv2.LINE_AA)
+        for view in selected:
+            cv2.circle(frame, (int(view[-1, 0]), int(view[-1, 1])), max(1, head_size // factor), color, -1)
+    return frame
+
+def speed_labels_for(results: List[dict]) -> List[str]:
+    return [f"{r['speed_um_per_sec']:.1f} um/s" for r in results]
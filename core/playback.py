@@ -0,0 +1,161 @@
+import threading
+import queue
+import time
+import cv2
+
+from core.video_processor import open_capture
+
+PLAYBACK_RATES = [0.25, 0.5, 1.0, 2.0, 4.0, 8.0]
+
+class SequentialDecoder:
+    def __init__(self, video_path: str, start_frame: int, queue_size: int = 8, max_grab_skip: int = 60):
+        self.video_path = video_path
+        self.start_frame = start_frame
+        self.max_grab_skip = max_grab_skip
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.skipped_frames = 0
+        self.decoded_frames = 0
+        self.decode_seconds = 0.0
+        self.finished = False
+        self._skip_target = start_frame
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+        while True:
+            try:
+                self.frames.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+    
+    def request_skip(self, frame_number: int):
+        if frame_number > self._skip_target:
+            self._skip_target = frame_number
+    
+    @property
+    def decode_fps(self) -> float:
+        return self.decoded_frames / self.decode_seconds if self.decode_seconds > 0 else 0.0
+    
+    def get_nowait(self):
+        try:
+            return self.frames.get_nowait()
+        except queue.Empty:
+            return None
+    
+    def _put(self, item) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                self.frames.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _run(self):
+        cap = open_capture(self.video_path, mode='sequential')
+        try:
+            if not cap.isOpened():
+                return
+            if self.start_frame > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+            
+            next_number = self.start_frame
+            while not self._stop_event.is_set():
+                target = self._skip_target
+                if next_number < target:
+                    if target - next_number > self.max_grab_skip:
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                        self.skipped_frames += target - next_number
+                        next_number = target
+                        continue
+                    if not cap.grab():
+                        break
+                    self.skipped_frames += 1
+                    next_number += 1
+                    continue
+                
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                self.decode_seconds += time.perf_counter() - start
+                self.decoded_frames += 1
+                if not self._put((next_number, frame)):
+                    break
+                next_number += 1
+        finally:
+            cap.release()
+            self.finished = True
+
+class PlaybackScheduler:
+    def __init__(self, fps: float, rate: float, start_frame: int, total_frames: int):
+        self.fps = fps
+        self.rate = rate
+        self.start_frame = start_frame
+        self.total_frames = total_frames
+        self.start_time = None
+        self.pending = None
+        self.shown_frames = 0
+        self.dropped_frames = 0
+        self.late_frames = 0
+    
+    @property
+    def frame_period(self) -> float:
+        return 1.0 / (self.fps * self.rate)
+    
+    def start(self, now: float = None):
+        self.start_time = time.perf_counter() if now is None else now
+    
+    def target_frame(self, now: float) -> int:
+        return self.start_frame + int((now - self.start_time) / self.frame_period)
+    
+    def deadline(self, frame_number: int) -> float:
+        return self.start_time + (frame_number - self.start_frame) * self.frame_period
+    
+    def select(self, decoder: SequentialDecoder, now: float):
+        target = self.target_frame(now)
+        decoder.request_skip(target)
+        
+        chosen = None
+        while True:
+            item = self.pending if self.pending is not None else decoder.get_nowait()
+            self.pending = None
+            if item is None:
+                break
+            if item[0] > target:
+                self.pending = item
+                break
+            if chosen is not None:
+                self.dropped_frames += 1
+            chosen = item
+            if item[0] == target:
+                break
+        
+        if chosen is None:
+            return None
+        
+        self.shown_frames += 1
+        if now - self.deadline(chosen[0]) > self.frame_period:
+            self.late_frames += 1
+        return chosen
+    
+    def is_finished(self, decoder: SequentialDecoder, now: float) -> bool:
+        if self.target_frame(now) >= self.total_frames:
+            return True
+        return decoder.finished and self.pending is None and decoder.frames.empty()
+    
+    def get_stats(self, decoder: SequentialDecoder = None) -> dict:
+        skipped = decoder.skipped_frames if decoder else 0
+        return {
+            'shown': self.shown_frames,
+            'dropped': self.dropped_frames + skipped,
+            'late': self.late_frames
+        }
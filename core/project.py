@@ -0,0 +1,213 @@
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from core.calculator import POINT_DTYPE
+from core.sidecar import quick_hash
+
+PROJECT_VERSION = 1
+PROJECT_EXTENSION = '.hiz'
+
+OP_ADD = 1
+OP_REMOVE = 2
+OP_MOVE = 3
+OP_CLEAR = 4
+
+OP_CODES = {'add': OP_ADD, 'remove': OP_REMOVE, 'move': OP_MOVE, 'clear': OP_CLEAR}
+
+JOURNAL_DTYPE = np.dtype([('op', 'u1'), ('index', '<i4'), ('x', '<i4'), ('y', '<i4'), ('frame', '<i4')])
+
+def replay_journal(points: np.ndarray, records: np.ndarray) -> np.ndarray:
+    if len(records) == 0:
+        return points
+    
+    if np.all(records['op'] == OP_ADD):
+        added = np.empty(len(records), dtype=POINT_DTYPE)
+        added['x'] = records['x']
+        added['y'] = records['y']
+        added['frame'] = records['frame']
+        return np.concatenate([points, added])
+    
+    rows = points.tolist()
+    for op, index, x, y, frame in records.tolist():
+        if op == OP_ADD:
+            rows.append((x, y, frame))
+        elif op == OP_REMOVE and 0 <= index < len(rows):
+            rows.pop(index)
+        elif op == OP_MOVE and 0 <= index < len(rows):
+            rows[index] = (x, y, frame)
+        elif op == OP_CLEAR:
+            rows.clear()
+    return np.array(rows, dtype=POINT_DTYPE)
+
+class Project:
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.generation = 0
+        self.video_path = None
+        self.video_hash = None
+        self.calibration = {}
+        self.view = {}
+        self.sidecars = {}
+        self.created = datetime.now(timezone.utc).isoformat()
+        self._pending = []
+        self._snapshot = None
+        self._settings_dirty = False
+    
+    @property
+    def data_dir(self) -> Path:
+        return self.path.with_name(self.path.name + '.data')
+    
+    def _points_path(self, generation: int) -> Path:
+        return self.data_dir / f"points.{generation}.npy"
+    
+    def _journal_path(self, generation: int) -> Path:
+        return self.data_dir / f"journal.{generation}.bin"
+    
+    def set_video(self, video_path: str, video_hash: Optional[str] = None):
+        self.video_path = str(Path(video_path).resolve())
+        self.video_hash = video_hash or quick_hash(video_path)
+        self._settings_dirty = True
+    
+    def set_calibration(self, pixel_value: float, um_value: float, fps: Optional[float] = None):
+        calibration = {'pixel_value': pixel_value, 'um_value': um_value}
+        if fps:
+            calibration['fps'] = fps
+        if calibration != self.calibration:
+            self.calibration = calibration
+            self._settings_dirty = True
+    
+    def update_view(self, **settings):
+        if any(self.view.get(key) != value for key, value in settings.items()):
+            self.view.update(settings)
+            self._settings_dirty = True
+    
+    def link_sidecar(self, kind: str, path: str):
+        self.sidecars[kind] = str(path)
+        self._settings_dirty = True
+    
+    def resolve_video_path(self) -> Optional[str]:
+        candidates = []
+        if self.video_path:
+            candidates.append(Path(self.video_path))
+            candidates.append(self.path.parent / Path(self.video_path).name)
+        for candidate in candidates:
+            if candidate.exists():
+                return str(candidate)
+        return None
+    
+    def verify_video(self, video_path: str) -> bool:
+        return self.video_hash is None or quick_hash(video_path) == self.video_hash
+    
+    def _metadata(self) -> dict:
+        video_relative = None
+        if self.video_path:
+            try:
+                video_relative = os.path.relpath(self.video_path, self.path.parent)
+            except ValueError:
+                video_relative = None
+        return {
+            'version': PROJECT_VERSION,
+            'generation': self.generation,
+            'created': self.created,
+            'saved': datetime.now(timezone.utc).isoformat(),
+            'video': {'path': self.video_path, 'relative_path': video_relative, 'hash': self.video_hash},
+            'calibration': self.calibration,
+            'view': self.view,
+            'sidecars': self.sidecars,
+        }
+    
+    def _write_metadata(self):
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._metadata(), f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._settings_dirty = False
+    
+    def save(self, points: np.ndarray):
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        old_generation = self.generation
+        new_generation = old_generation + 1
+        
+        with open(self._points_path(new_generation), 'wb') as f:
+            np.save(f, np.ascontiguousarray(points, dtype=POINT_DTYPE))
+        open(self._journal_path(new_generation), 'wb').close()
+        
+        self.generation = new_generation
+        self._pending.clear()
+        self._snapshot = None
+        self._write_metadata()
+        
+        for stale in (self._points_path(old_generation), self._journal_path(old_generation)):
+            if stale.exists():
+                stale.unlink()
+    
+    def record(self, op: str, index: int, point=None):
+        if op == 'load':
+            self._snapshot = point.copy()
+            self._pending.clear()
+            return
+        code = OP_CODES.get(op)
+        if code is None:
+            return
+        if point is None:
+            self._pending.append((code, index, 0, 0, 0))
+        else:
+            self._pending.append((code, index, point.x, point.y, point.frame_number))
+    
+    def has_pending(self) -> bool:
+        return bool(self._pending) or self._snapshot is not None or self._settings_dirty
+    
+    def flush(self):
+        if self.generation == 0:
+            return
+        if self._snapshot is not None:
+            pending = list(self._pending)
+            self.save(self._snapshot)
+            self._pending.extend(pending)
+        if self._pending:
+            records = np.array(self._pending, dtype=JOURNAL_DTYPE)
+            with open(self._journal_path(self.generation), 'ab') as f:
+                f.write(records.tobytes())
+            self._pending.clear()
+        if self._settings_dirty:
+            self._write_metadata()
+    
+    @classmethod
+    def load(cls, path: str):
+        project = cls(path)
+        with open(project.path, encoding='utf-8') as f:
+            metadata = json.load(f)
+        
+        if metadata.get('version', 0) > PROJECT_VERSION:
+            raise ValueError("Proje dosyası bu sürümden daha yeni!")
+        
+        video = metadata.get('video', {})
+        project.generation = metadata.get('generation', 0)
+        project.created = metadata.get('created', project.created)
+        project.video_path = video.get('path')
+        project.video_hash = video.get('hash')
+        if video.get('relative_path') and not (project.video_path and Path(project.video_path).exists()):
+            relative = (project.path.parent / video['relative_path']).resolve()
+            if relative.exists():
+                project.video_path = str(relative)
+        project.calibration = metadata.get('calibration', {})
+        project.view = metadata.get('view', {})
+        project.sidecars = metadata.get('sidecars', {})
+        
+        points = np.empty(0, dtype=POINT_DTYPE)
+        points_path = project._points_path(project.generation)
+        if points_path.exists():
+            points = np.load(points_path)
+        
+        journal_path = project._journal_path(project.generation)
+        if journal_path.exists():
+            usable = journal_path.stat().st_size // JOURNAL_DTYPE.itemsize
+            records = np.fromfile(journal_path, dtype=JOURNAL_DTYPE, count=usable)
+            points = replay_journal(points, records)
+        
+        return project, points
@@ -0,0 +1,253 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.sidecar import SidecarCache
+from core.video_processor import open_capture
+
+PROJECTION_KINDS = ('max', 'min', 'mean', 'std')
+PROJECTION_CHUNK_FRAMES = 256
+MIN_SEGMENT_FRAMES = 2000
+STRETCH_PERCENTILES = (0.5, 99.5)
+
+@dataclass
+class ProjectionStats:
+    count: int
+    mean: np.ndarray
+    m2: np.ndarray
+    maximum: np.ndarray
+    minimum: np.ndarray
+    
+    @classmethod
+    def from_sums(cls, count: int, total: np.ndarray, squares: np.ndarray,
+                  maximum: np.ndarray, minimum: np.ndarray) -> 'ProjectionStats':
+        mean = total / count
+        return cls(count, mean, np.maximum(squares - total * mean, 0), maximum.copy(), minimum.copy())
+    
+    def merge(self, other: Optional['ProjectionStats']) -> 'ProjectionStats':
+        if other is None or other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * (other.count / count)
+        m2 = self.m2 + other.m2 + delta * delta * (self.count * other.count / count)
+        return ProjectionStats(count, mean, m2, np.maximum(self.maximum, other.maximum),
+                               np.minimum(self.minimum, other.minimum))
+    
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.m2 / self.count) if self.count else np.zeros_like(self.m2)
+    
+    def images(self) -> np.ndarray:
+        return np.stack([self.maximum.astype(np.float32), self.minimum.astype(np.float32),
+                         self.mean.astype(np.float32), self.std.astype(np.float32)])
+
+def _gray(frame: np.ndarray) -> np.ndarray:
+    if frame.ndim == 3 and frame.shape[2] == 1:
+        return np.ascontiguousarray(frame[..., 0])
+    if frame.ndim == 3:
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return frame
+
+def accumulate_range(video_path: str, start: int, end: int, step: int = 1, fps: Optional[float] = None,
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     is_cancelled: Optional[Callable[[], bool]] = None,
+                     chunk_frames: int = PROJECTION_CHUNK_FRAMES) -> Optional[ProjectionStats]:
+    cap = open_capture(video_path, fps, mode='sequential')
+    if not cap.isOpened():
+        raise ValueError("Video dosyası açılamadı!")
+    
+    stats = None
+    total = squares = maximum = minimum = None
+    filled = 0
+    done = 0
+    
+    def flush():
+        nonlocal stats, filled
+        chunk = ProjectionStats.from_sums(filled, total, squares, maximum, minimum)
+        stats = chunk if stats is None else stats.merge(chunk)
+        total.fill(0)
+        squares.fill(0)
+        filled = 0
+    
+    try:
+        if start > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        for frame_number in range(start, end + 1):
+            if (frame_number - start) % step:
+                if not cap.grab():
+                    break
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            gray = _gray(frame)
+            if total is None:
+                total = np.zeros(gray.shape, dtype=np.float64)
+                squares = np.zeros(gray.shape, dtype=np.float64)
+                maximum = gray.copy()
+                minimum = gray.copy()
+            
+            cv2.accumulate(gray, total)
+            cv2.accumulateSquare(gray, squares)
+            np.maximum(maximum, gray, out=maximum)
+            np.minimum(minimum, gray, out=minimum)
+            filled += 1
+            done += 1
+            if filled == chunk_frames:
+                flush()
+                if is_cancelled and is_cancelled():
+                    return None
+                if progress_callback:
+                    progress_callback(done, (end - start) // step + 1)
+        if filled:
+            flush()
+    finally:
+        cap.release()
+    return stats
+
+_worker_cancel = None
+
+def _attach_cancel(event):
+    global _worker_cancel
+    _worker_cancel = event
+
+def accumulate_segment(video_path: str, start: int, end: int, step: int = 1,
+                       fps: Optional[float] = None) -> Optional[ProjectionStats]:
+    return accumulate_range(video_path, start, end, step, fps, is_cancelled=_worker_cancel.is_set)
+
+def projection_cache_key(start: int, end: int, step: int) -> str:
+    return f"projection_{start}-{end}_s{step}"
+
+def projection_image(images: np.ndarray, kind: str) -> np.ndarray:
+    image = np.asarray(images[PROJECTION_KINDS.index(kind)], dtype=np.float32)
+    low, high = np.percentile(image[::4, ::4], STRETCH_PERCENTILES)
+    scale = 255.0 / (high - low) if high > low else 1.0
+    stretched = cv2.convertScaleAbs(image, alpha=scale, beta=-low * scale)
+    if kind == 'std':
+        return cv2.applyColorMap(stretched, cv2.COLORMAP_INFERNO)
+    return cv2.cvtColor(stretched, cv2.COLOR_GRAY2BGR)
+
+def split_range(start: int, end: int, step: int, segments: int) -> List[Tuple[int, int]]:
+    samples = (end - start) // step + 1
+    per_segment = -(-samples // max(1, segments))
+    ranges = []
+    for first in range(0, samples, per_segment):
+        last = min(samples, first + per_segment) - 1
+        ranges.append((start + first * step, start + last * step))
+    return ranges
+
+class ProjectionBuilder:
+    def __init__(self, video_path: str, start_frame: int, end_frame: int, step: int = 1,
+                 fps: Optional[float] = None, workers: Optional[int] = None, cache_root: Optional[str] = None):
+        self.video_path = video_path
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.step = max(1, step)
+        self.fps = fps
+        self.cache_root = cache_root
+        samples = (end_frame - start_frame) // self.step + 1
+        self.workers = max(1, min(workers or os.cpu_count() or 1, samples // MIN_SEGMENT_FRAMES or 1))
+        self.frames_done = 0
+        self._stop_event = threading.Event()
+    
+    @property
+    def total_frames(self) -> int:
+        return (self.end_frame - self.start_frame) // self.step + 1
+    
+    @property
+    def cache_key(self) -> str:
+        return projection_cache_key(self.start_frame, self.end_frame, self.step)
+    
+    def cancel(self):
+        self._stop_event.set()
+    
+    def cache(self) -> Optional[SidecarCache]:
+        try:
+            return SidecarCache(self.video_path, root=self.cache_root)
+        except OSError:
+            return None
+    
+    def _progress(self, progress_callback, done):
+        self.frames_done = done
+        if progress_callback:
+            progress_callback(done, self.total_frames)
+    
+    def _run_serial(self, progress_callback) -> Optional[ProjectionStats]:
+        return accumulate_range(self.video_path, self.start_frame, self.end_frame, self.step, self.fps,
+                                lambda done, total: self._progress(progress_callback, done),
+                                self._stop_event.is_set)
+    
+    def _run_parallel(self, progress_callback) -> Optional[ProjectionStats]:
+        segments = split_range(self.start_frame, self.end_frame, self.step, self.workers * 2)
+        results: Dict[int, ProjectionStats] = {}
+        done = 0
+        context = multiprocessing.get_context('spawn')
+        cancel_event = context.Event()
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                       initializer=_attach_cancel, initargs=(cancel_event,))
+        try:
+            futures = {executor.submit(accumulate_segment, self.video_path, first, last, self.step, self.fps): index
+                       for index, (first, last) in enumerate(segments)}
+            pending = set(futures)
+            while pending:
+                if self._stop_event.is_set():
+                    cancel_event.set()
+                    return None
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = futures[future]
+                    results[index] = future.result()
+                    first, last = segments[index]
+                    done += (last - first) // self.step + 1
+                    self._progress(progress_callback, done)
+        finally:
+            cancel_event.set()
+            executor.shutdown(wait=not self._stop_event.is_set(), cancel_futures=True)
+        
+        stats = None
+        for index in sorted(results):
+            if results[index] is not None:
+                stats = results[index] if stats is None else stats.merge(results[index])
+        return stats
+    
+    def run(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        start_time = time.perf_counter()
+        cache = self.cache()
+        images = None
+        count = 0
+        meta = cache.load_json(self.cache_key) if cache is not None else None
+        if meta is not None:
+            images = cache.load_array(self.cache_key, mmap=True)
+            count = meta['frames']
+        cached = images is not None
+        
+        if not cached:
+            run = self._run_serial if self.workers == 1 else self._run_parallel
+            stats = run(progress_callback)
+            if not self._stop_event.is_set():
+                if stats is None or stats.count == 0:
+                    raise ValueError("Projeksiyon aralığında frame okunamadı!")
+                images = stats.images()
+                count = stats.count
+                if cache is not None:
+                    cache.save_array(self.cache_key, images)
+                    cache.save_json(self.cache_key, {'frames': count})
+        
+        elapsed = time.perf_counter() - start_time
+        return {
+            'key': self.cache_key,
+            'images': images,
+            'frames': count,
+            'seconds': elapsed,
+            'fps': count / elapsed if elapsed > 0 and not cached else 0.0,
+            'cached': cached,
+            'cancelled': self._stop_event.is_set() and not cached,
+        }
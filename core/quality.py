@@ -0,0 +1,84 @@
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from core.video_processor import scan_frames
+
+QUALITY_DTYPE = np.dtype([('sharpness', '<f4'), ('brightness', '<f4')])
+QUALITY_WIDTH = 480
+QUALITY_CHUNK_FRAMES = 32
+SHARPNESS_RATIO = 0.5
+MIN_BRIGHTNESS = 10.0
+MAX_BRIGHTNESS = 245.0
+
+def score_chunk(stack: np.ndarray) -> np.ndarray:
+    wide = stack.astype(np.int16)
+    laplacian = (wide[:, :-2, 1:-1] + wide[:, 2:, 1:-1] + wide[:, 1:-1, :-2] + wide[:, 1:-1, 2:]
+                 - 4 * wide[:, 1:-1, 1:-1])
+    scores = np.empty(len(stack), dtype=QUALITY_DTYPE)
+    scores['sharpness'] = laplacian.reshape(len(stack), -1).astype(np.float32).var(axis=1)
+    scores['brightness'] = stack.reshape(len(stack), -1).mean(axis=1)
+    return scores
+
+class QualityAnalyser:
+    def __init__(self, width: int = QUALITY_WIDTH, chunk_frames: int = QUALITY_CHUNK_FRAMES):
+        self.width = width
+        self.chunk_frames = chunk_frames
+        self.chunks = []
+        self.stack = None
+        self.filled = 0
+    
+    def start(self, cap):
+        pass
+    
+    def add(self, frame: np.ndarray, timestamp: float = 0.0):
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        stack = self.stack
+        if stack is None:
+            scaled_width = min(self.width, frame.shape[1])
+            scaled_height = max(3, round(frame.shape[0] * scaled_width / frame.shape[1]))
+            stack = self.stack = np.empty((self.chunk_frames, scaled_height, max(3, scaled_width)), dtype=np.uint8)
+        if frame.shape[1] != stack.shape[2] or frame.shape[0] != stack.shape[1]:
+            frame = cv2.resize(frame, (stack.shape[2], stack.shape[1]), interpolation=cv2.INTER_AREA)
+        
+        stack[self.filled] = frame
+        self.filled += 1
+        if self.filled == self.chunk_frames:
+            self.chunks.append(score_chunk(stack))
+            self.filled = 0
+    
+    def result(self) -> np.ndarray:
+        chunks = self.chunks + ([score_chunk(self.stack[:self.filled])] if self.filled else [])
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=QUALITY_DTYPE)
+
+def compute_quality(video_path: str, progress_callback: Optional[Callable[[int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None, width: int = QUALITY_WIDTH,
+                    chunk_frames: int = QUALITY_CHUNK_FRAMES) -> Optional[np.ndarray]:
+    analyser = QualityAnalyser(width, chunk_frames)
+    if scan_frames(video_path, [analyser], progress_callback, is_cancelled) is None:
+        return None
+    return analyser.result()
+
+def low_quality_mask(scores: np.ndarray, sharpness_ratio: float = SHARPNESS_RATIO) -> np.ndarray:
+    if len(scores) == 0:
+        return np.zeros(0, dtype=bool)
+    sharpness = scores['sharpness']
+    brightness = scores['brightness']
+    threshold = float(np.median(sharpness)) * sharpness_ratio
+    return (sharpness < threshold) | (brightness < MIN_BRIGHTNESS) | (brightness > MAX_BRIGHTNESS)
+
+def next_good_frame(mask: np.ndarray, current: int, step: int, last_frame: int) -> int:
+    target = min(max(0, current + step), last_frame)
+    if mask is None or len(mask) <= target:
+        return target
+    
+    if step > 0:
+        good = np.flatnonzero(~mask[target:last_frame + 1])
+        if len(good):
+            return target + int(good[0])
+        return len(mask) if len(mask) <= last_frame else current
+    
+    good = np.flatnonzero(~mask[:target + 1])
+    return int(good[-1]) if len(good) else current
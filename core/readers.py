@@ -0,0 +1,391 @@
+import os
+import re
+import struct
+import zipfile
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+TIFF_EXTENSIONS = ('.tif', '.tiff')
+IMAGE_EXTENSIONS = TIFF_EXTENSIONS + ('.png', '.jpg', '.jpeg', '.bmp')
+CROP_STORE_EXTENSION = '.npz'
+DEFAULT_PREFETCH = 8
+
+TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8, 13: 4, 16: 8, 17: 8, 18: 8}
+TIFF_TYPE_FORMATS = {1: 'B', 3: 'H', 4: 'I', 6: 'b', 8: 'h', 9: 'i', 13: 'I', 16: 'Q', 17: 'q', 18: 'Q'}
+
+TAG_WIDTH = 256
+TAG_HEIGHT = 257
+TAG_BITS = 258
+TAG_COMPRESSION = 259
+TAG_PHOTOMETRIC = 262
+TAG_DESCRIPTION = 270
+TAG_STRIP_OFFSETS = 273
+TAG_SAMPLES = 277
+TAG_STRIP_BYTE_COUNTS = 279
+TAG_PLANAR = 284
+TAG_TILE_WIDTH = 322
+TAG_SAMPLE_FORMAT = 339
+
+def is_image_input(path: str) -> bool:
+    return Path(path).suffix.lower() in IMAGE_EXTENSIONS
+
+def is_crop_store(path: str) -> bool:
+    return Path(path).suffix.lower() == CROP_STORE_EXTENSION
+
+def is_reader_input(path: str) -> bool:
+    return is_image_input(path) or is_crop_store(path)
+
+def find_sequence(path: str) -> List[str]:
+    path = Path(path)
+    match = re.match(r'^(.*?)(\d+)$', path.stem)
+    if not match:
+        return [str(path)]
+    
+    prefix = match.group(1)
+    pattern = re.compile(rf'^{re.escape(prefix)}(\d+){re.escape(path.suffix)}$', re.IGNORECASE)
+    numbered = []
+    for entry in os.scandir(path.parent):
+        found = pattern.match(entry.name)
+        if found and entry.is_file():
+            numbered.append((int(found.group(1)), entry.path))
+    numbered.sort()
+    return [entry_path for _, entry_path in numbered] or [str(path)]
+
+def fps_from_description(description: Optional[str]) -> Optional[float]:
+    if not description:
+        return None
+    match = re.search(r'\bfinterval=([0-9.eE+-]+)', description)
+    if match:
+        interval = float(match.group(1))
+        return 1.0 / interval if interval > 0 else None
+    match = re.search(r'\bfps=([0-9.eE+-]+)', description)
+    if match and float(match.group(1)) > 0:
+        return float(match.group(1))
+    return None
+
+def parse_tiff(path: str, max_pages: Optional[int] = None) -> Dict:
+    with open(path, 'rb') as f:
+        header = f.read(16)
+        if header[:2] == b'II':
+            order = '<'
+        elif header[:2] == b'MM':
+            order = '>'
+        else:
+            raise ValueError("Geçersiz TIFF dosyası!")
+        
+        version = struct.unpack(order + 'H', header[2:4])[0]
+        if version == 42:
+            offset_format, count_format, entry_size = 'I', 'H', 12
+            next_offset = struct.unpack(order + 'I', header[4:8])[0]
+        elif version == 43:
+            offset_format, count_format, entry_size = 'Q', 'Q', 20
+            next_offset = struct.unpack(order + 'Q', header[8:16])[0]
+        else:
+            raise ValueError("Geçersiz TIFF dosyası!")
+        
+        offset_size = struct.calcsize(offset_format)
+        count_size = struct.calcsize(count_format)
+        pages = []
+        
+        while next_offset and (max_pages is None or len(pages) < max_pages):
+            f.seek(next_offset)
+            entry_count = struct.unpack(order + count_format, f.read(count_size))[0]
+            block = f.read(entry_count * entry_size + offset_size)
+            tags = {}
+            
+            for i in range(entry_count):
+                entry = block[i * entry_size:(i + 1) * entry_size]
+                tag, kind = struct.unpack(order + 'HH', entry[:4])
+                count = struct.unpack(order + offset_format, entry[4:4 + offset_size])[0]
+                payload = entry[4 + offset_size:]
+                size = TIFF_TYPE_SIZES.get(kind, 1) * count
+                
+                if size > len(payload):
+                    value_offset = struct.unpack(order + offset_format, payload)[0]
+                    position = f.tell()
+                    f.seek(value_offset)
+                    payload = f.read(size)
+                    f.seek(position)
+                
+                if kind == 2:
+                    tags[tag] = payload[:size].rstrip(b'\0').decode('utf-8', 'replace')
+                elif kind in TIFF_TYPE_FORMATS:
+                    tags[tag] = struct.unpack(order + TIFF_TYPE_FORMATS[kind] * count, payload[:size])
+            
+            pages.append(tags)
+            next_offset = struct.unpack(order + offset_format, block[entry_count * entry_size:])[0]
+    
+    return {'byte_order': order, 'pages': pages}
+
+def to_display_frame(image: np.ndarray, shift: int = 0, rgb: bool = False) -> np.ndarray:
+    if image.dtype == np.uint16:
+        image = cv2.convertScaleAbs(image, alpha=1.0 / (1 << shift))
+    elif image.dtype != np.uint8:
+        image = cv2.normalize(image, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+    
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_RGBA2BGR if rgb else cv2.COLOR_BGRA2BGR)
+    if rgb:
+        return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    return image
+
+class FrameReader(ABC):
+    def __init__(self, frame_count: int, fps: Optional[float] = None, workers: int = 0,
+                 prefetch: int = DEFAULT_PREFETCH):
+        self.frame_count = frame_count
+        self.fps = fps
+        self.width = 0
+        self.height = 0
+        self.position = 0
+        self.shift = 0
+        self.prefetch = prefetch
+        self._grabbed = None
+        self._futures = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers) if workers > 0 else None
+    
+    @abstractmethod
+    def _decode(self, frame_number: int) -> np.ndarray:
+        pass
+    
+    def _is_rgb(self) -> bool:
+        return False
+    
+    def _display(self, frame_number: int) -> np.ndarray:
+        return to_display_frame(self._decode(frame_number), self.shift, self._is_rgb())
+    
+    def _probe(self):
+        first = self._decode(0)
+        self.height, self.width = first.shape[:2]
+        if first.dtype == np.uint16:
+            samples = {0, self.frame_count // 2, self.frame_count - 1}
+            peak = max(int(self._decode(n).max()) for n in samples)
+            self.shift = max(0, peak.bit_length() - 8)
+    
+    def read_frame(self, frame_number: int) -> np.ndarray:
+        if self._executor is None:
+            return self._display(frame_number)
+        
+        future = self._futures.pop(frame_number, None)
+        if future is None:
+            future = self._executor.submit(self._display, frame_number)
+        
+        window_end = min(frame_number + self.prefetch, self.frame_count - 1)
+        for stale in [n for n in self._futures if n < frame_number or n > window_end]:
+            self._futures.pop(stale).cancel()
+        for upcoming in range(frame_number + 1, window_end + 1):
+            if upcoming not in self._futures:
+                self._futures[upcoming] = self._executor.submit(self._display, upcoming)
+        return future.result()
+    
+    def isOpened(self) -> bool:
+        return self.frame_count > 0
+    
+    def getBackendName(self) -> str:
+        return type(self).__name__
+    
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps or 0)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        return 0.0
+    
+    def set(self, prop: int, value: float) -> bool:
+        if prop != cv2.CAP_PROP_POS_FRAMES:
+            return False
+        self.position = min(max(0, int(value)), self.frame_count)
+        return True
+    
+    def grab(self) -> bool:
+        if self.position >= self.frame_count:
+            self._grabbed = None
+            return False
+        self._grabbed = self.position
+        self.position += 1
+        return True
+    
+    def retrieve(self):
+        if self._grabbed is None:
+            return False, None
+        try:
+            return True, self.read_frame(self._grabbed)
+        except (OSError, ValueError, cv2.error):
+            return False, None
+    
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+    
+    def release(self):
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+class ImageSequenceReader(FrameReader):
+    def __init__(self, paths: List[str], fps: Optional[float] = None, workers: Optional[int] = None,
+                 prefetch: int = DEFAULT_PREFETCH):
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1)
+        super().__init__(len(paths), fps, workers, prefetch)
+        self.paths = paths
+        if self.fps is None and paths and Path(paths[0]).suffix.lower() in TIFF_EXTENSIONS:
+            try:
+                pages = parse_tiff(paths[0], max_pages=1)['pages']
+                self.fps = fps_from_description(pages[0].get(TAG_DESCRIPTION))
+            except (OSError, ValueError, struct.error):
+                pass
+        if paths:
+            self._probe()
+    
+    def _decode(self, frame_number: int) -> np.ndarray:
+        image = cv2.imread(self.paths[frame_number], cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError(f"Görüntü okunamadı: {self.paths[frame_number]}")
+        return image
+
+class TiffStackReader(FrameReader):
+    def __init__(self, path: str, fps: Optional[float] = None, workers: Optional[int] = None,
+                 prefetch: int = DEFAULT_PREFETCH):
+        info = parse_tiff(path)
+        pages = info['pages']
+        first = pages[0] if pages else {}
+        description = first.get(TAG_DESCRIPTION)
+        
+        self.path = path
+        self.photometric = first.get(TAG_PHOTOMETRIC, (1,))[0]
+        self.page_offsets = self._contiguous_offsets(pages, description)
+        self.memmap = None
+        
+        if self.page_offsets is not None:
+            bits = first[TAG_BITS][0]
+            samples = first.get(TAG_SAMPLES, (1,))[0]
+            sample_format = first.get(TAG_SAMPLE_FORMAT, (1,))[0]
+            kind = {1: 'u', 2: 'i', 3: 'f'}.get(sample_format, 'u')
+            self.page_dtype = np.dtype(f"{info['byte_order']}{kind}{bits // 8}")
+            self.page_shape = (first[TAG_HEIGHT][0], first[TAG_WIDTH][0]) + ((samples,) if samples > 1 else ())
+            self.memmap = np.memmap(path, dtype=np.uint8, mode='r')
+            frame_count = len(self.page_offsets)
+            workers = 0
+        else:
+            frame_count = len(pages)
+            if workers is None:
+                workers = min(4, os.cpu_count() or 1)
+        
+        super().__init__(frame_count, fps or fps_from_description(description), workers, prefetch)
+        if frame_count:
+            self._probe()
+    
+    @staticmethod
+    def _contiguous_offsets(pages: List[Dict], description: Optional[str]) -> Optional[List[int]]:
+        offsets = []
+        page_size = None
+        for tags in pages:
+            if (tags.get(TAG_COMPRESSION, (1,))[0] != 1 or tags.get(TAG_PLANAR, (1,))[0] != 1
+                    or TAG_TILE_WIDTH in tags or TAG_STRIP_OFFSETS not in tags):
+                return None
+            strip_offsets = tags[TAG_STRIP_OFFSETS]
+            strip_counts = tags[TAG_STRIP_BYTE_COUNTS]
+            for i in range(1, len(strip_offsets)):
+                if strip_offsets[i] != strip_offsets[i - 1] + strip_counts[i - 1]:
+                    return None
+            page_size = sum(strip_counts)
+            offsets.append(strip_offsets[0])
+        
+        if len(offsets) == 1 and description:
+            match = re.search(r'\bimages=(\d+)', description)
+            if match:
+                offsets = [offsets[0] + i * page_size for i in range(int(match.group(1)))]
+        return offsets
+    
+    def _is_rgb(self) -> bool:
+        return self.memmap is not None and self.photometric == 2
+    
+    def page_array(self, frame_number: int) -> np.ndarray:
+        start = self.page_offsets[frame_number]
+        size = int(np.prod(self.page_shape)) * self.page_dtype.itemsize
+        page = self.memmap[start:start + size].view(self.page_dtype).reshape(self.page_shape)
+        if not self.page_dtype.isnative:
+            return page.astype(self.page_dtype.newbyteorder('='))
+        return page
+    
+    def _decode(self, frame_number: int) -> np.ndarray:
+        if self.memmap is not None:
+            page = self.page_array(frame_number)
+            if self.photometric == 0 and page.dtype.kind == 'u':
+                return np.iinfo(page.dtype).max - page
+            return page
+        
+        ret, pages = cv2.imreadmulti(self.path, frame_number, 1, flags=cv2.IMREAD_UNCHANGED)
+        if not ret or not pages:
+            raise ValueError(f"TIFF sayfası okunamadı: {frame_number}")
+        return pages[0]
+    
+    def release(self):
+        super().release()
+        self.memmap = None
+
+class CropStoreReader(FrameReader):
+    def __init__(self, path: str, fps: Optional[float] = None, prefetch: int = DEFAULT_PREFETCH):
+        self.path = path
+        self.store = zipfile.ZipFile(path)
+        header = self.member('header')
+        self.chunk_frames = int(header[1])
+        self._chunk_index = None
+        self._chunk = None
+        super().__init__(int(header[0]), fps or float(header[2]) or None, 0, prefetch)
+        if self.frame_count:
+            self._probe()
+    
+    def member(self, name: str) -> np.ndarray:
+        with self.store.open(f"{name}.npy") as f:
+            return np.lib.format.read_array(f)
+    
+    def _decode(self, frame_number: int) -> np.ndarray:
+        index = frame_number // self.chunk_frames
+        if index != self._chunk_index:
+            self._chunk = self.member(f"chunk_{index:05d}")
+            self._chunk_index = index
+        return self._chunk[frame_number - index * self.chunk_frames]
+    
+    def release(self):
+        super().release()
+        self._chunk = None
+        self.store.close()
+
+def image_input_fps(path: str) -> Optional[float]:
+    if Path(path).suffix.lower() not in TIFF_EXTENSIONS:
+        return None
+    try:
+        pages = parse_tiff(path, max_pages=1)['pages']
+    except (OSError, ValueError, struct.error):
+        return None
+    return fps_from_description(pages[0].get(TAG_DESCRIPTION)) if pages else None
+
+def open_image_input(path: str, fps: Optional[float] = None) -> FrameReader:
+    if Path(path).suffix.lower() in TIFF_EXTENSIONS:
+        reader = TiffStackReader(path, fps)
+        if reader.frame_count > 1:
+            return reader
+        sequence = find_sequence(path)
+        if len(sequence) <= 1:
+            return reader
+        reader.release()
+        return ImageSequenceReader(sequence, fps)
+    return ImageSequenceReader(find_sequence(path), fps)
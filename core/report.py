@@ -0,0 +1,344 @@
+import argparse
+import base64
+import html
+import io
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from core.calculator import SpeedCalculator
+
+REPORT_FORMATS = ('.html', '.pdf')
+REPORT_DPI = 90
+MAX_HISTOGRAM_BINS = 50
+PDF_PAGE_SIZE = (8.27, 11.69)
+
+@dataclass
+class TrackSeries:
+    label: str
+    time_seconds: np.ndarray
+    speed_um_per_sec: np.ndarray
+    distance_um: np.ndarray
+    duration_seconds: np.ndarray
+    low_quality: np.ndarray
+    
+    @property
+    def pairs(self) -> int:
+        return len(self.speed_um_per_sec)
+
+@dataclass
+class VideoSeries:
+    name: str
+    fps: Optional[float] = None
+    tracks: List[TrackSeries] = field(default_factory=list)
+    
+    @property
+    def speeds(self) -> np.ndarray:
+        if not self.tracks:
+            return np.zeros(0)
+        return np.concatenate([track.speed_um_per_sec for track in self.tracks])
+
+def series_from_calculator(name: str, calculator: SpeedCalculator,
+                           tracks: Optional[Dict[str, SpeedCalculator]] = None) -> VideoSeries:
+    tracks = tracks if tracks is not None else {'1': calculator}
+    series = VideoSeries(name, calculator.fps)
+    for label, track_calculator in tracks.items():
+        results = track_calculator.calculate_all_consecutive()
+        frames = np.array([(r['point1'].frame_number + r['point2'].frame_number) / 2 for r in results],
+                          dtype=np.float64)
+        fps = track_calculator.fps
+        series.tracks.append(TrackSeries(
+            str(label),
+            frames / fps if fps > 0 else frames,
+            np.array([r['speed_um_per_sec'] for r in results], dtype=np.float64),
+            np.array([r['distance_um'] for r in results], dtype=np.float64),
+            np.array([r['time_seconds'] for r in results], dtype=np.float64),
+            np.array([r['low_quality'] for r in results], dtype=bool),
+        ))
+    return series
+
+def series_from_rows(rows) -> List[VideoSeries]:
+    videos = []
+    for video_path, video_rows in groupby(rows, key=lambda row: row['video']):
+        series = VideoSeries(Path(video_path).name)
+        for (session_id, track_id), track_rows in groupby(video_rows,
+                                                          key=lambda row: (row['session_id'], row['track_id'])):
+            data = np.array([(row['frame1'], row['frame2'], row['frame_diff'], row['time_seconds'],
+                              row['distance_um'], row['speed_um_per_sec']) for row in track_rows],
+                            dtype=np.float64)
+            frame1, frame2, frame_diff, duration, distance, speed = data.T
+            seconds_per_frame = np.divide(duration, frame_diff, out=np.zeros_like(duration), where=frame_diff > 0)
+            series.tracks.append(TrackSeries(
+                f"S{session_id}/T{track_id}", (frame1 + frame2) / 2 * seconds_per_frame,
+                speed, distance, duration, np.zeros(len(speed), dtype=bool),
+            ))
+        videos.append(series)
+    return videos
+
+def track_summary(track: TrackSeries) -> Dict:
+    speeds = track.speed_um_per_sec
+    return {
+        'label': track.label,
+        'pairs': track.pairs,
+        'mean': float(speeds.mean()) if track.pairs else 0.0,
+        'median': float(np.median(speeds)) if track.pairs else 0.0,
+        'std': float(speeds.std()) if track.pairs else 0.0,
+        'min': float(speeds.min()) if track.pairs else 0.0,
+        'max': float(speeds.max()) if track.pairs else 0.0,
+        'distance_um': float(track.distance_um.sum()),
+        'time_seconds': float(track.duration_seconds.sum()),
+        'low_quality': int(track.low_quality.sum()),
+    }
+
+def _figure_png(figure: Figure) -> bytes:
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', dpi=REPORT_DPI)
+    return buffer.getvalue()
+
+def histogram_bins(values: np.ndarray) -> int:
+    return int(min(MAX_HISTOGRAM_BINS, max(5, np.sqrt(len(values)))))
+
+def render_video_plots(series: VideoSeries) -> bytes:
+    figure = Figure(figsize=(10, 3.6))
+    figure.subplots_adjust(left=0.07, right=0.98, bottom=0.14, top=0.9, wspace=0.2)
+    time_ax, hist_ax = figure.subplots(1, 2, width_ratios=(3, 2))
+    
+    for track in series.tracks:
+        time_ax.plot(track.time_seconds, track.speed_um_per_sec, marker='o', markersize=3,
+                     linewidth=1, label=track.label)
+        if track.low_quality.any():
+            time_ax.plot(track.time_seconds[track.low_quality], track.speed_um_per_sec[track.low_quality],
+                         linestyle='none', marker='x', color='red')
+    time_ax.set_title("Speed over time")
+    time_ax.set_xlabel("Time (s)")
+    time_ax.set_ylabel("Speed (µm/s)")
+    time_ax.grid(alpha=0.3)
+    if 1 < len(series.tracks) <= 10:
+        time_ax.legend(fontsize='small')
+    
+    speeds = series.speeds
+    if len(speeds):
+        hist_ax.hist(speeds, bins=histogram_bins(speeds), color='#4a90d9', edgecolor='white')
+    hist_ax.set_title("Speed distribution")
+    hist_ax.set_xlabel("Speed (µm/s)")
+    hist_ax.set_ylabel("Pairs")
+    return _figure_png(figure)
+
+def render_overview_plot(means: List[float]) -> bytes:
+    figure = Figure(figsize=(10, 3))
+    figure.subplots_adjust(left=0.07, right=0.98, bottom=0.17, top=0.88)
+    ax = figure.subplots()
+    means = np.asarray(means, dtype=np.float64)
+    if len(means):
+        ax.hist(means, bins=histogram_bins(means), color='#5cb85c', edgecolor='white')
+    ax.set_title("Mean speed per video")
+    ax.set_xlabel("Mean speed (µm/s)")
+    ax.set_ylabel("Videos")
+    return _figure_png(figure)
+
+def _summary_table(summaries: List[Dict]) -> str:
+    rows = "".join(
+        f"<tr><td>{html.escape(s['label'])}</td><td>{s['pairs']}</td><td>{s['mean']:.2f}</td>"
+        f"<td>{s['median']:.2f}</td><td>{s['std']:.2f}</td><td>{s['min']:.2f}</td><td>{s['max']:.2f}</td>"
+        f"<td>{s['distance_um']:.2f}</td><td>{s['time_seconds']:.4f}</td><td>{s['low_quality']}</td></tr>"
+        for s in summaries
+    )
+    return ("<table><tr><th>Track</th><th>Pairs</th><th>Mean (µm/s)</th><th>Median</th><th>Std</th>"
+            "<th>Min</th><th>Max</th><th>Distance (µm)</th><th>Time (s)</th><th>Blurred</th></tr>"
+            f"{rows}</table>")
+
+def _image_tag(png: bytes) -> str:
+    return f'<img src="data:image/png;base64,{base64.b64encode(png).decode("ascii")}">'
+
+HTML_HEADER = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 24px; color: #222; }}
+table {{ border-collapse: collapse; margin: 8px 0 24px; font-size: 13px; }}
+th, td {{ border: 1px solid #ccc; padding: 3px 8px; text-align: right; }}
+th:first-child, td:first-child {{ text-align: left; }}
+img {{ max-width: 100%; }}
+section {{ page-break-inside: avoid; }}
+</style></head><body>
+"""
+
+class ReportGenerator:
+    def __init__(self, videos: List[VideoSeries], output_path: str, workers: Optional[int] = None,
+                 title: str = "Speed Analysis Report"):
+        suffix = Path(output_path).suffix.lower()
+        if suffix not in REPORT_FORMATS:
+            raise ValueError(f"Desteklenmeyen rapor formatı: {suffix}")
+        self.videos = [series for series in videos if series.tracks]
+        self.output_path = output_path
+        self.fmt = suffix
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(self.videos)))
+        self.title = title
+        self.videos_rendered = 0
+        self._stop_event = threading.Event()
+    
+    @property
+    def total_frames(self) -> int:
+        return len(self.videos)
+    
+    def cancel(self):
+        self._stop_event.set()
+    
+    def _rendered(self):
+        if self.workers == 1:
+            for series in self.videos:
+                if self._stop_event.is_set():
+                    return
+                yield render_video_plots(series)
+            return
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            window = 2 * self.workers
+            futures = {}
+            next_index = 0
+            try:
+                for index in range(len(self.videos)):
+                    while next_index < len(self.videos) and next_index < index + window:
+                        futures[next_index] = executor.submit(render_video_plots, self.videos[next_index])
+                        next_index += 1
+                    while not futures[index].done():
+                        if self._stop_event.is_set():
+                            return
+                        wait([futures[index]], timeout=0.2, return_when=FIRST_COMPLETED)
+                    yield futures.pop(index).result()
+            finally:
+                for future in futures.values():
+                    future.cancel()
+    
+    def _sections(self, progress_callback):
+        for series, png in zip(self.videos, self._rendered()):
+            self.videos_rendered += 1
+            if progress_callback:
+                progress_callback(self.videos_rendered, self.total_frames)
+            yield series, png, [track_summary(track) for track in series.tracks]
+    
+    def _overview(self) -> Dict:
+        speeds = [series.speeds for series in self.videos]
+        all_speeds = np.concatenate(speeds) if speeds else np.zeros(0)
+        return {
+            'videos': len(self.videos),
+            'tracks': sum(len(series.tracks) for series in self.videos),
+            'pairs': len(all_speeds),
+            'mean': float(all_speeds.mean()) if len(all_speeds) else 0.0,
+            'means': [float(s.mean()) for s in speeds if len(s)],
+        }
+    
+    def _overview_text(self, overview: Dict) -> str:
+        return (f"{overview['videos']} videos, {overview['tracks']} tracks, {overview['pairs']} point pairs, "
+                f"mean speed {overview['mean']:.2f} µm/s")
+    
+    def _write_html(self, path: Path, overview: Dict, progress_callback):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(HTML_HEADER.format(title=html.escape(self.title)))
+            f.write(f"<h1>{html.escape(self.title)}</h1>\n")
+            f.write(f"<p>Generated {datetime.now():%Y-%m-%d %H:%M} &mdash; "
+                    f"{html.escape(self._overview_text(overview))}</p>\n")
+            if len(self.videos) > 1:
+                f.write(_image_tag(render_overview_plot(overview['means'])) + "\n")
+            for series, png, summaries in self._sections(progress_callback):
+                fps_text = f" &mdash; {series.fps:g} fps" if series.fps else ""
+                f.write(f"<section><h2>{html.escape(series.name)}{fps_text}</h2>\n"
+                        f"{_image_tag(png)}\n{_summary_table(summaries)}</section>\n")
+            f.write("</body></html>\n")
+    
+    def _write_pdf(self, path: Path, overview: Dict, progress_callback):
+        from matplotlib.backends.backend_pdf import PdfPages
+        from matplotlib.image import imread
+        
+        with PdfPages(path) as pdf:
+            page = Figure(figsize=PDF_PAGE_SIZE)
+            page.text(0.08, 0.92, self.title, fontsize=18, weight='bold')
+            page.text(0.08, 0.89, f"Generated {datetime.now():%Y-%m-%d %H:%M}", fontsize=10)
+            page.text(0.08, 0.87, self._overview_text(overview), fontsize=10)
+            if len(self.videos) > 1:
+                ax = page.add_axes((0.05, 0.5, 0.9, 0.33))
+                ax.imshow(imread(io.BytesIO(render_overview_plot(overview['means']))))
+                ax.axis('off')
+            pdf.savefig(page)
+            
+            for series, png, summaries in self._sections(progress_callback):
+                page = Figure(figsize=PDF_PAGE_SIZE)
+                page.text(0.05, 0.95, series.name + (f"  ({series.fps:g} fps)" if series.fps else ""),
+                          fontsize=13, weight='bold')
+                ax = page.add_axes((0.03, 0.62, 0.94, 0.32))
+                ax.imshow(imread(io.BytesIO(png)))
+                ax.axis('off')
+                table_ax = page.add_axes((0.05, 0.05, 0.9, 0.55))
+                table_ax.axis('off')
+                table = table_ax.table(
+                    cellText=[[s['label'], s['pairs'], f"{s['mean']:.2f}", f"{s['median']:.2f}",
+                               f"{s['min']:.2f}", f"{s['max']:.2f}", f"{s['distance_um']:.1f}",
+                               f"{s['time_seconds']:.3f}"] for s in summaries[:40]],
+                    colLabels=["Track", "Pairs", "Mean µm/s", "Median", "Min", "Max", "Dist. µm", "Time s"],
+                    loc='upper center')
+                table.auto_set_font_size(False)
+                table.set_fontsize(7)
+                pdf.savefig(page)
+    
+    def run(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        if not self.videos:
+            raise ValueError("Rapor için ölçüm sonucu yok!")
+        output_path = Path(self.output_path)
+        tmp_path = output_path.with_name(f"{output_path.stem}.tmp{output_path.suffix}")
+        start_time = time.perf_counter()
+        overview = self._overview()
+        write = self._write_html if self.fmt == '.html' else self._write_pdf
+        try:
+            write(tmp_path, overview, progress_callback)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+        
+        cancelled = self._stop_event.is_set()
+        if cancelled:
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, output_path)
+        
+        elapsed = time.perf_counter() - start_time
+        return {
+            'path': str(output_path),
+            'frames': self.videos_rendered,
+            'seconds': elapsed,
+            'fps': self.videos_rendered / elapsed if elapsed > 0 else 0.0,
+            'bytes': 0 if cancelled else output_path.stat().st_size,
+            'cancelled': cancelled,
+        }
+
+def main(argv=None):
+    from core.results_db import ResultsDatabase
+    
+    parser = argparse.ArgumentParser(description="Hız Analiz toplu rapor oluşturucu")
+    parser.add_argument('output')
+    parser.add_argument('--db', default=None)
+    parser.add_argument('--video')
+    parser.add_argument('--from', dest='date_from')
+    parser.add_argument('--to', dest='date_to')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--title', default="Speed Analysis Report")
+    args = parser.parse_args(argv)
+    
+    with ResultsDatabase(args.db) as db:
+        rows = db.query_measurements(video=args.video, date_from=args.date_from, date_to=args.date_to)
+    generator = ReportGenerator(series_from_rows(rows), args.output, args.workers, args.title)
+    stats = generator.run(lambda done, total: print(f"{done}/{total} videos", flush=True)
+                          if done % 25 == 0 or done == total else None)
+    print(f"{stats['path']}: {stats['frames']} videos in {stats['seconds']:.1f}s "
+          f"({stats['bytes'] / 1024:.0f} KB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import argparse
+import csv
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.calculator import SpeedCalculator
+from core.sidecar import quick_hash, user_cache_root
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    hash TEXT UNIQUE,
+    fps REAL,
+    width INTEGER,
+    height INTEGER,
+    total_frames INTEGER
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    video_id INTEGER NOT NULL REFERENCES videos(id),
+    created TEXT NOT NULL,
+    analysis_date TEXT NOT NULL,
+    pixel_to_um_ratio REAL NOT NULL,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS tracks (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    video_id INTEGER NOT NULL REFERENCES videos(id),
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS points (
+    id INTEGER PRIMARY KEY,
+    track_id INTEGER NOT NULL REFERENCES tracks(id),
+    seq INTEGER NOT NULL,
+    frame INTEGER NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    track_id INTEGER NOT NULL REFERENCES tracks(id),
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    video_id INTEGER NOT NULL REFERENCES videos(id),
+    analysis_date TEXT NOT NULL,
+    pair_index TEXT NOT NULL,
+    frame1 INTEGER NOT NULL,
+    frame2 INTEGER NOT NULL,
+    frame_diff INTEGER NOT NULL,
+    time_seconds REAL NOT NULL,
+    distance_pixels REAL NOT NULL,
+    distance_um REAL NOT NULL,
+    speed_um_per_sec REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_videos_path ON videos(path COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_sessions_video ON sessions(video_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(analysis_date);
+CREATE INDEX IF NOT EXISTS idx_tracks_session ON tracks(session_id);
+CREATE INDEX IF NOT EXISTS idx_points_track ON points(track_id, seq);
+CREATE INDEX IF NOT EXISTS idx_measurements_video ON measurements(video_id);
+CREATE INDEX IF NOT EXISTS idx_measurements_date ON measurements(analysis_date);
+CREATE INDEX IF NOT EXISTS idx_measurements_track ON measurements(track_id);
+"""
+
+GROUP_COLUMNS = {
+    'video': "v.path",
+    'day': "m.analysis_date",
+    'track': "m.track_id",
+    'session': "m.session_id",
+}
+
+def default_database_path() -> Path:
+    return user_cache_root() / 'results.sqlite'
+
+class ResultsDatabase:
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else default_database_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+    
+    def close(self):
+        self.connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+    
+    def _video_id(self, video_path: str, video_hash: Optional[str], info: Dict) -> int:
+        video_hash = video_hash or quick_hash(video_path)
+        row = self.connection.execute("SELECT id FROM videos WHERE hash = ?", (video_hash,)).fetchone()
+        if row:
+            self.connection.execute("UPDATE videos SET path = ? WHERE id = ?", (str(video_path), row['id']))
+            return row['id']
+        cursor = self.connection.execute(
+            "INSERT INTO videos (path, hash, fps, width, height, total_frames) VALUES (?, ?, ?, ?, ?, ?)",
+            (str(video_path), video_hash, info.get('fps'), info.get('width'),
+             info.get('height'), info.get('total_frames'))
+        )
+        return cursor.lastrowid
+    
+    def store_session(self, video_path: str, calculator: SpeedCalculator, video_info: Optional[Dict] = None,
+                      video_hash: Optional[str] = None, tracks: Optional[Dict[str, SpeedCalculator]] = None,
+                      note: Optional[str] = None, analysis_date: Optional[str] = None) -> int:
+        now = datetime.now(timezone.utc)
+        analysis_date = analysis_date or now.date().isoformat()
+        tracks = tracks if tracks is not None else {'1': calculator}
+        
+        with self.connection:
+            video_id = self._video_id(video_path, video_hash, video_info or {'fps': calculator.fps})
+            session_id = self.connection.execute(
+                "INSERT INTO sessions (video_id, created, analysis_date, pixel_to_um_ratio, note) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (video_id, now.isoformat(), analysis_date, calculator.pixel_to_um_ratio, note)
+            ).lastrowid
+            
+            for label, track_calculator in tracks.items():
+                track_id = self.connection.execute(
+                    "INSERT INTO tracks (session_id, video_id, label) VALUES (?, ?, ?)",
+                    (session_id, video_id, str(label))
+                ).lastrowid
+                
+                self.connection.executemany(
+                    "INSERT INTO points (track_id, seq, frame, x, y) VALUES (?, ?, ?, ?, ?)",
+                    ((track_id, seq, p.frame_number, p.x, p.y)
+                     for seq, p in enumerate(track_calculator.get_points()))
+                )
+                self.connection.executemany(
+                    "INSERT INTO measurements (track_id, session_id, video_id, analysis_date, pair_index, "
+                    "frame1, frame2, frame_diff, time_seconds, distance_pixels, distance_um, speed_um_per_sec) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    ((track_id, session_id, video_id, analysis_date, r['pair_index'],
+                      r['point1'].frame_number, r['point2'].frame_number, r['frame_diff'],
+                      r['time_seconds'], float(r['distance_pixels']), float(r['distance_um']),
+                      float(r['speed_um_per_sec']))
+                     for r in track_calculator.calculate_all_consecutive())
+                )
+        return session_id
+    
+    def _filters(self, video: Optional[str], date_from: Optional[str], date_to: Optional[str],
+                 track_id: Optional[int]):
+        clauses, params = [], []
+        if video:
+            prefix = video.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("(v.path LIKE ? ESCAPE '\\' OR v.hash = ?)")
+            params.extend((f"{prefix}%", video))
+        if date_from:
+            clauses.append("m.analysis_date >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("m.analysis_date <= ?")
+            params.append(date_to)
+        if track_id is not None:
+            clauses.append("m.track_id = ?")
+            params.append(track_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+    
+    def query_measurements(self, video: Optional[str] = None, date_from: Optional[str] = None,
+                           date_to: Optional[str] = None, track_id: Optional[int] = None) -> List[sqlite3.Row]:
+        where, params = self._filters(video, date_from, date_to, track_id)
+        return self.connection.execute(
+            "SELECT v.path AS video, m.analysis_date, m.session_id, m.track_id, m.pair_index, "
+            "m.frame1, m.frame2, m.frame_diff, m.time_seconds, m.distance_pixels, m.distance_um, "
+            "m.speed_um_per_sec "
+            f"FROM measurements m JOIN videos v ON v.id = m.video_id {where} "
+            "ORDER BY m.video_id, m.session_id, m.track_id, m.id",
+            params
+        ).fetchall()
+    
+    def aggregate(self, group_by: str = 'video', video: Optional[str] = None, date_from: Optional[str] = None,
+                  date_to: Optional[str] = None, track_id: Optional[int] = None) -> List[sqlite3.Row]:
+        if group_by not in GROUP_COLUMNS:
+            raise ValueError(f"Geçersiz gruplama: {group_by}")
+        group_column = GROUP_COLUMNS[group_by]
+        where, params = self._filters(video, date_from, date_to, track_id)
+        return self.connection.execute(
+            f"SELECT {group_column} AS grp, COUNT(*) AS pairs, "
+            "AVG(m.speed_um_per_sec) AS mean_speed_um_per_sec, "
+            "MIN(m.speed_um_per_sec) AS min_speed_um_per_sec, "
+            "MAX(m.speed_um_per_sec) AS max_speed_um_per_sec, "
+            "SUM(m.distance_um) AS total_distance_um, SUM(m.time_seconds) AS total_time_seconds "
+            f"FROM measurements m JOIN videos v ON v.id = m.video_id {where} "
+            f"GROUP BY {group_column} ORDER BY {group_column}",
+            params
+        ).fetchall()
+
+def write_rows_csv(rows: List[sqlite3.Row], output):
+    if not rows:
+        return
+    writer = csv.writer(output)
+    writer.writerow(rows[0].keys())
+    writer.writerows(tuple(row) for row in rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hız Analiz sonuç veritabanı sorguları")
+    parser.add_argument('--db', default=None)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    for name in ('export', 'summary'):
+        sub = subparsers.add_parser(name)
+        sub.add_argument('--video')
+        sub.add_argument('--from', dest='date_from')
+        sub.add_argument('--to', dest='date_to')
+        sub.add_argument('--track', type=int)
+        sub.add_argument('--out')
+        if name == 'summary':
+            sub.add_argument('--by', choices=sorted(GROUP_COLUMNS), default='video')
+    
+    args = parser.parse_args(argv)
+    with ResultsDatabase(args.db) as db:
+        filters = dict(video=args.video, date_from=args.date_from, date_to=args.date_to, track_id=args.track)
+        if args.command == 'export':
+            rows = db.query_measurements(**filters)
+        else:
+            rows = db.aggregate(args.by, **filters)
+    
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8', newline='') as f:
+            write_rows_csv(rows, f)
+    else:
+        write_rows_csv(rows, sys.stdout)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import itertools
+import json
+import os
+import threading
+import time
+import zipfile
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from core.readers import CROP_STORE_EXTENSION
+from core.video_processor import open_capture
+
+CROP_FORMATS = {'ffv1': '.mkv', 'npz': CROP_STORE_EXTENSION}
+CROP_CHUNK_FRAMES = 32
+CROP_PREFIX = 'crop_'
+
+@dataclass
+class CropRegion:
+    x: int
+    y: int
+    width: int
+    height: int
+    start_frame: int
+    end_frame: int
+    source_path: str = ''
+    
+    @property
+    def frame_count(self) -> int:
+        return max(0, self.end_frame - self.start_frame + 1)
+    
+    @property
+    def key(self) -> str:
+        return f"{self.x}_{self.y}_{self.width}x{self.height}_{self.start_frame}-{self.end_frame}"
+    
+    @property
+    def label(self) -> str:
+        return (f"{self.width}x{self.height} at ({self.x}, {self.y}), "
+                f"frames {self.start_frame}-{self.end_frame}")
+    
+    def to_source_mask(self, mask: np.ndarray) -> np.ndarray:
+        source = np.zeros(self.start_frame + len(mask), dtype=mask.dtype)
+        source[self.start_frame:] = mask
+        return source
+
+def crop_metadata_path(crop_path: str) -> Path:
+    return Path(crop_path).with_suffix('.json')
+
+def crop_output_path(cache_root: str, region: CropRegion, fmt: str) -> Path:
+    return Path(cache_root) / f"{CROP_PREFIX}{region.key}{CROP_FORMATS[fmt]}"
+
+def load_crop_metadata(crop_path: str) -> Optional[Dict]:
+    if not Path(crop_path).name.startswith(CROP_PREFIX):
+        return None
+    meta_path = crop_metadata_path(crop_path)
+    if not meta_path.exists():
+        return None
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if 'region' in meta else None
+
+def load_crop_region(crop_path: str) -> Optional[CropRegion]:
+    meta = load_crop_metadata(crop_path)
+    return CropRegion(**meta['region']) if meta else None
+
+def list_crops(cache_root: str) -> List[Dict]:
+    crops = []
+    for meta_path in sorted(Path(cache_root).glob(f"{CROP_PREFIX}*.json")):
+        for suffix in CROP_FORMATS.values():
+            crop_path = meta_path.with_suffix(suffix)
+            meta = load_crop_metadata(str(crop_path)) if crop_path.exists() else None
+            if meta is not None:
+                crops.append(dict(meta, path=str(crop_path), bytes=crop_path.stat().st_size))
+                break
+    return crops
+
+def is_grayscale(frame: np.ndarray) -> bool:
+    if frame.ndim == 2:
+        return True
+    return bool(np.array_equal(frame[..., 0], frame[..., 1]) and np.array_equal(frame[..., 1], frame[..., 2]))
+
+class _ColorFrame(Exception):
+    pass
+
+class RoiCropWriter:
+    def __init__(self, video_path: str, region: CropRegion, output_dir: str, fmt: str = 'ffv1',
+                 fps: Optional[float] = None, chunk_frames: int = CROP_CHUNK_FRAMES):
+        if fmt not in CROP_FORMATS:
+            raise ValueError(f"Bilinmeyen ROI formatı: {fmt}")
+        if fmt == 'ffv1':
+            region = replace(region, width=region.width - region.width % 2,
+                             height=region.height - region.height % 2)
+        self.video_path = video_path
+        self.region = region
+        self.output_path = crop_output_path(output_dir, region, fmt)
+        self.fmt = fmt
+        self.fps = fps
+        self.chunk_frames = chunk_frames
+        self.frames_written = 0
+        self._stop_event = threading.Event()
+    
+    @property
+    def total_frames(self) -> int:
+        return self.region.frame_count
+    
+    def cancel(self):
+        self._stop_event.set()
+    
+    def _frames(self, cap):
+        region = self.region
+        if region.start_frame > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, region.start_frame)
+        for _ in range(region.frame_count):
+            if self._stop_event.is_set():
+                return
+            ret, frame = cap.read()
+            if not ret:
+                return
+            yield frame[region.y:region.y + region.height, region.x:region.x + region.width]
+    
+    @staticmethod
+    def _gray_frames(frames):
+        for crop in frames:
+            if not is_grayscale(crop):
+                raise _ColorFrame()
+            yield crop
+    
+    def _write_ffv1(self, frames, tmp_path: Path, fps: float, grayscale: bool, progress_callback):
+        writer = cv2.VideoWriter(str(tmp_path), cv2.VideoWriter_fourcc(*'FFV1'), fps,
+                                 (self.region.width, self.region.height), not grayscale)
+        if not writer.isOpened():
+            raise ValueError("FFV1 yazıcı açılamadı!")
+        try:
+            for crop in frames:
+                writer.write(cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if grayscale and crop.ndim == 3 else crop)
+                self.frames_written += 1
+                if progress_callback and self.frames_written % self.chunk_frames == 0:
+                    progress_callback(self.frames_written, self.total_frames)
+        finally:
+            writer.release()
+    
+    def _write_npz(self, frames, tmp_path: Path, fps: float, grayscale: bool, progress_callback):
+        shape = (self.chunk_frames, self.region.height, self.region.width) + (() if grayscale else (3,))
+        stack = np.empty(shape, dtype=np.uint8)
+        filled = 0
+        chunk_index = 0
+        
+        with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as store:
+            def flush(count):
+                with store.open(f"chunk_{chunk_index:05d}.npy", 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, stack[:count], allow_pickle=False)
+            
+            for crop in frames:
+                if grayscale and crop.ndim == 3:
+                    crop = crop[..., 0]
+                stack[filled] = crop
+                filled += 1
+                self.frames_written += 1
+                if filled == self.chunk_frames:
+                    flush(filled)
+                    chunk_index += 1
+                    filled = 0
+                    if progress_callback:
+                        progress_callback(self.frames_written, self.total_frames)
+            if filled:
+                flush(filled)
+            
+            with store.open("header.npy", 'w') as f:
+                header = np.array([self.frames_written, self.chunk_frames, fps], dtype=np.float64)
+                np.lib.format.write_array(f, header, allow_pickle=False)
+    
+    def run(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        cap = open_capture(self.video_path, self.fps, mode='sequential')
+        if not cap.isOpened():
+            raise ValueError("Video dosyası açılamadı!")
+        
+        fps = float(self.fps or cap.get(cv2.CAP_PROP_FPS) or 30.0)
+        frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        region = self.region
+        if (region.width <= 0 or region.height <= 0 or region.x < 0 or region.y < 0
+                or region.x + region.width > frame_width or region.y + region.height > frame_height):
+            cap.release()
+            raise ValueError("ROI video sınırları dışında!")
+        
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.output_path.with_name(f"{self.output_path.stem}.tmp{self.output_path.suffix}")
+        start_time = time.perf_counter()
+        frames = self._frames(cap)
+        try:
+            first = next(frames, None)
+            if first is None:
+                if not self._stop_event.is_set():
+                    raise ValueError("ROI aralığında frame okunamadı!")
+            else:
+                grayscale = is_grayscale(first)
+                frames = itertools.chain([first], frames)
+                
+                write = self._write_ffv1 if self.fmt == 'ffv1' else self._write_npz
+                if grayscale:
+                    try:
+                        write(self._gray_frames(frames), tmp_path, fps, True, progress_callback)
+                    except _ColorFrame:
+                        grayscale = False
+                        self.frames_written = 0
+                        cap.release()
+                        cap = open_capture(self.video_path, self.fps, mode='sequential')
+                        frames = self._frames(cap)
+                if not grayscale:
+                    write(frames, tmp_path, fps, False, progress_callback)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+        finally:
+            cap.release()
+        
+        cancelled = self._stop_event.is_set()
+        if cancelled:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        else:
+            written = replace(region, end_frame=region.start_frame + self.frames_written - 1)
+            if written != region:
+                self.output_path = crop_output_path(str(self.output_path.parent), written, self.fmt)
+            os.replace(tmp_path, self.output_path)
+            meta = {
+                'region': asdict(written),
+                'format': self.fmt,
+                'fps': fps,
+                'frames': self.frames_written,
+                'grayscale': grayscale,
+                'created': time.time(),
+            }
+            with open(crop_metadata_path(str(self.output_path)), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        
+        elapsed = time.perf_counter() - start_time
+        return {
+            'path': str(self.output_path),
+            'frames': self.frames_written,
+            'seconds': elapsed,
+            'fps': self.frames_written / elapsed if elapsed > 0 else 0.0,
+            'bytes': 0 if cancelled else self.output_path.stat().st_size,
+            'cancelled': cancelled,
+        }
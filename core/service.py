@@ -0,0 +1,249 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from core.jobs import TASK_HANDLERS, Task, execute_task
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 256
+MAX_FINISHED_JOBS = 1000
+MAX_BODY_BYTES = 1024 * 1024
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+
+@dataclass
+class Job:
+    job_id: str
+    task: Task
+    status: str = 'queued'
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    
+    @property
+    def key(self) -> Tuple:
+        return (self.task.kind, self.task.video_path, self.task.frame_range,
+                json.dumps(self.task.params, sort_keys=True))
+    
+    def as_dict(self) -> Dict:
+        return {
+            'id': self.job_id,
+            'kind': self.task.kind,
+            'video_path': self.task.video_path,
+            'frame_range': self.task.frame_range,
+            'params': self.task.params,
+            'status': self.status,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'result': self.result,
+            'error': self.error,
+        }
+
+class AnalysisService:
+    def __init__(self, max_workers: Optional[int] = None, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 use_cache: bool = True):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.use_cache = use_cache
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self.active: Dict[Tuple, Job] = {}
+        self.queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._dispatchers = []
+    
+    async def start(self):
+        self.queue = asyncio.Queue(self.queue_size)
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.max_workers)]
+    
+    async def stop(self):
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def submit(self, kind: str, video_path: str, params: Optional[Dict] = None,
+               frame_range: Optional[Tuple[int, int]] = None) -> Job:
+        if kind not in TASK_HANDLERS:
+            raise ValueError(f"Bilinmeyen görev türü: {kind}")
+        if kind == 'frame_means' and frame_range is None:
+            raise ValueError("frame_means için frame_range gerekli!")
+        if not Path(video_path).is_file():
+            raise ValueError(f"Video bulunamadı: {video_path}")
+        params = dict(params or {})
+        if kind == 'speed' and not Path(str(params.get('points_path', ''))).is_file():
+            raise ValueError("speed için points_path gerekli!")
+        if self.use_cache:
+            params.setdefault('use_cache', True)
+        
+        video_path = str(Path(video_path).resolve())
+        task = Task(f"{kind}:{video_path}", kind, video_path,
+                    frame_range=tuple(frame_range) if frame_range is not None else None, params=params)
+        job = Job(uuid.uuid4().hex[:12], task)
+        existing = self.active.get(job.key)
+        if existing is not None and not existing.cancel_requested:
+            return existing
+        
+        self.queue.put_nowait(job)
+        self.jobs[job.job_id] = job
+        self.active[job.key] = job
+        self._trim()
+        return job
+    
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return job
+        job.cancel_requested = True
+        if job.status == 'queued':
+            self._finish(job, 'cancelled')
+        else:
+            job.status = 'cancelling'
+        return job
+    
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished = time.time()
+        if self.active.get(job.key) is job:
+            del self.active[job.key]
+    
+    def _trim(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+    
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.cancel_requested:
+                    continue
+                job.status = 'running'
+                job.started = time.time()
+                try:
+                    result = await loop.run_in_executor(self._executor, execute_task, asdict(job.task))
+                except Exception as e:
+                    job.error = "".join(traceback.format_exception_only(type(e), e)).strip()
+                    self._finish(job, 'cancelled' if job.cancel_requested else 'failed')
+                else:
+                    if job.cancel_requested:
+                        self._finish(job, 'cancelled')
+                    else:
+                        job.result = result
+                        self._finish(job, 'done')
+            finally:
+                self.queue.task_done()
+    
+    def status(self) -> Dict:
+        counts = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'workers': self.max_workers,
+            'queue_size': self.queue_size,
+            'queued': self.queue.qsize(),
+            'jobs': counts,
+            'kinds': sorted(TASK_HANDLERS),
+        }
+    
+    def handle(self, method: str, path: str, body: Optional[Dict]) -> Tuple[int, object]:
+        parts = [part for part in path.split('?', 1)[0].split('/') if part]
+        if parts == ['health'] and method == 'GET':
+            return HTTPStatus.OK, self.status()
+        if parts == ['jobs'] and method == 'GET':
+            return HTTPStatus.OK, [job.as_dict() for job in self.jobs.values()]
+        if parts == ['jobs'] and method == 'POST':
+            if not isinstance(body, dict) or 'kind' not in body or 'video_path' not in body:
+                return HTTPStatus.BAD_REQUEST, {'error': "kind ve video_path gerekli!"}
+            try:
+                job = self.submit(body['kind'], body['video_path'], body.get('params'), body.get('frame_range'))
+            except asyncio.QueueFull:
+                return HTTPStatus.SERVICE_UNAVAILABLE, {'error': "İş kuyruğu dolu!"}
+            except (TypeError, ValueError) as e:
+                return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+            return HTTPStatus.ACCEPTED, job.as_dict()
+        if len(parts) == 2 and parts[0] == 'jobs' and method in ('GET', 'DELETE'):
+            job = self.cancel(parts[1]) if method == 'DELETE' else self.jobs.get(parts[1])
+            if job is None:
+                return HTTPStatus.NOT_FOUND, {'error': "İş bulunamadı!"}
+            return HTTPStatus.OK, job.as_dict()
+        return HTTPStatus.NOT_FOUND, {'error': "Bilinmeyen adres"}
+    
+    async def serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            
+            if len(request_line) < 2:
+                status, payload = HTTPStatus.BAD_REQUEST, {'error': "Geçersiz istek"}
+            else:
+                length = int(headers.get('content-length', 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "İstek çok büyük"}
+                else:
+                    try:
+                        body = json.loads(await reader.readexactly(length)) if length else None
+                    except ValueError:
+                        status, payload = HTTPStatus.BAD_REQUEST, {'error': "Geçersiz JSON"}
+                    else:
+                        status, payload = self.handle(request_line[0].upper(), request_line[1], body)
+            
+            data = json.dumps(payload).encode('utf-8')
+            writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                         "Content-Type: application/json\r\n"
+                         f"Content-Length: {len(data)}\r\n"
+                         "Connection: close\r\n\r\n".encode('latin-1') + data)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_workers: Optional[int] = None,
+                queue_size: int = DEFAULT_QUEUE_SIZE, use_cache: bool = True):
+    service = AnalysisService(max_workers, queue_size, use_cache)
+    await service.start()
+    server = await asyncio.start_server(service.serve_client, host, port)
+    print(f"Listening on http://{host}:{port} with {service.max_workers} workers", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hız Analiz yerel analiz servisi")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue_size, not args.no_cache))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def quick_hash(file_path: str) -> str:
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha1(str(size).encode())
+    with open(file_path, 'rb') as f:
+        digest.update(f.read(HASH_BLOCK_SIZE))
+        if size > 2 * HASH_BLOCK_SIZE:
+            f.seek(size // 2)
+            digest.update(f.read(HASH_BLOCK_SIZE))
+            f.seek(-HASH_BLOCK_SIZE, os.SEEK_END)
+            digest.update(f.read(HASH_BLOCK_SIZE))
+    return digest.hexdigest()
+
+def user_cache_root() -> Path:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+    return Path(base) / 'hiz-analiz'
+
+class SidecarCache:
+    def __init__(self, video_path: str, root: Optional[str] = None, video_hash: Optional[str] = None):
+        self.video_path = video_path
+        self.video_hash = video_hash or quick_hash(video_path)
+        self.root = Path(root) if root else self._default_root()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._validate()
+    
+    def _default_root(self) -> Path:
+        path = Path(self.video_path)
+        local = path.parent / f"{path.name}.hizcache"
+        try:
+            local.mkdir(exist_ok=True)
+            if os.access(local, os.W_OK):
+                return local
+        except OSError:
+            pass
+        return user_cache_root() / self.video_hash
+    
+    def _validate(self):
+        meta_path = self.root / 'meta.json'
+        meta = {}
+        if meta_path.exists():
+            try:
+                with open(meta_path, encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+        
+        if meta.get('video_hash') != self.video_hash:
+            for entry in self.root.iterdir():
+                if entry.is_file():
+                    entry.unlink()
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'video_hash': self.video_hash, 'video_name': Path(self.video_path).name}, f)
+    
+    def path(self, kind: str, suffix: str) -> Path:
+        return self.root / f"{kind}{suffix}"
+    
+    def load_array(self, kind: str, mmap: bool = False) -> Optional[np.ndarray]:
+        path = self.path(kind, '.npy')
+        if not path.exists():
+            return None
+        try:
+            return np.load(path, mmap_mode='r' if mmap else None)
+        except (OSError, ValueError):
+            return None
+    
+    def save_array(self, kind: str, array: np.ndarray):
+        path = self.path(kind, '.npy')
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    
+    def load_json(self, kind: str) -> Optional[dict]:
+        path = self.path(kind, '.json')
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def save_json(self, kind: str, data: dict):
+        path = self.path(kind, '.json')
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+def load_or_compute(cache: Optional[SidecarCache], kinds: Dict[str, str],
+                    compute: Callable[[List[str]], Optional[Dict[str, np.ndarray]]]) -> Optional[Dict[str, np.ndarray]]:
+    arrays = {name: cache.load_array(kind) if cache is not None else None for name, kind in kinds.items()}
+    missing = [name for name, array in arrays.items() if array is None]
+    if missing:
+        computed = compute(missing)
+        if computed is None:
+            return None
+        for name in missing:
+            arrays[name] = computed[name]
+            if cache is not None:
+                cache.save_array(kinds[name], computed[name])
+    return arrays
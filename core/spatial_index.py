@@ -0,0 +1,74 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+class PointGridIndex:
+    def __init__(self, cell_size: int = 32):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int, int], List] = defaultdict(list)
+        self.locations: Dict[object, Tuple[int, int, int]] = {}
+    
+    def _cell_key(self, x: float, y: float, frame_number: int) -> Tuple[int, int, int]:
+        return (frame_number, int(x) // self.cell_size, int(y) // self.cell_size)
+    
+    def insert(self, point):
+        key = self._cell_key(point.x, point.y, point.frame_number)
+        self.cells[key].append(point)
+        self.locations[point] = key
+    
+    def remove(self, point):
+        key = self.locations.pop(point, None)
+        if key is None:
+            return
+        cell = self.cells[key]
+        cell.remove(point)
+        if not cell:
+            del self.cells[key]
+    
+    def update(self, point):
+        key = self._cell_key(point.x, point.y, point.frame_number)
+        if self.locations.get(point) == key:
+            return
+        self.remove(point)
+        self.insert(point)
+    
+    def clear(self):
+        self.cells.clear()
+        self.locations.clear()
+    
+    def rebuild(self, points, xs=None, ys=None, frames=None):
+        self.clear()
+        if xs is None:
+            xs = [p.x for p in points]
+            ys = [p.y for p in points]
+            frames = [p.frame_number for p in points]
+        
+        cell_x = (np.asarray(xs, dtype=np.int64) // self.cell_size).tolist()
+        cell_y = (np.asarray(ys, dtype=np.int64) // self.cell_size).tolist()
+        keys = list(zip(np.asarray(frames, dtype=np.int64).tolist(), cell_x, cell_y))
+        
+        cells = self.cells
+        for point, key in zip(points, keys):
+            cells[key].append(point)
+        self.locations = dict(zip(points, keys))
+    
+    def query(self, x: float, y: float, frame_number: int, radius: float) -> Optional[object]:
+        min_cx = int(x - radius) // self.cell_size
+        max_cx = int(x + radius) // self.cell_size
+        min_cy = int(y - radius) // self.cell_size
+        max_cy = int(y + radius) // self.cell_size
+        
+        nearest = None
+        nearest_distance = radius * radius
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                for point in self.cells.get((frame_number, cx, cy), ()):
+                    distance = (point.x - x) ** 2 + (point.y - y) ** 2
+                    if distance <= nearest_distance:
+                        nearest = point
+                        nearest_distance = distance
+        return nearest
+    
+    def __len__(self):
+        return len(self.locations)
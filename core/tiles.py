@@ -0,0 +1,109 @@
+import math
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+from utils.profiler import profiler
+
+class TileCache:
+    def __init__(self, max_bytes: int = 192 * 1024 * 1024, name: str = "tile_cache"):
+        self.max_bytes = max_bytes
+        self.name = name
+        self.tiles = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        tile = self.tiles.get(key)
+        if tile is None:
+            self.misses += 1
+            profiler.count_cache(self.name, False)
+            return None
+        self.tiles.move_to_end(key)
+        self.hits += 1
+        profiler.count_cache(self.name, True)
+        return tile
+    
+    def put(self, key, tile: np.ndarray):
+        if key in self.tiles:
+            self.current_bytes -= self.tiles.pop(key).nbytes
+        self.tiles[key] = tile
+        self.current_bytes += tile.nbytes
+        while self.current_bytes > self.max_bytes and len(self.tiles) > 1:
+            _, evicted = self.tiles.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+    
+    def clear(self):
+        self.tiles.clear()
+        self.current_bytes = 0
+
+class TiledRenderer:
+    def __init__(self, tile_size: int = 256, cache: TileCache = None):
+        self.tile_size = tile_size
+        self.cache = cache if cache is not None else TileCache()
+        self.frame = None
+        self.frame_key = None
+        self.level_count = 1
+    
+    def set_frame(self, frame_key, frame: np.ndarray):
+        self.frame_key = frame_key
+        self.frame = frame
+        h, w = frame.shape[:2]
+        self.level_count = max(1, int(math.ceil(math.log2(max(w, h) / self.tile_size))) + 1)
+    
+    def reset(self):
+        self.cache.clear()
+        self.frame = None
+        self.frame_key = None
+    
+    def choose_level(self, scale: float) -> int:
+        if scale >= 1.0:
+            return 0
+        return min(self.level_count - 1, int(math.floor(math.log2(1.0 / scale))))
+    
+    def get_tile(self, level: int, tx: int, ty: int) -> np.ndarray:
+        key = (self.frame_key, level, tx, ty)
+        tile = self.cache.get(key)
+        if tile is not None:
+            return tile
+        
+        h, w = self.frame.shape[:2]
+        factor = 1 << level
+        size = self.tile_size
+        level_w = (w + factor - 1) // factor
+        level_h = (h + factor - 1) // factor
+        
+        lx1, ly1 = tx * size, ty * size
+        lx2, ly2 = min(lx1 + size, level_w), min(ly1 + size, level_h)
+        source = self.frame[ly1 * factor:min(ly2 * factor, h), lx1 * factor:min(lx2 * factor, w)]
+        
+        if level == 0:
+            tile = source.copy()
+        else:
+            tile = cv2.resize(source, (lx2 - lx1, ly2 - ly1), interpolation=cv2.INTER_AREA)
+        
+        self.cache.put(key, tile)
+        return tile
+    
+    def render(self, x1: int, y1: int, x2: int, y2: int, output_width: int, output_height: int):
+        scale = min(output_width / max(1, x2 - x1), output_height / max(1, y2 - y1))
+        level = self.choose_level(scale)
+        factor = 1 << level
+        size = self.tile_size
+        
+        lx1, ly1 = x1 // factor, y1 // factor
+        lx2, ly2 = -(-x2 // factor), -(-y2 // factor)
+        
+        out = np.empty((ly2 - ly1, lx2 - lx1) + self.frame.shape[2:], dtype=self.frame.dtype)
+        for ty in range(ly1 // size, (ly2 - 1) // size + 1):
+            for tx in range(lx1 // size, (lx2 - 1) // size + 1):
+                tile = self.get_tile(level, tx, ty)
+                tile_x, tile_y = tx * size, ty * size
+                sx1, sy1 = max(lx1, tile_x), max(ly1, tile_y)
+                sx2 = min(lx2, tile_x + tile.shape[1])
+                sy2 = min(ly2, tile_y + tile.shape[0])
+                out[sy1 - ly1:sy2 - ly1, sx1 - lx1:sx2 - lx1] = \
+                    tile[sy1 - tile_y:sy2 - tile_y, sx1 - tile_x:sx2 - tile_x]
+        
+        return out, (lx1 * factor, ly1 * factor), factor
@@ -0,0 +1,341 @@
+import argparse
+import itertools
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.calculator import POINT_DTYPE
+
+TRACK_POINT_DTYPE = np.dtype([('track', '<i8'), ('frame', '<i4'), ('x', '<f4'), ('y', '<f4')])
+MEASUREMENT_DTYPE = np.dtype([('track', '<i8'), ('frame1', '<i4'), ('frame2', '<i4'), ('distance_um', '<f8'),
+                              ('time_seconds', '<f8'), ('speed_um_per_sec', '<f8')])
+TRACK_CHUNK_ROWS = 500_000
+TRACK_TRAIL_FRAMES = 30
+HEADER_PROBE_LINES = 10
+CSV_DELIMITERS = (',', ';', '\t')
+COLUMN_ALIASES = {
+    'x': ('x', 'position_x', 'pos_x', 'x_px', 'x (px)', 'xcoord'),
+    'y': ('y', 'position_y', 'pos_y', 'y_px', 'y (px)', 'ycoord'),
+    'frame': ('frame', 'frame_number', 'slice', 't', 'position_t', 'time'),
+    'track': ('track', 'track_id', 'trackid', 'trajectory', 'traj', 'particle'),
+}
+
+@dataclass
+class TrackMapping:
+    x: str = 'x'
+    y: str = 'y'
+    frame: str = 'frame'
+    track: Optional[str] = None
+    units_per_pixel: float = 1.0
+    seconds_per_frame: Optional[float] = None
+    frame_offset: int = 0
+    
+    def convert(self, track: np.ndarray, frame: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        chunk = np.empty(len(x), dtype=TRACK_POINT_DTYPE)
+        chunk['track'] = track
+        frames = frame / self.seconds_per_frame if self.seconds_per_frame else frame
+        chunk['frame'] = np.rint(frames) - self.frame_offset
+        chunk['x'] = x / self.units_per_pixel
+        chunk['y'] = y / self.units_per_pixel
+        return chunk
+
+def is_xml_tracks(path: str) -> bool:
+    return Path(path).suffix.lower() == '.xml'
+
+def read_csv_header(path: str) -> Tuple[Optional[str], List[str]]:
+    with open(path, encoding='utf-8-sig', errors='replace') as f:
+        header = f.readline().rstrip('\r\n')
+    delimiter = next((d for d in CSV_DELIMITERS if d in header), None)
+    return delimiter, [name.strip().strip('"') for name in header.split(delimiter)]
+
+def detect_mapping(names: Sequence[str]) -> TrackMapping:
+    lowered = [name.lower() for name in names]
+    found = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        match = next((alias for alias in aliases if alias in lowered), None)
+        if match is not None:
+            found[field] = names[lowered.index(match)]
+    return TrackMapping(**found)
+
+def _column_index(names: Sequence[str], name: str) -> int:
+    lowered = [column.lower() for column in names]
+    if name.lower() not in lowered:
+        raise ValueError(f"Sütun bulunamadı: {name}")
+    return lowered.index(name.lower())
+
+def _is_numeric_row(line: str, delimiter: Optional[str], columns: Sequence[int]) -> bool:
+    fields = line.split(delimiter)
+    try:
+        for column in columns:
+            float(fields[column])
+    except (IndexError, ValueError):
+        return False
+    return True
+
+def read_csv_tracks(path: str, mapping: Optional[TrackMapping] = None,
+                    progress_callback: Optional[Callable[[int, int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None,
+                    chunk_rows: int = TRACK_CHUNK_ROWS) -> Optional[np.ndarray]:
+    delimiter, names = read_csv_header(path)
+    mapping = mapping or detect_mapping(names)
+    columns = [_column_index(names, mapping.x), _column_index(names, mapping.y),
+               _column_index(names, mapping.frame)]
+    if mapping.track:
+        columns.append(_column_index(names, mapping.track))
+    
+    total = os.path.getsize(path)
+    chunks = []
+    with open(path, encoding='utf-8-sig', errors='replace') as f:
+        done = len(f.readline())
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if not lines:
+                break
+            done += sum(map(len, lines))
+            if not chunks:
+                start = next((i for i, line in enumerate(lines[:HEADER_PROBE_LINES])
+                              if _is_numeric_row(line, delimiter, columns)), 0)
+                lines = lines[start:]
+            try:
+                values = np.loadtxt(lines, delimiter=delimiter, usecols=columns, ndmin=2)
+            except ValueError as e:
+                raise ValueError(f"İz dosyası okunamadı: {e}") from e
+            
+            track = values[:, 3] if mapping.track else 0
+            chunks.append(mapping.convert(track, values[:, 2], values[:, 0], values[:, 1]))
+            if is_cancelled and is_cancelled():
+                return None
+            if progress_callback:
+                progress_callback(done, total)
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=TRACK_POINT_DTYPE)
+
+def read_xml_tracks(path: str, mapping: Optional[TrackMapping] = None,
+                    progress_callback: Optional[Callable[[int, int], None]] = None,
+                    is_cancelled: Optional[Callable[[], bool]] = None,
+                    chunk_rows: int = TRACK_CHUNK_ROWS) -> Optional[np.ndarray]:
+    mapping = mapping or TrackMapping()
+    total = os.path.getsize(path)
+    detections, spots, edges = [], [], []
+    detection_chunks, spot_chunks, edge_chunks = [], [], []
+    particle = -1
+    track_id = -1
+    stack = []
+    
+    def flush(rows, chunks):
+        if rows:
+            chunks.append(np.array(rows, dtype=np.float64))
+            rows.clear()
+    
+    with open(path, 'rb') as f:
+        for event, element in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                stack.append(element)
+                if element.tag == 'particle':
+                    particle += 1
+                elif element.tag == 'Track':
+                    track_id = int(element.get('TRACK_ID', track_id + 1))
+                continue
+            
+            stack.pop()
+            tag = element.tag
+            if tag == 'detection':
+                detections.append((particle, float(element.get('t')), float(element.get('x')),
+                                   float(element.get('y'))))
+            elif tag == 'Spot':
+                spots.append((float(element.get('ID')), float(element.get('FRAME')),
+                              float(element.get('POSITION_X')), float(element.get('POSITION_Y'))))
+            elif tag == 'Edge':
+                edges.append((float(element.get('SPOT_SOURCE_ID')), float(element.get('SPOT_TARGET_ID')), track_id))
+            else:
+                continue
+            
+            element.clear()
+            if stack:
+                stack[-1].remove(element)
+            if len(detections) + len(spots) + len(edges) >= chunk_rows:
+                flush(detections, detection_chunks)
+                flush(spots, spot_chunks)
+                flush(edges, edge_chunks)
+                if is_cancelled and is_cancelled():
+                    return None
+                if progress_callback:
+                    progress_callback(min(f.tell(), total), total)
+    
+    flush(detections, detection_chunks)
+    flush(spots, spot_chunks)
+    flush(edges, edge_chunks)
+    chunks = []
+    if detection_chunks:
+        values = np.concatenate(detection_chunks)
+        chunks.append(mapping.convert(values[:, 0], values[:, 1], values[:, 2], values[:, 3]))
+    if spot_chunks and edge_chunks:
+        spot_values = np.concatenate(spot_chunks)
+        values = np.concatenate(edge_chunks)
+        tracks = spot_tracks(spot_values[:, 0], values[:, 0], values[:, 1], values[:, 2])
+        keep = tracks >= 0
+        spot_values = spot_values[keep]
+        chunks.append(mapping.convert(tracks[keep], spot_values[:, 1], spot_values[:, 2], spot_values[:, 3]))
+    if not chunks:
+        raise ValueError("XML dosyasında iz bulunamadı!")
+    if progress_callback:
+        progress_callback(total, total)
+    return np.concatenate(chunks)
+
+def spot_tracks(spot_ids: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+                edge_tracks: np.ndarray) -> np.ndarray:
+    order = np.argsort(spot_ids, kind='stable')
+    sorted_ids = spot_ids[order]
+    tracks = np.full(len(spot_ids), -1, dtype=np.int64)
+    for ends in (sources, targets):
+        positions = np.minimum(np.searchsorted(sorted_ids, ends), len(sorted_ids) - 1)
+        found = sorted_ids[positions] == ends
+        tracks[order[positions[found]]] = edge_tracks[found]
+    return tracks
+
+class TrackSet:
+    def __init__(self, points: np.ndarray, source: str = ''):
+        self.points = points
+        self.source = source
+        tracks = points['track']
+        starts = np.flatnonzero(np.concatenate([[True], tracks[1:] != tracks[:-1]])) if len(points) else \
+            np.empty(0, dtype=np.int64)
+        self.track_ids = tracks[starts]
+        self.bounds = np.column_stack([starts, np.append(starts[1:], len(points))])
+        self.frame_order = np.argsort(points['frame'], kind='stable')
+        self.sorted_frames = points['frame'][self.frame_order]
+    
+    @classmethod
+    def from_points(cls, points: np.ndarray, source: str = '') -> 'TrackSet':
+        tracks, frames = points['track'], points['frame']
+        same = tracks[1:] == tracks[:-1]
+        if np.all(tracks[1:] >= tracks[:-1]) and np.all(frames[1:][same] >= frames[:-1][same]):
+            return cls(points, source)
+        order = np.lexsort((frames, tracks))
+        return cls(points[order], source)
+    
+    def __len__(self) -> int:
+        return len(self.track_ids)
+    
+    @property
+    def point_count(self) -> int:
+        return len(self.points)
+    
+    @property
+    def frame_range(self) -> Tuple[int, int]:
+        if not len(self.points):
+            return 0, 0
+        return int(self.sorted_frames[0]), int(self.sorted_frames[-1])
+    
+    def track(self, track_id: int) -> np.ndarray:
+        index = int(np.searchsorted(self.track_ids, track_id))
+        if index >= len(self.track_ids) or self.track_ids[index] != track_id:
+            return self.points[:0]
+        start, end = self.bounds[index]
+        return self.points[start:end]
+    
+    def points_array(self, track_id: int) -> np.ndarray:
+        track = self.track(track_id)
+        array = np.empty(len(track), dtype=POINT_DTYPE)
+        array['x'] = np.rint(track['x'])
+        array['y'] = np.rint(track['y'])
+        array['frame'] = track['frame']
+        return array
+    
+    def measurements(self, fps: float, pixel_to_um_ratio: float) -> np.ndarray:
+        points = self.points
+        same = points['track'][1:] == points['track'][:-1]
+        first, second = points[:-1][same], points[1:][same]
+        result = np.empty(len(first), dtype=MEASUREMENT_DTYPE)
+        result['track'] = first['track']
+        result['frame1'] = first['frame']
+        result['frame2'] = second['frame']
+        result['distance_um'] = np.hypot(np.rint(second['x']) - np.rint(first['x']),
+                                         np.rint(second['y']) - np.rint(first['y'])) * pixel_to_um_ratio
+        result['time_seconds'] = np.abs(second['frame'] - first['frame']) / fps if fps > 0 else 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            speeds = result['distance_um'] / result['time_seconds']
+        result['speed_um_per_sec'] = np.where(result['time_seconds'] > 0, speeds, 0)
+        return result
+    
+    def trails(self, frame_number: int, length: int = TRACK_TRAIL_FRAMES) -> Tuple[List[np.ndarray], np.ndarray]:
+        first = np.searchsorted(self.sorted_frames, frame_number - length, side='left')
+        last = np.searchsorted(self.sorted_frames, frame_number, side='right')
+        rows = np.sort(self.frame_order[first:last])
+        if not len(rows):
+            return [], np.empty(0, dtype=np.int64)
+        tracks = self.points['track'][rows]
+        cuts = np.flatnonzero(tracks[1:] != tracks[:-1]) + 1
+        xy = np.column_stack([self.points['x'][rows], self.points['y'][rows]])
+        return np.split(xy, cuts), tracks[np.concatenate([[0], cuts])]
+
+class TrackImporter:
+    def __init__(self, path: str, mapping: Optional[TrackMapping] = None, chunk_rows: int = TRACK_CHUNK_ROWS):
+        self.path = path
+        self.mapping = mapping
+        self.chunk_rows = chunk_rows
+        self._stop_event = threading.Event()
+    
+    @property
+    def total_frames(self) -> int:
+        return max(1, os.path.getsize(self.path) // 1024)
+    
+    def cancel(self):
+        self._stop_event.set()
+    
+    def run(self, progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        start_time = time.perf_counter()
+        reader = read_xml_tracks if is_xml_tracks(self.path) else read_csv_tracks
+        points = reader(self.path, self.mapping,
+                        (lambda done, total: progress_callback(done // 1024, total // 1024))
+                        if progress_callback else None,
+                        self._stop_event.is_set, self.chunk_rows)
+        tracks = TrackSet.from_points(points, self.path) if points is not None else None
+        elapsed = time.perf_counter() - start_time
+        return {
+            'tracks': tracks,
+            'frames': len(points) if points is not None else 0,
+            'seconds': elapsed,
+            'fps': len(points) / elapsed if points is not None and elapsed > 0 else 0.0,
+            'cancelled': tracks is None,
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hız Analiz iz içe aktarma")
+    parser.add_argument('path')
+    parser.add_argument('--x')
+    parser.add_argument('--y')
+    parser.add_argument('--frame')
+    parser.add_argument('--track')
+    parser.add_argument('--units-per-pixel', type=float, default=1.0)
+    parser.add_argument('--seconds-per-frame', type=float, default=None)
+    parser.add_argument('--frame-offset', type=int, default=0)
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--pixel-value', type=float, default=546)
+    parser.add_argument('--um-value', type=float, default=1000)
+    args = parser.parse_args(argv)
+    
+    mapping = TrackMapping() if is_xml_tracks(args.path) else detect_mapping(read_csv_header(args.path)[1])
+    for field in ('x', 'y', 'frame', 'track'):
+        if getattr(args, field):
+            setattr(mapping, field, getattr(args, field))
+    mapping.units_per_pixel = args.units_per_pixel
+    mapping.seconds_per_frame = args.seconds_per_frame
+    mapping.frame_offset = args.frame_offset
+    
+    stats = TrackImporter(args.path, mapping).run()
+    tracks = stats['tracks']
+    speeds = tracks.measurements(args.fps, args.um_value / args.pixel_value)['speed_um_per_sec']
+    first, last = tracks.frame_range
+    print(f"{tracks.point_count} points in {len(tracks)} tracks, frames {first}-{last} "
+          f"({stats['seconds']:.2f} s, {stats['fps']:.0f} rows/s)")
+    if len(speeds):
+        print(f"Mean speed: {speeds.mean():.2f} µm/s over {len(speeds)} pairs")
+
+if __name__ == "__main__":
+    main()
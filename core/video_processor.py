@@ -1,8 +1,61 @@
 import cv2
 import numpy as np
+import time
 from pathlib import Path
 
+from core.decoder_config import decoder_settings
+from core.readers import CropStoreReader, is_crop_store, is_image_input, is_reader_input, open_image_input
+from utils.profiler import profiler
+
+DECODE_FPS_SMOOTHING = 0.1
+
+def open_capture(video_path, fps=None, mode='sequential', config=None):
+    if is_image_input(video_path):
+        return open_image_input(video_path, fps)
+    if is_crop_store(video_path):
+        return CropStoreReader(video_path, fps)
+    config = config or decoder_settings().get(video_path, mode)
+    if config is None:
+        return cv2.VideoCapture(video_path)
+    return config.open(video_path)
+
+def scan_frames(video_path, analysers=(), progress_callback=None, is_cancelled=None, fps=None, report_every=100):
+    cap = open_capture(video_path, fps)
+    if not cap.isOpened():
+        return None
+    
+    estimated = max(1, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    for analyser in analysers:
+        analyser.start(cap)
+    count = 0
+    try:
+        while cap.grab():
+            if analysers:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                for analyser in analysers:
+                    analyser.add(frame, timestamp)
+            count += 1
+            if count % report_every == 0:
+                if is_cancelled and is_cancelled():
+                    return None
+                if progress_callback:
+                    progress_callback(min(99, int(count * 100 / estimated)))
+    finally:
+        cap.release()
+    
+    if progress_callback:
+        progress_callback(100)
+    return count
+
+def count_frames(video_path, progress_callback=None, is_cancelled=None, report_every=100):
+    return scan_frames(video_path, (), progress_callback, is_cancelled, report_every=report_every)
+
 class VideoProcessor:
+    is_live = False
+    
     def __init__(self):
         self.video_path = None
         self.cap = None
@@ -12,18 +65,30 @@ class VideoProcessor:
         self.height = 0
         self.current_frame_number = 0
         self.current_frame = None
+        self.fps_override = None
+        self.decoder_config = None
+        self.backend_name = ""
+        self.decode_seconds = 0.0
+        self.crop = None
         
-    def load_video(self, video_path):
+    def load_video(self, video_path, fps=None, config=None, crop=None):
         if self.cap:
             self.cap.release()
         
         self.video_path = video_path
-        self.cap = cv2.VideoCapture(video_path)
+        self.fps_override = fps
+        self.crop = crop
+        if config is None and not is_reader_input(video_path):
+            config = decoder_settings().get(video_path, 'random')
+        self.decoder_config = config
+        self.cap = open_capture(video_path, fps, 'random', config)
         
         if not self.cap.isOpened():
             raise ValueError("Video dosyası açılamadı!")
         
-        self.fps = int(self.cap.get(cv2.CAP_PROP_FPS))
+        self.fps = float(fps or self.cap.get(cv2.CAP_PROP_FPS))
+        self.backend_name = self.cap.getBackendName()
+        self.decode_seconds = 0.0
         self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
         self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -34,13 +99,46 @@ class VideoProcessor:
             return True
         return False
     
+    def reopen(self, config=None):
+        if not self.video_path:
+            return False
+        cap = open_capture(self.video_path, self.fps_override, 'random', config)
+        if not cap.isOpened():
+            cap.release()
+            return False
+        if self.cap:
+            self.cap.release()
+        self.cap = cap
+        self.decoder_config = config
+        self.backend_name = cap.getBackendName()
+        self.decode_seconds = 0.0
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.current_frame_number + 1)
+        return True
+    
+    @property
+    def source_path(self):
+        return self.crop.source_path if self.crop else self.video_path
+    
+    def source_offset(self):
+        if self.crop is None:
+            return 0, 0, 0
+        return self.crop.x, self.crop.y, self.crop.start_frame
+    
+    def get_decode_fps(self):
+        return 1.0 / self.decode_seconds if self.decode_seconds > 0 else 0.0
+    
+    def set_total_frames(self, total_frames):
+        if total_frames and total_frames > 0:
+            self.total_frames = total_frames
+    
     def get_video_info(self):
         return {
             'fps': self.fps,
             'total_frames': self.total_frames,
             'width': self.width,
             'height': self.height,
-            'duration': self.total_frames / self.fps if self.fps > 0 else 0
+            'duration': self.total_frames / self.fps if self.fps > 0 else 0,
+            'backend': self.backend_name
         }
     
     def get_frame(self, frame_number):
@@ -50,15 +148,27 @@ class VideoProcessor:
         if frame_number < 0 or frame_number >= self.total_frames:
             return None
         
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        ret, frame = self.cap.read()
+        start = time.perf_counter()
+        with profiler.stage("video.seek"):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        with profiler.stage("video.decode"):
+            ret, frame = self.cap.read()
+        elapsed = time.perf_counter() - start
         
         if ret:
+            if self.decode_seconds == 0:
+                self.decode_seconds = elapsed
+            else:
+                self.decode_seconds += DECODE_FPS_SMOOTHING * (elapsed - self.decode_seconds)
             self.current_frame = frame
             self.current_frame_number = frame_number
             return frame
         return None
     
+    def set_current_frame(self, frame_number, frame):
+        self.current_frame = frame
+        self.current_frame_number = frame_number
+    
     def get_current_frame(self):
         return self.current_frame
     
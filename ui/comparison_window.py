@@ -0,0 +1,291 @@
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QFrame,
+                             QPushButton, QLabel, QSlider, QComboBox, QSpinBox, QTextEdit, QMessageBox,
+                             QSizePolicy)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QImage, QPixmap
+import cv2
+from pathlib import Path
+
+from core.calculator import SpeedCalculator
+from core.decoder_pool import DecoderPool
+from core.overlay import draw_points
+from ui.styles import AppStyles
+
+SYNC_MODES = [("frame", "By frame"), ("time", "By time")]
+MAX_COMPARISON_VIDEOS = 4
+
+class ComparisonPanel(QFrame):
+    def __init__(self, stream, pixel_to_um_ratio, point_size=8, parent=None):
+        super().__init__(parent)
+        self.stream = stream
+        self.calculator = SpeedCalculator(stream.fps, pixel_to_um_ratio)
+        self.point_size = point_size
+        self.frame_number = -1
+        self.frame = None
+        self.pending = None
+        self.selecting = False
+        self.setFrameShape(QFrame.Shape.StyledPanel)
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        
+        self.title_label = QLabel(f"{Path(stream.video_path).name}  |  {stream.fps:g} fps, {stream.total_frames} frames")
+        layout.addWidget(self.title_label)
+        
+        self.video_label = QLabel()
+        self.video_label.setMinimumSize(320, 200)
+        self.video_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.video_label.setStyleSheet(f"QLabel {{ background-color: {AppStyles.TEXT_BLACK}; color: white; }}")
+        self.video_label.mousePressEvent = self.video_label_mouse_press
+        layout.addWidget(self.video_label)
+        
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Offset:"))
+        self.offset_spin = QSpinBox()
+        self.offset_spin.setRange(-stream.total_frames, stream.total_frames)
+        self.offset_spin.setToolTip("Frames added to the shared position to align this video")
+        controls_layout.addWidget(self.offset_spin)
+        
+        self.select_btn = QPushButton("Select Points")
+        self.select_btn.setCheckable(True)
+        self.select_btn.toggled.connect(self.set_selecting)
+        controls_layout.addWidget(self.select_btn)
+        
+        self.clear_btn = QPushButton("Clear")
+        self.clear_btn.clicked.connect(self.clear_points)
+        controls_layout.addWidget(self.clear_btn)
+        
+        self.frame_label = QLabel("")
+        controls_layout.addWidget(self.frame_label)
+        controls_layout.addStretch()
+        layout.addLayout(controls_layout)
+    
+    def target_frame(self, mode, position):
+        if mode == "time":
+            frame_number = int(round(position / 1000.0 * self.stream.fps))
+        else:
+            frame_number = position
+        return frame_number + self.offset_spin.value()
+    
+    def show_position(self, mode, position, direction=1):
+        frame_number = self.target_frame(mode, position)
+        last_frame = self.stream.total_frames - 1
+        if frame_number < 0 or frame_number > last_frame:
+            self.pending = None
+            self.frame_label.setText(f"out of range ({frame_number})")
+            return
+        if frame_number == self.frame_number and self.pending is None:
+            return
+        self.pending = (frame_number, self.stream.request(frame_number, direction))
+        self.poll()
+    
+    def poll(self):
+        if self.pending is None:
+            return
+        frame_number, future = self.pending
+        if not future.done():
+            return
+        self.pending = None
+        if future.cancelled() or future.result() is None:
+            return
+        self.frame_number = frame_number
+        self.frame = future.result()
+        self.frame_label.setText(f"Frame {frame_number} / {self.stream.total_frames - 1}  "
+                                 f"({frame_number / self.stream.fps:.3f} s)")
+        self.render()
+    
+    def render(self):
+        if self.frame is None:
+            return
+        frame = draw_points(self.frame.copy(), self.calculator.get_points(), self.point_size)
+        h, w = frame.shape[:2]
+        scale = min(self.video_label.width() / w, self.video_label.height() / h)
+        if scale < 1.0:
+            frame = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))),
+                               interpolation=cv2.INTER_AREA)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        h, w, ch = rgb_frame.shape
+        qt_image = QImage(rgb_frame.data, w, h, ch * w, QImage.Format.Format_RGB888)
+        self.video_label.setPixmap(QPixmap.fromImage(qt_image))
+    
+    def label_to_frame_coords(self, pos):
+        pixmap = self.video_label.pixmap()
+        if pixmap is None or pixmap.isNull() or self.frame is None:
+            return None
+        x_offset = (self.video_label.width() - pixmap.width()) // 2
+        y_offset = (self.video_label.height() - pixmap.height()) // 2
+        click_x = pos.x() - x_offset
+        click_y = pos.y() - y_offset
+        if not (0 <= click_x < pixmap.width() and 0 <= click_y < pixmap.height()):
+            return None
+        frame_h, frame_w = self.frame.shape[:2]
+        return int(click_x * frame_w / pixmap.width()), int(click_y * frame_h / pixmap.height())
+    
+    def video_label_mouse_press(self, event):
+        if not self.selecting or event.button() != Qt.MouseButton.LeftButton:
+            return
+        coords = self.label_to_frame_coords(event.pos())
+        if coords is None:
+            return
+        self.calculator.add_point(coords[0], coords[1], self.frame_number)
+        self.render()
+    
+    def set_selecting(self, selecting):
+        self.selecting = selecting
+        self.select_btn.setText("Stop Selection" if selecting else "Select Points")
+    
+    def clear_points(self):
+        self.calculator.clear_points()
+        self.render()
+
+class ComparisonWindow(QMainWindow):
+    def __init__(self, video_paths, pixel_to_um_ratio, point_size=8, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Erytroscope - Comparison")
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.pool = DecoderPool(expected_streams=len(video_paths))
+        self.panels = []
+        self.position = 0
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+        
+        grid_layout = QGridLayout()
+        columns = 2 if len(video_paths) > 1 else 1
+        for i, video_path in enumerate(video_paths):
+            try:
+                stream = self.pool.open(video_path)
+            except ValueError:
+                self.pool.shutdown()
+                raise
+            panel = ComparisonPanel(stream, pixel_to_um_ratio, point_size)
+            panel.offset_spin.valueChanged.connect(lambda _: self.show_position())
+            self.panels.append(panel)
+            grid_layout.addWidget(panel, i // columns, i % columns)
+        main_layout.addLayout(grid_layout, 1)
+        
+        navigation_layout = QHBoxLayout()
+        navigation_layout.addWidget(QLabel("Sync:"))
+        self.sync_combo = QComboBox()
+        for key, label in SYNC_MODES:
+            self.sync_combo.addItem(label, key)
+        self.sync_combo.currentIndexChanged.connect(self.sync_mode_changed)
+        navigation_layout.addWidget(self.sync_combo)
+        
+        self.position_slider = QSlider(Qt.Orientation.Horizontal)
+        self.position_slider.valueChanged.connect(self.slider_changed)
+        navigation_layout.addWidget(self.position_slider, 1)
+        
+        self.position_label = QLabel("")
+        navigation_layout.addWidget(self.position_label)
+        
+        self.calculate_btn = QPushButton("Calculate All")
+        self.calculate_btn.clicked.connect(self.calculate_all)
+        navigation_layout.addWidget(self.calculate_btn)
+        main_layout.addLayout(navigation_layout)
+        
+        self.results_text = QTextEdit()
+        self.results_text.setReadOnly(True)
+        self.results_text.setMaximumHeight(160)
+        self.results_text.setPlaceholderText("Per-video results will appear here...")
+        main_layout.addWidget(self.results_text)
+        
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_panels)
+        self.poll_timer.start(15)
+        
+        self.setStyleSheet(AppStyles.get_stylesheet())
+        self.position_slider.setRange(0, max(p.stream.total_frames for p in self.panels) - 1)
+        self.show_position()
+        self.resize(1400, 900)
+    
+    @property
+    def sync_mode(self):
+        return self.sync_combo.currentData()
+    
+    def step_size(self):
+        if self.sync_mode == "time":
+            return max(1, int(1000 / max(panel.stream.fps for panel in self.panels)))
+        return 1
+    
+    def sync_mode_changed(self):
+        reference_fps = self.panels[0].stream.fps
+        value = self.position_slider.value()
+        self.position_slider.blockSignals(True)
+        if self.sync_mode == "time":
+            self.position_slider.setRange(0, int(max(p.stream.duration for p in self.panels) * 1000))
+            value = int(value * 1000 / reference_fps)
+        else:
+            self.position_slider.setRange(0, max(p.stream.total_frames for p in self.panels) - 1)
+            value = int(round(value / 1000 * reference_fps))
+        self.position_slider.setSingleStep(self.step_size())
+        self.position_slider.setPageStep(10 * self.step_size())
+        self.position_slider.setValue(value)
+        self.position_slider.blockSignals(False)
+        self.position = self.position_slider.value()
+        self.show_position()
+    
+    def slider_changed(self, value):
+        direction = 1 if value >= self.position else -1
+        self.position = value
+        self.show_position(direction)
+    
+    def show_position(self, direction=1):
+        unit = "ms" if self.sync_mode == "time" else "frame"
+        self.position_label.setText(f"{self.position_slider.value()} {unit}")
+        for panel in self.panels:
+            panel.show_position(self.sync_mode, self.position_slider.value(), direction)
+    
+    def poll_panels(self):
+        for panel in self.panels:
+            panel.poll()
+    
+    def step(self, steps):
+        self.position_slider.setValue(self.position_slider.value() + steps * self.step_size())
+    
+    def calculate_all(self):
+        sections = []
+        for panel in self.panels:
+            name = Path(panel.stream.video_path).name
+            if len(panel.calculator.get_points()) < 2:
+                sections.append(f"{name}: select at least 2 points")
+                continue
+            sections.append(f"{name}\n{panel.calculator.get_summary_text()}")
+        self.results_text.setPlainText("\n\n".join(sections))
+    
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key == Qt.Key.Key_Right:
+            self.step(1)
+        elif key == Qt.Key.Key_Left:
+            self.step(-1)
+        elif key == Qt.Key.Key_PageUp:
+            self.step(-10)
+        elif key == Qt.Key.Key_PageDown:
+            self.step(10)
+        else:
+            super().keyPressEvent(event)
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        for panel in self.panels:
+            panel.render()
+    
+    def closeEvent(self, event):
+        self.poll_timer.stop()
+        self.pool.shutdown()
+        event.accept()
+
+def open_comparison(video_paths, pixel_to_um_ratio, point_size=8, parent=None):
+    if not 2 <= len(video_paths) <= MAX_COMPARISON_VIDEOS:
+        QMessageBox.warning(parent, "Warning", f"Select 2 to {MAX_COMPARISON_VIDEOS} videos to compare!")
+        return None
+    try:
+        window = ComparisonWindow(video_paths, pixel_to_um_ratio, point_size, parent)
+    except ValueError as e:
+        QMessageBox.critical(parent, "Error", f"Video loading error: {str(e)}")
+        return None
+    window.show()
+    return window
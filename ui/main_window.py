@@ -1,16 +1,41 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QPushButton, QLabel, QSlider, QFileDialog, QGroupBox,
                              QStatusBar, QMessageBox, QTextEdit,
-                             QListWidget, QListWidgetItem, QSizePolicy, QScrollArea)
-from PyQt6.QtCore import Qt, QSize
+                             QListWidget, QListWidgetItem, QSizePolicy, QScrollArea,
+                             QProgressBar, QComboBox, QCheckBox, QInputDialog, QProgressDialog, QDialog)
+from PyQt6.QtCore import Qt, QSize, QThread, QTimer
 from PyQt6.QtGui import QImage, QPixmap, QPainter, QPen, QColor, QScreen
 import cv2
 import numpy as np
+import time
 from pathlib import Path
 
 from core.video_processor import VideoProcessor
-from core.calculator import SpeedCalculator
+from core.readers import is_image_input, image_input_fps
+from core.decoder_config import decoder_settings
+from core.calculator import SpeedCalculator, Point
+from core.playback import SequentialDecoder, PlaybackScheduler, PLAYBACK_RATES
+from core.tiles import TiledRenderer
+from core.project import Project, PROJECT_EXTENSION
+from core.results_db import ResultsDatabase
+from core.overlay import draw_points, draw_tracks, speed_labels_for
+from core.export import AnnotatedVideoExporter
+from core.report import ReportGenerator, series_from_calculator
+from core.enhance import EnhancementChain
+from core.projection import PROJECTION_KINDS, ProjectionBuilder, projection_image
+from core.roi_cache import CropRegion, RoiCropWriter, list_crops
+from core.sidecar import SidecarCache
+from core.live import LiveCapture, LiveProcessor, RingExporter, parse_live_source
+from core.activity import active_segments, next_active_frame
+from core.integrity import duplicate_mask, integrity_summary, irregular_mask
+from core.quality import low_quality_mask, next_good_frame
+from core.tracks import TrackImporter, TrackMapping, detect_mapping, is_xml_tracks, read_csv_header
+from utils.profiler import profiler
 from ui.styles import AppStyles
+from ui.workers import VideoLoadWorker, BackgroundExportWorker, default_background_stages
+from ui.widgets import (ActivityStrip, ExportRangeDialog, RoiCacheDialog, LiveCaptureDialog, EnhancementDialog,
+                        ProjectionDialog, TrackImportDialog)
+from ui.comparison_window import open_comparison
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -30,6 +55,51 @@ class MainWindow(QMainWindow):
         self.pan_start_y = 0
         self.contrast = 1.0
         self.point_size = 8
+        self.renderer = TiledRenderer()
+        self.enhancement = EnhancementChain()
+        self.enhancement_dialog = None
+        self.pending_enhancement = None
+        self.render_source = None
+        self.render_serial = 0
+        self.projection = None
+        self.projection_overlay = None
+        self.projection_opacity = 0.5
+        self.blended_frame = None
+        self.imported_tracks = None
+        self.track_trails = None
+        self.enhance_timer = QTimer(self)
+        self.enhance_timer.timeout.connect(self.poll_enhancement)
+        self.view_geometry = None
+        self.hovered_point = None
+        self.dragging_index = None
+        self.hit_radius_px = 8
+        self.load_thread = None
+        self.load_worker = None
+        self.load_ready = False
+        self.retired_loads = []
+        self.export_thread = None
+        self.export_worker = None
+        self.export_progress = None
+        self.comparison_windows = []
+        self.video_cache = None
+        self.video_fps_override = None
+        self.activity_segments = None
+        self.low_quality_frames = None
+        self.duplicate_frames = None
+        self.project = None
+        self.pending_project = None
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.timeout.connect(self.autosave_project)
+        self.autosave_timer.start(2000)
+        self.playback_decoder = None
+        self.playback_scheduler = None
+        self.playback_rate = 1.0
+        self.playback_timer = QTimer(self)
+        self.playback_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.playback_timer.timeout.connect(self.playback_tick)
+        self.live_timer = QTimer(self)
+        self.live_timer.timeout.connect(self.live_tick)
+        self.live_buffer_seconds = 30
         
         self.setWindowTitle("Erytroscope")
         
@@ -78,6 +148,17 @@ class MainWindow(QMainWindow):
         self.video_label.mousePressEvent = self.video_label_mouse_press
         self.video_label.mouseMoveEvent = self.video_label_mouse_move
         self.video_label.mouseReleaseEvent = self.video_label_mouse_release
+        self.video_label.setMouseTracking(True)
+        
+        self.hud_label = QLabel(self.video_label)
+        self.hud_label.setStyleSheet(
+            "QLabel { background-color: rgba(0, 0, 0, 170); color: #7CFC00; "
+            "font-family: Menlo, Consolas, monospace; font-size: 11px; font-weight: normal; padding: 6px; }"
+        )
+        self.hud_label.move(8, 8)
+        self.hud_label.setVisible(False)
+        self.hud_timer = QTimer(self)
+        self.hud_timer.timeout.connect(self.update_hud)
         self.video_label.setScaledContents(False)
         self.video_display_width = video_min_width
         self.video_display_height = video_min_height
@@ -93,6 +174,45 @@ class MainWindow(QMainWindow):
         slider_layout.addWidget(self.frame_label)
         left_layout.addLayout(slider_layout)
         
+        self.activity_strip = ActivityStrip()
+        self.activity_strip.frame_clicked.connect(self.frame_slider.setValue)
+        left_layout.addWidget(self.activity_strip)
+        
+        playback_layout = QHBoxLayout()
+        self.play_btn = QPushButton("Play")
+        self.play_btn.setEnabled(False)
+        self.play_btn.clicked.connect(self.toggle_playback)
+        playback_layout.addWidget(self.play_btn)
+        
+        playback_layout.addWidget(QLabel("Rate:"))
+        self.playback_rate_combo = QComboBox()
+        for rate in PLAYBACK_RATES:
+            self.playback_rate_combo.addItem(f"{rate:g}x", rate)
+        self.playback_rate_combo.setCurrentIndex(PLAYBACK_RATES.index(1.0))
+        self.playback_rate_combo.currentIndexChanged.connect(self.playback_rate_changed)
+        playback_layout.addWidget(self.playback_rate_combo)
+        
+        self.skip_blurred_check = QCheckBox("Skip blurred frames")
+        self.skip_blurred_check.setToolTip("Arrow keys and Page Up/Down skip frames with low focus quality")
+        playback_layout.addWidget(self.skip_blurred_check)
+        
+        self.skip_duplicate_check = QCheckBox("Skip duplicate frames")
+        self.skip_duplicate_check.setToolTip("Arrow keys and Page Up/Down skip frames that repeat the previous frame")
+        playback_layout.addWidget(self.skip_duplicate_check)
+        playback_layout.addStretch()
+        
+        self.live_pause_btn = QPushButton("Pause Live")
+        self.live_pause_btn.setVisible(False)
+        self.live_pause_btn.clicked.connect(self.toggle_live_pause)
+        playback_layout.addWidget(self.live_pause_btn)
+        
+        self.save_buffer_btn = QPushButton("Save Buffer")
+        self.save_buffer_btn.setToolTip("Write the last seconds of the live buffer to a video file")
+        self.save_buffer_btn.setVisible(False)
+        self.save_buffer_btn.clicked.connect(self.save_live_buffer)
+        playback_layout.addWidget(self.save_buffer_btn)
+        left_layout.addLayout(playback_layout)
+        
         zoom_layout = QHBoxLayout()
         self.zoom_in_btn = QPushButton("Zoom In")
         self.zoom_in_btn.setEnabled(False)
@@ -109,6 +229,17 @@ class MainWindow(QMainWindow):
         self.zoom_reset_btn.clicked.connect(self.zoom_reset)
         zoom_layout.addWidget(self.zoom_reset_btn)
         
+        self.cache_roi_btn = QPushButton("Cache ROI")
+        self.cache_roi_btn.setToolTip("Write the visible region to a compact lossless file for repeated analysis")
+        self.cache_roi_btn.setEnabled(False)
+        self.cache_roi_btn.clicked.connect(self.cache_roi)
+        zoom_layout.addWidget(self.cache_roi_btn)
+        
+        self.open_roi_btn = QPushButton("Open Cached ROI")
+        self.open_roi_btn.setEnabled(False)
+        self.open_roi_btn.clicked.connect(self.open_cached_roi)
+        zoom_layout.addWidget(self.open_roi_btn)
+        
         self.zoom_label = QLabel("Zoom: %100")
         self.zoom_label.setContentsMargins(30, 0, 0, 0)
         zoom_layout.addWidget(self.zoom_label)
@@ -128,14 +259,37 @@ class MainWindow(QMainWindow):
         right_layout.setContentsMargins(5, 5, 5, 5)
         
         video_group = QGroupBox("Video Operations")
-        video_group.setMinimumHeight(160)
-        video_group.setMaximumHeight(200)
+        video_group.setMinimumHeight(220)
+        video_group.setMaximumHeight(280)
         video_group_layout = QVBoxLayout()
         video_group_layout.setSpacing(10)
         
+        load_buttons_layout = QHBoxLayout()
         self.load_video_btn = QPushButton("Load Video")
         self.load_video_btn.clicked.connect(self.load_video)
-        video_group_layout.addWidget(self.load_video_btn)
+        load_buttons_layout.addWidget(self.load_video_btn)
+        
+        self.live_btn = QPushButton("Live Capture")
+        self.live_btn.setToolTip("Capture from a camera, stream URL, or a video file played in real time")
+        self.live_btn.clicked.connect(self.start_live_capture)
+        load_buttons_layout.addWidget(self.live_btn)
+        
+        self.compare_btn = QPushButton("Compare Videos")
+        self.compare_btn.setToolTip("Open 2-4 videos side by side with synchronized navigation")
+        self.compare_btn.clicked.connect(self.compare_videos)
+        load_buttons_layout.addWidget(self.compare_btn)
+        video_group_layout.addLayout(load_buttons_layout)
+        
+        project_buttons_layout = QHBoxLayout()
+        self.open_project_btn = QPushButton("Open Project")
+        self.open_project_btn.clicked.connect(self.open_project)
+        project_buttons_layout.addWidget(self.open_project_btn)
+        
+        self.save_project_btn = QPushButton("Save Project")
+        self.save_project_btn.setEnabled(False)
+        self.save_project_btn.clicked.connect(self.save_project)
+        project_buttons_layout.addWidget(self.save_project_btn)
+        video_group_layout.addLayout(project_buttons_layout)
         
         self.video_info_label = QLabel("No video information")
         self.video_info_label.setWordWrap(True)
@@ -159,6 +313,9 @@ class MainWindow(QMainWindow):
         self.contrast_value_label.setAlignment(Qt.AlignmentFlag.AlignRight)
         contrast_label_layout.addWidget(self.contrast_value_label)
         contrast_label_layout.addStretch()
+        self.filters_btn = QPushButton("Filters...")
+        self.filters_btn.clicked.connect(self.show_enhancement_dialog)
+        contrast_label_layout.addWidget(self.filters_btn)
         contrast_group_layout.addLayout(contrast_label_layout)
         
         self.contrast_slider = QSlider(Qt.Orientation.Horizontal)
@@ -173,6 +330,37 @@ class MainWindow(QMainWindow):
         contrast_group.setLayout(contrast_group_layout)
         right_layout.addWidget(contrast_group)
         
+        projection_group = QGroupBox("Projection Guide")
+        projection_group.setMinimumHeight(80)
+        projection_group.setMaximumHeight(120)
+        projection_group_layout = QVBoxLayout()
+        projection_group_layout.setSpacing(10)
+        
+        projection_controls_layout = QHBoxLayout()
+        self.projection_combo = QComboBox()
+        self.projection_combo.addItem("Off", None)
+        for kind in PROJECTION_KINDS:
+            self.projection_combo.addItem(kind.capitalize(), kind)
+        self.projection_combo.setEnabled(False)
+        self.projection_combo.currentIndexChanged.connect(self.projection_kind_changed)
+        projection_controls_layout.addWidget(self.projection_combo)
+        
+        self.projection_btn = QPushButton("Compute...")
+        self.projection_btn.setEnabled(False)
+        self.projection_btn.clicked.connect(self.compute_projection)
+        projection_controls_layout.addWidget(self.projection_btn)
+        projection_group_layout.addLayout(projection_controls_layout)
+        
+        self.projection_opacity_slider = QSlider(Qt.Orientation.Horizontal)
+        self.projection_opacity_slider.setRange(0, 100)
+        self.projection_opacity_slider.setValue(int(self.projection_opacity * 100))
+        self.projection_opacity_slider.setToolTip("Projection opacity")
+        self.projection_opacity_slider.valueChanged.connect(self.projection_opacity_changed)
+        projection_group_layout.addWidget(self.projection_opacity_slider)
+        
+        projection_group.setLayout(projection_group_layout)
+        right_layout.addWidget(projection_group)
+        
         point_size_group = QGroupBox("Point Size")
         point_size_group.setMinimumHeight(80)
         point_size_group.setMaximumHeight(120)
@@ -232,6 +420,33 @@ class MainWindow(QMainWindow):
         points_group.setLayout(points_layout)
         right_layout.addWidget(points_group)
         
+        tracks_group = QGroupBox("Imported Tracks")
+        tracks_layout = QVBoxLayout()
+        tracks_layout.setSpacing(10)
+        
+        tracks_buttons_layout = QHBoxLayout()
+        self.import_tracks_btn = QPushButton("Import Tracks...")
+        self.import_tracks_btn.setToolTip("Load trajectories from tracker output (CSV/TSV tables or TrackMate XML)")
+        self.import_tracks_btn.setEnabled(False)
+        self.import_tracks_btn.clicked.connect(self.import_tracks)
+        tracks_buttons_layout.addWidget(self.import_tracks_btn)
+        
+        self.show_tracks_check = QCheckBox("Show")
+        self.show_tracks_check.setChecked(True)
+        self.show_tracks_check.setEnabled(False)
+        self.show_tracks_check.toggled.connect(self.show_tracks_toggled)
+        tracks_buttons_layout.addWidget(self.show_tracks_check)
+        tracks_layout.addLayout(tracks_buttons_layout)
+        
+        self.track_combo = QComboBox()
+        self.track_combo.setEnabled(False)
+        self.track_combo.setToolTip("Load a track into the point list for measurement")
+        self.track_combo.currentIndexChanged.connect(self.track_selected)
+        tracks_layout.addWidget(self.track_combo)
+        
+        tracks_group.setLayout(tracks_layout)
+        right_layout.addWidget(tracks_group)
+        
         calc_group = QGroupBox("Calculation")
         calc_layout = QVBoxLayout()
         calc_layout.setSpacing(10)
@@ -252,6 +467,21 @@ class MainWindow(QMainWindow):
         self.export_btn.clicked.connect(self.export_results)
         calc_layout.addWidget(self.export_btn)
         
+        self.report_btn = QPushButton("Generate Report")
+        self.report_btn.setEnabled(False)
+        self.report_btn.clicked.connect(self.generate_report)
+        calc_layout.addWidget(self.report_btn)
+        
+        self.save_db_btn = QPushButton("Save to Results Database")
+        self.save_db_btn.setEnabled(False)
+        self.save_db_btn.clicked.connect(self.save_results_to_database)
+        calc_layout.addWidget(self.save_db_btn)
+        
+        self.export_video_btn = QPushButton("Export Annotated Video")
+        self.export_video_btn.setEnabled(False)
+        self.export_video_btn.clicked.connect(self.export_annotated_video)
+        calc_layout.addWidget(self.export_video_btn)
+        
         calc_group.setLayout(calc_layout)
         right_layout.addWidget(calc_group)
         
@@ -268,107 +498,777 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Ready")
         
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setVisible(False)
+        self.status_bar.addPermanentWidget(self.load_progress)
+        
+        self.playback_stats_label = QLabel("")
+        self.status_bar.addPermanentWidget(self.playback_stats_label)
+        
     def load_video(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, 
             "Select Video", 
             "", 
-            "Video Files (*.mp4 *.avi *.mov *.mkv)"
+            "Video Files (*.mp4 *.avi *.mov *.mkv);;"
+            "Image Sequences / TIFF Stacks (*.tif *.tiff *.png *.jpg *.jpeg *.bmp);;"
+            "All Files (*)"
         )
         
-        if file_path:
+        if not file_path:
+            return
+        
+        fps = None
+        if is_image_input(file_path):
+            fps, ok = QInputDialog.getDouble(
+                self,
+                "Frame Rate",
+                "Frames per second of the image sequence:",
+                image_input_fps(file_path) or 30.0,
+                0.001, 1000000.0, 3
+            )
+            if not ok:
+                return
+        
+        self.close_project()
+        self.open_video(file_path, fps=fps)
+    
+    def compare_videos(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Select Videos to Compare",
+            "",
+            "Video Files (*.mp4 *.avi *.mov *.mkv);;All Files (*)"
+        )
+        if not file_paths:
+            return
+        
+        window = open_comparison(file_paths, self.um_value / self.pixel_value, self.point_size, self)
+        if window is not None:
+            self.comparison_windows.append(window)
+            window.destroyed.connect(lambda _=None, closed=window: self.comparison_windows.remove(closed))
+    
+    def start_live_capture(self):
+        dialog = LiveCaptureDialog(buffer_seconds=self.live_buffer_seconds, parent=self)
+        if dialog.exec() != QDialog.DialogCode.Accepted or not dialog.get_source():
+            return
+        
+        self.live_buffer_seconds = dialog.get_buffer_seconds()
+        try:
+            capture = LiveCapture(parse_live_source(dialog.get_source()), self.live_buffer_seconds,
+                                  dialog.get_fps())
+        except (OSError, ValueError, cv2.error) as e:
+            QMessageBox.critical(self, "Error", f"Live capture error: {str(e)}")
+            return
+        
+        self.close_project()
+        self.stop_playback()
+        self.cancel_video_loading()
+        self.video_fps_override = None
+        capture.start()
+        self.activate_processor(LiveProcessor(capture))
+        self.status_bar.showMessage(
+            f"Live capture: {capture.label} ({capture.ring.capacity} frame buffer, "
+            f"{capture.ring.frames.nbytes / 1e6:.0f} MB)"
+        )
+    
+    def live_tick(self):
+        processor = self.video_processor
+        if not processor.is_live:
+            self.live_timer.stop()
+            return
+        
+        stats = processor.capture.stats()
+        self.playback_stats_label.setText(
+            f"Live: {stats['fps']:.1f} fps | buffer {stats['buffered']}/{stats['capacity']} | "
+            f"dropped {stats['dropped']} | overruns {stats['overruns']} | "
+            f"jitter {stats['jitter_ms']:.1f} ms (max {stats['max_jitter_ms']:.0f})"
+        )
+        if processor.paused:
+            return
+        if processor.capture.error is not None:
+            self.status_bar.showMessage(f"Live capture error: {processor.capture.error}")
+        elif not processor.capture.running:
+            self.status_bar.showMessage("Live source ended")
+        if processor.show_latest():
+            self.frame_label.setText(f"live / {processor.total_frames} buffered")
+            self.display_frame()
+    
+    def toggle_live_pause(self):
+        processor = self.video_processor
+        if not processor.is_live:
+            return
+        
+        if processor.paused:
+            self.clear_all_points()
+            processor.resume()
+            self.calculator.set_frame_integrity(None)
+            self.frame_slider.setEnabled(False)
+            self.live_pause_btn.setText("Pause Live")
+            self.status_bar.showMessage("Live capture resumed")
+            return
+        
+        processor.pause()
+        self.calculator.fps = processor.fps
+        self.calculator.set_frame_integrity(processor.frame_integrity)
+        last_frame = processor.total_frames - 1
+        self.frame_slider.blockSignals(True)
+        self.frame_slider.setMaximum(last_frame)
+        self.frame_slider.setValue(last_frame)
+        self.frame_slider.blockSignals(False)
+        self.frame_slider.setEnabled(True)
+        self.frame_label.setText(f"{last_frame} / {last_frame}")
+        self.live_pause_btn.setText("Resume Live")
+        self.update_video_info()
+        self.display_frame()
+        self.status_bar.showMessage(
+            f"Live capture paused: {processor.total_frames} buffered frames at {processor.fps:.2f} fps"
+        )
+    
+    def save_live_buffer(self):
+        processor = self.video_processor
+        if not processor.is_live or self.export_worker is not None:
+            return
+        
+        seconds, ok = QInputDialog.getInt(
+            self, "Save Buffer", "Save the last N seconds:", self.live_buffer_seconds, 1, 3600
+        )
+        if not ok:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Buffer",
+            f"live_{time.strftime('%Y%m%d_%H%M%S')}.avi",
+            "AVI Video (*.avi);;MP4 Video (*.mp4)"
+        )
+        if not file_path:
+            return
+        
+        exporter = RingExporter(processor.capture, file_path, seconds)
+        self.start_background_export(exporter, "Saving live buffer...", self.on_buffer_saved)
+    
+    def on_buffer_saved(self, stats):
+        if stats['cancelled']:
+            self.status_bar.showMessage(f"Buffer save cancelled after {stats['frames']} frames")
+            return
+        message = f"Buffer saved: {stats['frames']} frames at {stats['video_fps']:.2f} fps to {Path(stats['path']).name}"
+        if stats['missing_frames']:
+            message += f" ({stats['missing_frames']} frames were overwritten before they could be saved)"
+        self.status_bar.showMessage(message)
+    
+    def open_video(self, file_path, cache_root=None, fps=None):
+        self.stop_playback()
+        self.cancel_video_loading()
+        
+        self.video_fps_override = fps
+        self.load_thread = QThread()
+        self.load_worker = VideoLoadWorker(file_path, default_background_stages(), cache_root, fps)
+        self.load_worker.moveToThread(self.load_thread)
+        self.load_thread.started.connect(self.load_worker.run)
+        self.load_worker.first_frame_ready.connect(self.on_first_frame_ready)
+        self.load_worker.cache_ready.connect(self.on_cache_ready)
+        self.load_worker.progress.connect(self.on_load_progress)
+        self.load_worker.stage_finished.connect(self.on_load_stage_finished)
+        self.load_worker.failed.connect(self.on_load_failed)
+        self.load_worker.finished.connect(self.on_load_finished)
+        self.load_worker.finished.connect(self.load_thread.quit)
+        self.load_thread.finished.connect(self.release_finished_loads)
+        
+        self.load_ready = False
+        self.load_progress.setValue(0)
+        self.load_progress.setVisible(True)
+        self.status_bar.showMessage(f"Opening video: {Path(file_path).name}")
+        self.load_thread.start()
+    
+    def cancel_video_loading(self):
+        if self.load_worker:
+            self.load_worker.cancel()
+            self.retired_loads.append((self.load_thread, self.load_worker))
+        self.load_thread = None
+        self.load_worker = None
+        self.load_progress.setVisible(False)
+    
+    def release_finished_loads(self):
+        self.retired_loads = [(thread, worker) for thread, worker in self.retired_loads
+                              if thread.isRunning()]
+    
+    def on_first_frame_ready(self, processor):
+        if self.sender() is not self.load_worker:
+            processor.release()
+            return
+        
+        self.load_ready = True
+        self.activate_processor(processor)
+        self.status_bar.showMessage(f"Video loaded: {Path(self.video_processor.video_path).name}")
+    
+    def activate_processor(self, processor):
+        self.live_timer.stop()
+        carried_points = None
+        same_source = self.video_loaded and processor.source_path == self.video_processor.source_path
+        if self.calculator and same_source:
+            carried_points = self.calculator.points_to_array()
+        if not same_source:
+            self.set_imported_tracks(None)
+        self.video_processor.release()
+        self.video_processor = processor
+        self.video_loaded = True
+        self.renderer.reset()
+        self.enhancement.clear()
+        self.pending_enhancement = None
+        self.projection = None
+        self.projection_overlay = None
+        self.blended_frame = None
+        self.projection_combo.blockSignals(True)
+        self.projection_combo.setCurrentIndex(0)
+        self.projection_combo.blockSignals(False)
+        self.projection_combo.setEnabled(False)
+        info = self.video_processor.get_video_info()
+        
+        pixels = self.pixel_value
+        um = self.um_value
+        self.calculator = SpeedCalculator(info['fps'], um / pixels)
+        
+        self.update_video_info()
+        
+        self.frame_slider.blockSignals(True)
+        self.frame_slider.setMaximum(info['total_frames'] - 1)
+        self.frame_slider.setValue(0)
+        self.frame_slider.blockSignals(False)
+        self.frame_label.setText(f"0 / {info['total_frames'] - 1}")
+        live = self.video_processor.is_live
+        self.frame_slider.setEnabled(not live)
+        self.play_btn.setEnabled(not live)
+        self.export_video_btn.setEnabled(not live)
+        self.select_point_btn.setEnabled(True)
+        self.zoom_in_btn.setEnabled(True)
+        self.zoom_out_btn.setEnabled(True)
+        self.zoom_reset_btn.setEnabled(True)
+        self.cache_roi_btn.setEnabled(not live)
+        self.projection_btn.setEnabled(not live)
+        self.import_tracks_btn.setEnabled(not live)
+        self.open_roi_btn.setEnabled(not live)
+        self.live_pause_btn.setVisible(live)
+        self.live_pause_btn.setText("Pause Live")
+        self.save_buffer_btn.setVisible(live)
+        
+        self.selecting_point = False
+        self.select_point_btn.setText("Select Point")
+        self.select_point_btn.setStyleSheet("")
+        
+        self.clear_all_points()
+        self.zoom_reset()
+        
+        self.video_display_width = self.video_label.width()
+        self.video_display_height = self.video_label.height()
+        
+        self.video_cache = None
+        self.activity_segments = None
+        self.low_quality_frames = None
+        self.duplicate_frames = None
+        self.activity_strip.clear()
+        self.activity_strip.set_current_frame(0)
+        self.save_project_btn.setEnabled(not live)
+        
+        if self.pending_project is not None:
+            self.apply_project(*self.pending_project)
+            self.pending_project = None
+        elif carried_points is not None and len(carried_points):
+            self.load_points(carried_points)
+        if self.project is not None:
+            self.calculator.add_listener(self.project.record)
+        
+        self.display_frame()
+        if live:
+            self.live_timer.start(15)
+    
+    def on_cache_ready(self, cache):
+        if self.sender() is not self.load_worker:
+            return
+        self.video_cache = cache
+        if self.project is not None and cache is not None and self.video_processor.crop is None:
+            self.project.link_sidecar("cache", str(cache.root))
+    
+    def on_load_progress(self, stage, percent):
+        if self.sender() is not self.load_worker:
+            return
+        self.load_progress.setFormat(f"{stage}: %p%")
+        self.load_progress.setValue(percent)
+    
+    def on_load_stage_finished(self, key, result):
+        if self.sender() is not self.load_worker:
+            return
+        
+        if key == "analysis" and result is not None:
+            for name in ("frame_count", "activity", "quality", "integrity"):
+                self.apply_load_result(name, result[name])
+        else:
+            self.apply_load_result(key, result)
+    
+    def apply_load_result(self, key, result):
+        if key == "decoder" and result:
+            config = decoder_settings().get(self.video_processor.video_path, 'random')
+            if config is not None and config != self.video_processor.decoder_config:
+                if self.video_processor.reopen(config):
+                    self.update_video_info()
+        elif key == "frame_count" and result:
+            if result != self.video_processor.total_frames:
+                self.video_processor.set_total_frames(result)
+                self.frame_slider.setMaximum(result - 1)
+                self.frame_label.setText(f"{self.frame_slider.value()} / {result - 1}")
+                self.update_video_info()
+        elif key == "activity" and result is not None:
+            self.activity_segments = active_segments(result)
+            self.activity_strip.set_activity(result, self.activity_segments, self.video_processor.total_frames)
+            self.status_bar.showMessage(f"Activity index ready: {len(self.activity_segments)} active segments")
+        elif key == "quality" and result is not None:
+            self.low_quality_frames = low_quality_mask(result)
+            crop = self.video_processor.crop
+            self.calculator.set_low_quality_frames(
+                crop.to_source_mask(self.low_quality_frames) if crop else self.low_quality_frames
+            )
+            self.activity_strip.set_low_quality(self.low_quality_frames)
+            self.status_bar.showMessage(f"Focus scoring ready: {int(self.low_quality_frames.sum())} blurred frames")
+        elif key == "integrity" and result is not None:
+            self.duplicate_frames = duplicate_mask(result)
+            crop = self.video_processor.crop
+            self.calculator.set_frame_integrity(crop.to_source_mask(result) if crop else result)
+            self.activity_strip.set_irregular(irregular_mask(result))
+            summary = integrity_summary(result)
+            self.status_bar.showMessage(
+                f"Timing check ready: {summary['duplicates']} duplicate, {summary['dropped']} dropped frames"
+            )
+            self.invalidate_results()
+    
+    def on_load_failed(self, message):
+        if self.sender() is not self.load_worker:
+            return
+        if self.load_ready:
+            self.status_bar.showMessage(f"Background task error: {message}")
+        else:
+            QMessageBox.critical(self, "Error", f"Video loading error: {message}")
+    
+    def on_load_finished(self):
+        if self.sender() is not self.load_worker:
+            return
+        self.retired_loads.append((self.load_thread, self.load_worker))
+        self.load_thread = None
+        self.load_worker = None
+        self.load_progress.setVisible(False)
+    
+    def update_video_info(self):
+        info = self.video_processor.get_video_info()
+        decoder = info['backend']
+        if self.video_processor.decoder_config is not None:
+            decoder = f"{decoder} ({self.video_processor.decoder_config.label})"
+        self.video_info_label.setText(
+            f"FPS: {info['fps']:g}\n"
+            f"Total Frames: {info['total_frames']}\n"
+            f"Resolution: {info['width']}x{info['height']}\n"
+            f"Duration: {info['duration']:.2f} sec\n"
+            f"Decoder: {decoder}"
+        )
+        crop = self.video_processor.crop
+        if crop is not None:
+            self.video_info_label.setText(
+                f"{self.video_info_label.text()}\n"
+                f"ROI: {crop.label} of {Path(crop.source_path).name}"
+            )
+    
+    def open_project(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open Project",
+            "",
+            f"Hız Analiz Project (*{PROJECT_EXTENSION})"
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            project, points = Project.load(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Project loading error: {str(e)}")
+            return
+        
+        video_path = project.resolve_video_path()
+        if video_path is None:
+            QMessageBox.critical(self, "Error", f"Project video not found:\n{project.video_path}")
+            return
+        
+        if not project.verify_video(video_path):
+            answer = QMessageBox.question(
+                self,
+                "Warning",
+                "The video content does not match the project. Open anyway?"
+            )
+            if answer != QMessageBox.StandardButton.Yes:
+                return
+            project.set_video(video_path)
+        
+        self.close_project()
+        self.project = project
+        self.pending_project = (project, points)
+        self.open_video(video_path, project.sidecars.get("cache"), project.calibration.get('fps'))
+    
+    def apply_project(self, project, points):
+        calibration = project.calibration
+        self.pixel_value = calibration.get('pixel_value', self.pixel_value)
+        self.um_value = calibration.get('um_value', self.um_value)
+        self.calculator.set_pixel_ratio(self.pixel_value, self.um_value)
+        
+        self.load_points(points)
+        
+        view = project.view
+        if 'enhancement' in view:
+            self.enhancement.load_list(view['enhancement'])
+            if self.enhancement_dialog is not None:
+                self.enhancement_dialog.refresh()
+        self.contrast_slider.setValue(int(view.get('contrast', self.contrast) * 100))
+        self.point_size_slider.setValue(view.get('point_size', self.point_size))
+        self.zoom_level = view.get('zoom_level', 1.0)
+        self.zoom_offset_x = view.get('zoom_offset_x', 0)
+        self.zoom_offset_y = view.get('zoom_offset_y', 0)
+        self.zoom_label.setText(f"Zoom: %{int(self.zoom_level * 100)}")
+        if self.zoom_level > 1.0:
+            self.video_label.setCursor(Qt.CursorShape.OpenHandCursor)
+        
+        frame_number = view.get('frame', 0)
+        if 0 < frame_number < self.video_processor.total_frames:
+            self.frame_slider.setValue(frame_number)
+    
+    def load_points(self, points):
+        self.calculator.load_points_array(points)
+        self.points_list.addItems([self.point_item_text(i) for i in range(len(points))])
+        count = len(points)
+        self.clear_last_btn.setEnabled(count > 0)
+        self.clear_all_btn.setEnabled(count > 0)
+        self.calculate_btn.setEnabled(count >= 2)
+    
+    def save_project(self):
+        if not self.video_loaded or not self.calculator:
+            return
+        
+        if self.project is None:
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save Project",
+                f"{Path(self.video_processor.source_path).stem}{PROJECT_EXTENSION}",
+                f"Hız Analiz Project (*{PROJECT_EXTENSION})"
+            )
+            if not file_path:
+                return
+            if not file_path.endswith(PROJECT_EXTENSION):
+                file_path += PROJECT_EXTENSION
+            
+            self.project = Project(file_path)
+            cropped = self.video_processor.crop is not None
+            video_hash = self.video_cache.video_hash if self.video_cache and not cropped else None
+            self.project.set_video(self.video_processor.source_path, video_hash)
+            if self.video_cache is not None and not cropped:
+                self.project.link_sidecar("cache", str(self.video_cache.root))
+            self.calculator.add_listener(self.project.record)
+        
+        try:
+            self.update_project_settings()
+            self.project.save(self.calculator.points_to_array())
+            self.status_bar.showMessage(f"Project saved: {self.project.path.name}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Save error: {str(e)}")
+    
+    def update_project_settings(self):
+        self.project.set_calibration(self.pixel_value, self.um_value, self.video_fps_override)
+        self.project.update_view(
+            contrast=self.contrast,
+            enhancement=self.enhancement.to_list(),
+            point_size=self.point_size,
+            zoom_level=self.zoom_level,
+            zoom_offset_x=self.zoom_offset_x,
+            zoom_offset_y=self.zoom_offset_y,
+            frame=self.video_processor.current_frame_number + self.video_processor.source_offset()[2]
+        )
+    
+    def autosave_project(self):
+        if self.project is None or self.project.generation == 0 or self.pending_project is not None:
+            return
+        if not self.video_loaded:
+            return
+        
+        self.update_project_settings()
+        if self.project.has_pending():
             try:
-                if self.video_processor.load_video(file_path):
-                    self.video_loaded = True
-                    info = self.video_processor.get_video_info()
-                    
-                    pixels = self.pixel_value
-                    um = self.um_value
-                    self.calculator = SpeedCalculator(info['fps'], um / pixels)
-                    
-                    self.video_info_label.setText(
-                        f"FPS: {info['fps']}\n"
-                        f"Total Frames: {info['total_frames']}\n"
-                        f"Resolution: {info['width']}x{info['height']}\n"
-                        f"Duration: {info['duration']:.2f} sec"
-                    )
-                    
-                    self.frame_slider.setMaximum(info['total_frames'] - 1)
-                    self.frame_slider.setValue(0)
-                    self.frame_slider.setEnabled(True)
-                    self.select_point_btn.setEnabled(True)
-                    self.zoom_in_btn.setEnabled(True)
-                    self.zoom_out_btn.setEnabled(True)
-                    self.zoom_reset_btn.setEnabled(True)
-                    
-                    self.selecting_point = False
-                    self.select_point_btn.setText("Select Point")
-                    self.select_point_btn.setStyleSheet("")
-                    
-                    self.clear_all_points()
-                    self.zoom_reset()
-                    
-                    self.video_display_width = self.video_label.width()
-                    self.video_display_height = self.video_label.height()
-                    
-                    self.display_frame()
-                    self.status_bar.showMessage(f"Video loaded: {Path(file_path).name}")
-                else:
-                    QMessageBox.critical(self, "Error", "Failed to load video!")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Video loading error: {str(e)}")
+                self.project.flush()
+            except OSError as e:
+                self.status_bar.showMessage(f"Autosave error: {str(e)}")
+    
+    def close_project(self):
+        if self.project is None:
+            return
+        self.autosave_project()
+        if self.calculator:
+            self.calculator.remove_listener(self.project.record)
+        self.project = None
+        self.pending_project = None
     
     def slider_changed(self, value):
         if self.video_loaded:
+            if self.playback_timer.isActive():
+                self.start_playback(value)
+                return
             self.video_processor.get_frame(value)
             self.display_frame()
             self.frame_label.setText(f"{value} / {self.video_processor.total_frames - 1}")
+            self.activity_strip.set_current_frame(value)
+            self.playback_stats_label.setText(f"Random access: {self.video_processor.get_decode_fps():.0f} fps")
+    
+    def toggle_playback(self):
+        if self.playback_timer.isActive():
+            self.stop_playback()
+        elif self.video_loaded:
+            start_frame = self.video_processor.current_frame_number
+            if start_frame >= self.video_processor.total_frames - 1:
+                start_frame = 0
+            self.start_playback(start_frame)
+    
+    def start_playback(self, start_frame):
+        if self.playback_decoder:
+            self.playback_decoder.stop()
+        
+        fps = self.video_processor.fps or 30
+        self.playback_decoder = SequentialDecoder(self.video_processor.video_path, start_frame)
+        self.playback_scheduler = PlaybackScheduler(
+            fps, self.playback_rate, start_frame, self.video_processor.total_frames
+        )
+        self.playback_decoder.start()
+        self.playback_scheduler.start()
+        
+        frame_period_ms = 1000.0 / (fps * self.playback_rate)
+        self.playback_timer.start(max(4, int(frame_period_ms / 2)))
+        self.play_btn.setText("Pause")
+        self.status_bar.showMessage(f"Playing at {self.playback_rate:g}x")
+    
+    def stop_playback(self):
+        self.playback_timer.stop()
+        if self.playback_decoder:
+            self.playback_decoder.stop()
+            self.playback_decoder = None
+        self.play_btn.setText("Play")
+        
+        if self.playback_scheduler and self.video_loaded:
+            self.playback_scheduler = None
+            self.video_processor.get_frame(self.video_processor.current_frame_number)
+            self.status_bar.showMessage("Playback paused")
+    
+    def playback_rate_changed(self, index):
+        self.playback_rate = self.playback_rate_combo.itemData(index)
+        if self.playback_timer.isActive():
+            self.start_playback(self.video_processor.current_frame_number)
+    
+    def playback_tick(self):
+        now = time.perf_counter()
+        item = self.playback_scheduler.select(self.playback_decoder, now)
+        
+        if item is not None:
+            frame_number, frame = item
+            self.video_processor.set_current_frame(frame_number, frame)
+            self.frame_slider.blockSignals(True)
+            self.frame_slider.setValue(frame_number)
+            self.frame_slider.blockSignals(False)
+            self.frame_label.setText(f"{frame_number} / {self.video_processor.total_frames - 1}")
+            self.activity_strip.set_current_frame(frame_number)
+            self.display_frame()
+        
+        stats = self.playback_scheduler.get_stats(self.playback_decoder)
+        self.playback_stats_label.setText(
+            f"Shown: {stats['shown']}  Dropped: {stats['dropped']}  Late: {stats['late']}  "
+            f"Decode: {self.playback_decoder.decode_fps:.0f} fps"
+        )
+        
+        if self.playback_scheduler.is_finished(self.playback_decoder, now):
+            self.stop_playback()
+    
+    def step_frames(self, step):
+        current = self.frame_slider.value()
+        last_frame = self.frame_slider.maximum()
+        mask = self.navigation_mask()
+        if mask is not None:
+            target = next_good_frame(mask, current, step, last_frame)
+        else:
+            target = min(max(0, current + step), last_frame)
+        self.frame_slider.setValue(target)
+    
+    def navigation_mask(self):
+        masks = []
+        if self.skip_blurred_check.isChecked() and self.low_quality_frames is not None:
+            masks.append(self.low_quality_frames)
+        if self.skip_duplicate_check.isChecked() and self.duplicate_frames is not None:
+            masks.append(self.duplicate_frames)
+        if not masks:
+            return None
+        combined = np.zeros(max(len(mask) for mask in masks), dtype=bool)
+        for mask in masks:
+            combined[:len(mask)] |= mask
+        return combined
+    
+    def jump_to_activity(self, forward):
+        if self.activity_segments is None:
+            self.status_bar.showMessage("Activity index is not ready yet")
+            return
+        
+        target = next_active_frame(self.activity_segments, self.frame_slider.value(), forward)
+        if target is None:
+            self.status_bar.showMessage("No more active segments")
+            return
+        self.frame_slider.setValue(min(target, self.frame_slider.maximum()))
     
     def contrast_changed(self, value):
         self.contrast = value / 100.0
         self.contrast_value_label.setText(f"{self.contrast:.1f}")
+        self.enhancement.set_stage('levels', contrast=self.contrast)
+        if self.enhancement_dialog is not None:
+            self.enhancement_dialog.refresh()
         if self.video_loaded:
             self.display_frame()
     
+    def show_enhancement_dialog(self):
+        if self.enhancement_dialog is None:
+            self.enhancement_dialog = EnhancementDialog(self.enhancement, self)
+            self.enhancement_dialog.changed.connect(self.enhancement_changed)
+        self.enhancement_dialog.show()
+        self.enhancement_dialog.raise_()
+    
+    def enhancement_changed(self):
+        contrast = self.enhancement.stage('levels').values['contrast']
+        if abs(contrast - self.contrast) > 1e-6:
+            self.contrast_slider.blockSignals(True)
+            self.contrast_slider.setValue(int(round(contrast * 100)))
+            self.contrast_slider.blockSignals(False)
+            self.contrast = contrast
+            self.contrast_value_label.setText(f"{self.contrast:.1f}")
+        if self.video_loaded:
+            self.display_frame()
+    
+    def enhanced_frame(self, frame, source_key):
+        chain = self.enhancement
+        if chain.is_identity:
+            return frame
+        cached = chain.cached(source_key)
+        if cached is not None:
+            return cached
+        if not chain.is_expensive:
+            return chain.apply(frame, source_key)
+        
+        pending_key = (source_key, chain.key())
+        if self.pending_enhancement is None or self.pending_enhancement[0] != pending_key:
+            self.pending_enhancement = (pending_key, chain.submit(frame, source_key))
+            self.enhance_timer.start(15)
+            self.status_bar.showMessage("Applying filters...")
+        return frame
+    
+    def poll_enhancement(self):
+        if self.pending_enhancement is None:
+            self.enhance_timer.stop()
+            return
+        pending_key, future = self.pending_enhancement
+        if not future.done():
+            return
+        self.enhance_timer.stop()
+        self.pending_enhancement = None
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self.status_bar.showMessage(f"Filter error: {future.exception()}")
+            return
+        self.status_bar.clearMessage()
+        if self.video_loaded and pending_key == (self.render_source_key(), self.enhancement.key()):
+            self.display_frame()
+    
     def point_size_changed(self, value):
         self.point_size = value
         self.point_size_value_label.setText(f"{self.point_size}")
         if self.video_loaded:
             self.display_frame()
     
+    def get_viewport(self, frame_width, frame_height):
+        if self.zoom_level <= 1.0:
+            return 0, 0, frame_width, frame_height
+        
+        crop_w = int(frame_width / self.zoom_level)
+        crop_h = int(frame_height / self.zoom_level)
+        
+        center_x = frame_width // 2 + self.zoom_offset_x
+        center_y = frame_height // 2 + self.zoom_offset_y
+        
+        x1 = max(0, center_x - crop_w // 2)
+        y1 = max(0, center_y - crop_h // 2)
+        x2 = min(frame_width, x1 + crop_w)
+        y2 = min(frame_height, y1 + crop_h)
+        
+        x1 = max(0, x2 - crop_w)
+        y1 = max(0, y2 - crop_h)
+        return x1, y1, x2, y2
+    
     def display_frame(self):
         frame = self.video_processor.get_current_frame()
         if frame is not None:
-            display_frame = frame.copy()
-            
-            if self.contrast != 1.0:
-                display_frame = cv2.convertScaleAbs(display_frame, alpha=self.contrast, beta=0)
-            
-            display_frame = self.draw_points_on_frame(display_frame)
-            
-            if self.zoom_level > 1.0:
-                h, w = display_frame.shape[:2]
-                crop_w = int(w / self.zoom_level)
-                crop_h = int(h / self.zoom_level)
-                
-                center_x = w // 2 + self.zoom_offset_x
-                center_y = h // 2 + self.zoom_offset_y
-                
-                x1 = max(0, center_x - crop_w // 2)
-                y1 = max(0, center_y - crop_h // 2)
-                x2 = min(w, x1 + crop_w)
-                y2 = min(h, y1 + crop_h)
-                
-                x1 = max(0, x2 - crop_w)
-                y1 = max(0, y2 - crop_h)
-                
-                display_frame = display_frame[y1:y2, x1:x2]
-            
+            with profiler.stage("display.total"):
+                self.render_frame(frame)
+    
+    def projection_overlay_key(self):
+        if self.projection_overlay is None or self.projection_opacity <= 0:
+            return None
+        return (self.projection['key'], self.projection_combo.currentData(), self.projection_opacity)
+    
+    def blend_projection(self, frame, render_key):
+        if self.blended_frame is not None and self.blended_frame[0] == render_key \
+                and self.blended_frame[1] is frame:
+            return self.blended_frame[2]
+        overlay = self.projection_overlay
+        if overlay.shape[:2] != frame.shape[:2] or frame.ndim != 3:
+            return frame
+        with profiler.stage("display.projection"):
+            blended = cv2.addWeighted(frame, 1.0 - self.projection_opacity, overlay, self.projection_opacity, 0)
+        self.blended_frame = (render_key, frame, blended)
+        return blended
+    
+    def render_source_key(self):
+        if self.video_processor.is_live:
+            return ('live', self.render_serial)
+        return self.video_processor.current_frame_number
+    
+    def render_frame(self, frame):
+        if frame is not self.render_source:
+            self.render_source = frame
+            self.render_serial += 1
+        source_key = self.render_source_key()
+        with profiler.stage("display.enhance"):
+            enhanced = self.enhanced_frame(frame, source_key)
+        render_key = (source_key, self.enhancement.key() if enhanced is not frame else (),
+                      self.projection_overlay_key())
+        if render_key[2] is not None:
+            enhanced = self.blend_projection(enhanced, render_key)
+        if self.renderer.frame_key != render_key or self.renderer.frame is not enhanced:
+            self.renderer.set_frame(render_key, enhanced)
+        
+        h, w = frame.shape[:2]
+        x1, y1, x2, y2 = self.get_viewport(w, h)
+        with profiler.stage("display.tiles"):
+            display_frame, origin, factor = self.renderer.render(
+                x1, y1, x2, y2, self.video_display_width, self.video_display_height
+            )
+        
+        with profiler.stage("display.overlay"):
+            display_frame = self.draw_points_on_frame(display_frame, origin, factor)
+        
+        with profiler.stage("display.color_convert"):
             rgb_frame = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
             h, w, ch = rgb_frame.shape
             bytes_per_line = ch * w
             qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            
+        
+        with profiler.stage("display.scale"):
             pixmap = QPixmap.fromImage(qt_image)
             
             scaled_pixmap = pixmap.scaled(
@@ -376,39 +1276,52 @@ class MainWindow(QMainWindow):
                 Qt.AspectRatioMode.KeepAspectRatio,
                 Qt.TransformationMode.SmoothTransformation
             )
-            
-            original_frame = self.video_processor.get_current_frame()
-            if original_frame is not None:
-                orig_h, orig_w = original_frame.shape[:2]
-                self.display_scale = scaled_pixmap.width() / orig_w * self.zoom_level
-            
+        
+        self.view_geometry = (origin[0], origin[1], factor, w, h)
+        self.display_scale = scaled_pixmap.width() / (w * factor)
+        
+        with profiler.stage("display.set_pixmap"):
             self.video_label.setPixmap(scaled_pixmap)
     
-    def draw_points_on_frame(self, frame):
+    def draw_points_on_frame(self, frame, origin=(0, 0), factor=1):
         if not self.calculator:
             return frame
+        offset_x, offset_y, _ = self.video_processor.source_offset()
+        origin = (origin[0] + offset_x, origin[1] + offset_y)
+        if self.imported_tracks is not None and self.show_tracks_check.isChecked():
+            frame_number = self.current_source_frame()
+            if self.track_trails is None or self.track_trails[0] != frame_number:
+                with profiler.stage("display.tracks"):
+                    self.track_trails = (frame_number,) + self.imported_tracks.trails(frame_number)
+            frame = draw_tracks(frame, self.track_trails[1], self.track_trails[2], origin, factor)
+        return draw_points(frame, self.calculator.get_points(), self.point_size, origin, factor,
+                           hovered=self.hovered_point)
+    
+    def label_to_frame_coords(self, pos):
+        pixmap = self.video_label.pixmap()
+        if pixmap is None or pixmap.isNull() or self.view_geometry is None:
+            return None
         
-        points = self.calculator.get_points()
+        pixmap_width = pixmap.width()
+        pixmap_height = pixmap.height()
         
-        for i, point in enumerate(points):
-            color = (0, 255, 0) if i == len(points) - 1 else (0, 150, 255)
-            cv2.circle(frame, (point.x, point.y), self.point_size, color, -1)
-            cv2.circle(frame, (point.x, point.y), self.point_size + 2, (255, 255, 255), 2)
-            
-            label = f"{i+1}"
-            label_offset = self.point_size + 7
-            cv2.putText(frame, label, (point.x + label_offset, point.y - label_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-            cv2.putText(frame, label, (point.x + label_offset, point.y - label_offset),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 1)
-        
-        for i in range(len(points) - 1):
-            p1 = points[i]
-            p2 = points[i + 1]
-            line_thickness = max(2, self.point_size // 4)
-            cv2.line(frame, (p1.x, p1.y), (p2.x, p2.y), (255, 200, 0), line_thickness)
+        x_offset = (self.video_label.width() - pixmap_width) // 2
+        y_offset = (self.video_label.height() - pixmap_height) // 2
         
-        return frame
+        click_x = pos.x() - x_offset
+        click_y = pos.y() - y_offset
+        
+        if not (0 <= click_x < pixmap_width and 0 <= click_y < pixmap_height):
+            return None
+        
+        origin_x, origin_y, factor, view_w, view_h = self.view_geometry
+        offset_x, offset_y, _ = self.video_processor.source_offset()
+        frame_x = int(origin_x + (click_x / pixmap_width) * view_w * factor) + offset_x
+        frame_y = int(origin_y + (click_y / pixmap_height) * view_h * factor) + offset_y
+        return frame_x, frame_y
+    
+    def current_source_frame(self):
+        return self.video_processor.current_frame_number + self.video_processor.source_offset()[2]
     
     def start_point_selection(self):
         self.selecting_point = not self.selecting_point
@@ -422,9 +1335,26 @@ class MainWindow(QMainWindow):
             self.select_point_btn.setStyleSheet("")
             self.status_bar.showMessage("Point selection mode stopped")
     
+    def point_under_cursor(self, pos):
+        if not self.calculator or not self.video_loaded:
+            return None
+        coords = self.label_to_frame_coords(pos)
+        if coords is None:
+            return None
+        radius = max(self.point_size + 2, self.hit_radius_px / max(self.display_scale, 1e-6))
+        return self.calculator.find_point(coords[0], coords[1], self.current_source_frame(), radius)
+    
     def video_label_mouse_press(self, event):
+        point = self.point_under_cursor(event.pos())
+        if event.button() == Qt.MouseButton.RightButton and point is not None:
+            self.delete_point(self.calculator.index_of(point))
+            return
+        
         if event.button() == Qt.MouseButton.LeftButton:
-            if self.selecting_point:
+            if point is not None:
+                self.dragging_index = self.calculator.index_of(point)
+                self.video_label.setCursor(Qt.CursorShape.ClosedHandCursor)
+            elif self.selecting_point:
                 self.video_label_clicked(event)
             elif self.zoom_level > 1.0:
                 self.panning = True
@@ -433,6 +1363,27 @@ class MainWindow(QMainWindow):
                 self.video_label.setCursor(Qt.CursorShape.ClosedHandCursor)
     
     def video_label_mouse_move(self, event):
+        if self.dragging_index is not None:
+            coords = self.label_to_frame_coords(event.pos())
+            if coords is not None:
+                self.calculator.move_point(self.dragging_index, coords[0], coords[1])
+                self.update_point_item(self.dragging_index)
+                self.display_frame()
+            return
+        
+        if not self.panning:
+            point = self.point_under_cursor(event.pos())
+            if point is not self.hovered_point:
+                self.hovered_point = point
+                if point is not None:
+                    self.video_label.setCursor(Qt.CursorShape.PointingHandCursor)
+                elif self.zoom_level > 1.0:
+                    self.video_label.setCursor(Qt.CursorShape.OpenHandCursor)
+                else:
+                    self.video_label.setCursor(Qt.CursorShape.ArrowCursor)
+                self.display_frame()
+            return
+        
         if self.panning and self.zoom_level > 1.0:
             frame = self.video_processor.get_current_frame()
             if frame is not None:
@@ -458,6 +1409,10 @@ class MainWindow(QMainWindow):
     
     def video_label_mouse_release(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
+            if self.dragging_index is not None:
+                self.status_bar.showMessage(f"Point {self.dragging_index + 1} moved")
+                self.dragging_index = None
+                self.invalidate_results()
             self.panning = False
             if self.zoom_level > 1.0:
                 self.video_label.setCursor(Qt.CursorShape.OpenHandCursor)
@@ -467,66 +1422,67 @@ class MainWindow(QMainWindow):
     def video_label_clicked(self, event):
         if not self.selecting_point or not self.video_loaded:
             return
+        if self.video_processor.is_live and not self.video_processor.paused:
+            self.status_bar.showMessage("Pause live capture to place points")
+            return
         
-        label_width = self.video_label.width()
-        label_height = self.video_label.height()
-        
-        frame = self.video_processor.get_current_frame()
-        if frame is None:
+        coords = self.label_to_frame_coords(event.pos())
+        if coords is None:
             return
         
-        frame_height, frame_width = frame.shape[:2]
+        frame_x, frame_y = coords
+        current_frame = self.current_source_frame()
+        index = self.calculator.add_point(frame_x, frame_y, current_frame)
         
-        pixmap = self.video_label.pixmap()
-        if pixmap:
-            pixmap_width = pixmap.width()
-            pixmap_height = pixmap.height()
-            
-            x_offset = (label_width - pixmap_width) // 2
-            y_offset = (label_height - pixmap_height) // 2
-            
-            click_x = event.pos().x() - x_offset
-            click_y = event.pos().y() - y_offset
-            
-            if 0 <= click_x < pixmap_width and 0 <= click_y < pixmap_height:
-                if self.zoom_level > 1.0:
-                    crop_w = int(frame_width / self.zoom_level)
-                    crop_h = int(frame_height / self.zoom_level)
-                    
-                    center_x = frame_width // 2 + self.zoom_offset_x
-                    center_y = frame_height // 2 + self.zoom_offset_y
-                    
-                    x1 = max(0, center_x - crop_w // 2)
-                    y1 = max(0, center_y - crop_h // 2)
-                    x2 = min(frame_width, x1 + crop_w)
-                    y2 = min(frame_height, y1 + crop_h)
-                    
-                    x1 = max(0, x2 - crop_w)
-                    y1 = max(0, y2 - crop_h)
-                    
-                    frame_x = int(x1 + (click_x / pixmap_width) * crop_w)
-                    frame_y = int(y1 + (click_y / pixmap_height) * crop_h)
-                else:
-                    frame_x = int((click_x / pixmap_width) * frame_width)
-                    frame_y = int((click_y / pixmap_height) * frame_height)
-                
-                current_frame = self.video_processor.current_frame_number
-                index = self.calculator.add_point(frame_x, frame_y, current_frame)
-                
-                item_text = f"Point {index + 1}: Frame {current_frame}, ({frame_x}, {frame_y})"
-                self.points_list.addItem(item_text)
-                
-                self.clear_last_btn.setEnabled(True)
-                self.clear_all_btn.setEnabled(True)
-                
-                if len(self.calculator.get_points()) >= 2:
-                    self.calculate_btn.setEnabled(True)
-                
-                self.status_bar.showMessage(f"Point {index + 1} added - Click to add more or press 'Stop Selection'")
-                self.display_frame()
+        item_text = f"Point {index + 1}: Frame {current_frame}, ({frame_x}, {frame_y})"
+        self.points_list.addItem(item_text)
+        
+        self.clear_last_btn.setEnabled(True)
+        self.clear_all_btn.setEnabled(True)
+        
+        if len(self.calculator.get_points()) >= 2:
+            self.calculate_btn.setEnabled(True)
+        
+        self.status_bar.showMessage(f"Point {index + 1} added - Click to add more or press 'Stop Selection'")
+        self.display_frame()
+    
+    def point_item_text(self, index):
+        point = self.calculator.get_points()[index]
+        return f"Point {index + 1}: Frame {point.frame_number}, ({point.x}, {point.y})"
+    
+    def update_point_item(self, index):
+        item = self.points_list.item(index)
+        if item is not None:
+            item.setText(self.point_item_text(index))
+    
+    def invalidate_results(self):
+        if self.results_text.toPlainText():
+            self.results_text.clear()
+            self.export_btn.setEnabled(False)
+            self.report_btn.setEnabled(False)
+            self.save_db_btn.setEnabled(False)
+    
+    def delete_point(self, index):
+        self.calculator.remove_point(index)
+        self.hovered_point = None
+        self.points_list.takeItem(index)
+        for i in range(index, self.points_list.count()):
+            self.update_point_item(i)
+        
+        count = len(self.calculator.get_points())
+        if count == 0:
+            self.clear_last_btn.setEnabled(False)
+            self.clear_all_btn.setEnabled(False)
+        if count < 2:
+            self.calculate_btn.setEnabled(False)
+        self.invalidate_results()
+        
+        self.display_frame()
+        self.status_bar.showMessage(f"Point {index + 1} removed")
     
     def clear_last_point(self):
         if self.calculator and len(self.calculator.get_points()) > 0:
+            self.hovered_point = None
             self.calculator.remove_point(len(self.calculator.get_points()) - 1)
             self.points_list.takeItem(self.points_list.count() - 1)
             
@@ -535,16 +1491,22 @@ class MainWindow(QMainWindow):
                 self.clear_all_btn.setEnabled(False)
                 self.calculate_btn.setEnabled(False)
                 self.export_btn.setEnabled(False)
+                self.report_btn.setEnabled(False)
+                self.save_db_btn.setEnabled(False)
                 self.results_text.clear()
             elif len(self.calculator.get_points()) < 2:
                 self.calculate_btn.setEnabled(False)
                 self.export_btn.setEnabled(False)
+                self.report_btn.setEnabled(False)
+                self.save_db_btn.setEnabled(False)
                 self.results_text.clear()
             
             self.display_frame()
             self.status_bar.showMessage("Last point removed")
     
     def clear_all_points(self):
+        self.hovered_point = None
+        self.dragging_index = None
         if self.calculator:
             self.calculator.clear_points()
         self.points_list.clear()
@@ -553,6 +1515,8 @@ class MainWindow(QMainWindow):
         self.clear_all_btn.setEnabled(False)
         self.calculate_btn.setEnabled(False)
         self.export_btn.setEnabled(False)
+        self.report_btn.setEnabled(False)
+        self.save_db_btn.setEnabled(False)
         
         if self.selecting_point:
             self.selecting_point = False
@@ -574,6 +1538,8 @@ class MainWindow(QMainWindow):
         summary = self.calculator.get_summary_text()
         self.results_text.setPlainText(summary)
         self.export_btn.setEnabled(True)
+        self.report_btn.setEnabled(True)
+        self.save_db_btn.setEnabled(True)
         self.status_bar.showMessage("Calculations completed")
     
     def export_results(self):
@@ -602,6 +1568,320 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Save error: {str(e)}")
     
+    def generate_report(self):
+        if not self.calculator or len(self.calculator.get_points()) < 2 or self.export_worker is not None:
+            return
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Generate Report",
+            f"{Path(self.video_processor.source_path).stem}_report.html",
+            "HTML Report (*.html);;PDF Report (*.pdf)"
+        )
+        if not file_path:
+            return
+        
+        try:
+            generator = ReportGenerator(
+                [series_from_calculator(Path(self.video_processor.source_path).name, self.calculator)],
+                file_path, workers=1
+            )
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", f"Report error: {str(e)}")
+            return
+        self.start_background_export(generator, "Generating report...", self.on_report_completed)
+    
+    def compute_projection(self):
+        if not self.video_loaded or self.video_processor.is_live or self.export_worker is not None:
+            return
+        
+        last_frame = self.video_processor.total_frames - 1
+        dialog = ProjectionDialog(last_frame, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        start_frame, end_frame = dialog.get_range()
+        
+        cache_root = None
+        if self.video_processor.crop is None and self.video_cache is not None:
+            cache_root = str(self.video_cache.root)
+        builder = ProjectionBuilder(self.video_processor.video_path, start_frame, end_frame, dialog.get_step(),
+                                    self.video_fps_override, cache_root=cache_root)
+        self.start_background_export(builder, "Computing projection...", self.on_projection_completed)
+    
+    def on_projection_completed(self, stats):
+        if stats['cancelled']:
+            self.status_bar.showMessage("Projection cancelled")
+            return
+        self.projection = stats
+        self.projection_combo.setEnabled(True)
+        if self.projection_combo.currentData() is None:
+            self.projection_combo.setCurrentIndex(PROJECTION_KINDS.index('max') + 1)
+        else:
+            self.projection_kind_changed()
+        if stats['cached']:
+            self.status_bar.showMessage(f"Projection loaded from cache ({stats['frames']} frames)")
+        else:
+            self.status_bar.showMessage(
+                f"Projection computed: {stats['frames']} frames in {stats['seconds']:.1f} s "
+                f"({stats['fps']:.0f} fps)"
+            )
+    
+    def projection_kind_changed(self):
+        kind = self.projection_combo.currentData()
+        if self.projection is None or kind is None:
+            self.projection_overlay = None
+        else:
+            self.projection_overlay = projection_image(self.projection['images'], kind)
+        self.blended_frame = None
+        if self.video_loaded:
+            self.display_frame()
+    
+    def projection_opacity_changed(self, value):
+        self.projection_opacity = value / 100.0
+        if self.video_loaded and self.projection_overlay is not None:
+            self.display_frame()
+    
+    def on_report_completed(self, stats):
+        if stats['cancelled']:
+            self.status_bar.showMessage("Report cancelled")
+        else:
+            self.status_bar.showMessage(f"Report saved: {stats['path']}")
+    
+    def export_annotated_video(self):
+        if not self.video_loaded or self.export_worker is not None:
+            return
+        
+        points = self.calculator.get_points() if self.calculator else []
+        last_frame = self.video_processor.total_frames - 1
+        frame_offset = self.video_processor.source_offset()[2]
+        frames = [min(max(0, p.frame_number - frame_offset), last_frame) for p in points]
+        dialog = ExportRangeDialog(last_frame, min(frames, default=0), max(frames, default=last_frame), self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        start_frame, end_frame = dialog.get_range()
+        
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Annotated Video",
+            f"{Path(self.video_processor.source_path).stem}_annotated.mp4",
+            "MP4 Video (*.mp4);;AVI Video (*.avi)"
+        )
+        if not file_path:
+            return
+        
+        speed_labels = None
+        if dialog.speed_check.isChecked() and len(points) >= 2:
+            speed_labels = speed_labels_for(self.calculator.calculate_all_consecutive())
+        
+        exporter = AnnotatedVideoExporter(
+            self.video_processor.source_path, file_path, start_frame + frame_offset, end_frame + frame_offset,
+            [Point(p.x, p.y, p.frame_number) for p in points], self.point_size, speed_labels,
+            self.enhancement.snapshot(), self.video_fps_override
+        )
+        self.start_background_export(exporter, "Exporting annotated video...", self.on_export_completed)
+    
+    def start_background_export(self, exporter, message, on_completed):
+        self.export_thread = QThread()
+        self.export_worker = BackgroundExportWorker(exporter)
+        self.export_worker.moveToThread(self.export_thread)
+        self.export_thread.started.connect(self.export_worker.run)
+        self.export_worker.progress.connect(self.on_export_progress)
+        self.export_worker.completed.connect(on_completed)
+        self.export_worker.failed.connect(self.on_export_failed)
+        self.export_worker.finished.connect(self.on_export_finished)
+        self.export_worker.finished.connect(self.export_thread.quit)
+        self.export_thread.finished.connect(self.release_finished_loads)
+        
+        self.export_progress = QProgressDialog(message, "Cancel", 0, exporter.total_frames, self)
+        self.export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+        self.export_progress.show()
+        self.export_video_btn.setEnabled(False)
+        self.cache_roi_btn.setEnabled(False)
+        self.projection_btn.setEnabled(False)
+        self.import_tracks_btn.setEnabled(False)
+        self.export_thread.start()
+    
+    def on_export_progress(self, done, total):
+        if self.export_progress is not None:
+            self.export_progress.setValue(min(done, total))
+    
+    def import_tracks(self):
+        if not self.video_loaded:
+            return
+        
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import Tracks",
+            "",
+            "Track Files (*.csv *.tsv *.txt *.xml);;All Files (*)"
+        )
+        if not file_path:
+            return
+        
+        try:
+            columns = [] if is_xml_tracks(file_path) else read_csv_header(file_path)[1]
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Track file could not be read: {str(e)}")
+            return
+        detected = vars(detect_mapping(columns)) if columns else {}
+        dialog = TrackImportDialog(columns, detected, self.video_processor.fps, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
+        mapping = TrackMapping(**dialog.get_mapping())
+        self.start_background_export(TrackImporter(file_path, mapping), "Importing tracks...",
+                                     self.on_tracks_imported)
+    
+    def on_tracks_imported(self, stats):
+        if stats['cancelled']:
+            self.status_bar.showMessage("Track import cancelled")
+            return
+        tracks = stats['tracks']
+        self.set_imported_tracks(tracks)
+        self.status_bar.showMessage(
+            f"Imported {tracks.point_count} points in {len(tracks)} tracks ({stats['seconds']:.1f} s)"
+        )
+    
+    def set_imported_tracks(self, tracks):
+        self.imported_tracks = tracks
+        self.track_trails = None
+        self.track_combo.blockSignals(True)
+        self.track_combo.clear()
+        if tracks is not None:
+            self.track_combo.addItem(f"{len(tracks)} tracks - select one to measure", None)
+            for track_id, (start, end) in zip(tracks.track_ids.tolist(), tracks.bounds.tolist()):
+                self.track_combo.addItem(f"Track {track_id} ({end - start} points)", track_id)
+        self.track_combo.blockSignals(False)
+        self.track_combo.setEnabled(tracks is not None)
+        self.show_tracks_check.setEnabled(tracks is not None)
+        if self.video_loaded:
+            self.display_frame()
+    
+    def track_selected(self, index):
+        track_id = self.track_combo.itemData(index)
+        if track_id is None or self.imported_tracks is None or not self.calculator:
+            return
+        self.clear_all_points()
+        self.load_points(self.imported_tracks.points_array(track_id))
+        self.display_frame()
+        self.status_bar.showMessage(f"Track {track_id} loaded: {len(self.calculator.points)} points")
+    
+    def show_tracks_toggled(self, checked):
+        if self.video_loaded:
+            self.display_frame()
+    
+    def on_export_completed(self, stats):
+        if stats['cancelled']:
+            self.status_bar.showMessage(f"Export cancelled after {stats['frames']} frames")
+            return
+        message = f"Annotated video exported: {stats['frames']} frames at {stats['fps']:.0f} fps"
+        if stats['missing_frames']:
+            message += f" ({stats['missing_frames']} frames could not be decoded)"
+        self.status_bar.showMessage(message)
+    
+    def on_export_failed(self, message):
+        QMessageBox.critical(self, "Error", f"Export error: {message}")
+    
+    def on_export_finished(self):
+        if self.export_progress is not None:
+            self.export_progress.close()
+            self.export_progress = None
+        self.retired_loads.append((self.export_thread, self.export_worker))
+        self.export_thread = None
+        self.export_worker = None
+        self.export_video_btn.setEnabled(self.video_loaded and not self.video_processor.is_live)
+        self.cache_roi_btn.setEnabled(self.video_loaded and not self.video_processor.is_live)
+        self.projection_btn.setEnabled(self.video_loaded and not self.video_processor.is_live)
+        self.import_tracks_btn.setEnabled(self.video_loaded and not self.video_processor.is_live)
+    
+    def source_cache_root(self):
+        if self.video_processor.crop is None and self.video_cache is not None:
+            return self.video_cache.root
+        return SidecarCache(self.video_processor.source_path).root
+    
+    def cache_roi(self):
+        if not self.video_loaded or self.export_worker is not None:
+            return
+        
+        frame = self.video_processor.get_current_frame()
+        if frame is None:
+            return
+        x1, y1, x2, y2 = self.get_viewport(frame.shape[1], frame.shape[0])
+        offset_x, offset_y, frame_offset = self.video_processor.source_offset()
+        last_frame = self.video_processor.total_frames - 1
+        
+        region_text = f"{x2 - x1}x{y2 - y1} at ({x1 + offset_x}, {y1 + offset_y})"
+        formats = [("npz", "Chunked NumPy store (.npz)"), ("ffv1", "FFV1 video (.mkv)")]
+        dialog = RoiCacheDialog(last_frame, region_text, formats, parent=self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        start_frame, end_frame = dialog.get_range()
+        
+        region = CropRegion(x1 + offset_x, y1 + offset_y, x2 - x1, y2 - y1,
+                            start_frame + frame_offset, end_frame + frame_offset,
+                            self.video_processor.source_path)
+        try:
+            writer = RoiCropWriter(region.source_path, region, self.source_cache_root(),
+                                   dialog.get_format(), self.video_fps_override)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"ROI cache error: {str(e)}")
+            return
+        self.start_background_export(writer, "Caching ROI...", self.on_roi_cache_completed)
+    
+    def on_roi_cache_completed(self, stats):
+        if stats['cancelled']:
+            self.status_bar.showMessage(f"ROI caching cancelled after {stats['frames']} frames")
+            return
+        self.status_bar.showMessage(
+            f"ROI cached: {stats['frames']} frames, {stats['bytes'] / 1e6:.1f} MB at {stats['fps']:.0f} fps"
+        )
+        self.open_video(stats['path'], fps=self.video_fps_override)
+    
+    def open_cached_roi(self):
+        if not self.video_loaded:
+            return
+        
+        try:
+            crops = list_crops(self.source_cache_root())
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"ROI cache error: {str(e)}")
+            return
+        
+        items = [f"Full video: {Path(self.video_processor.source_path).name}"]
+        items += [f"{CropRegion(**crop['region']).label} ({crop['format']}, {crop['bytes'] / 1e6:.1f} MB)"
+                  for crop in crops]
+        item, ok = QInputDialog.getItem(self, "Open Cached ROI", "Region:", items, 0, False)
+        if not ok:
+            return
+        
+        index = items.index(item)
+        path = crops[index - 1]['path'] if index > 0 else self.video_processor.source_path
+        if path != self.video_processor.video_path:
+            self.open_video(path, fps=self.video_fps_override)
+    
+    def save_results_to_database(self):
+        if not self.calculator or len(self.calculator.get_points()) < 2:
+            return
+        if self.video_processor.is_live:
+            QMessageBox.warning(self, "Warning", "Save the live buffer to a video file before storing results!")
+            return
+        
+        try:
+            cropped = self.video_processor.crop is not None
+            video_hash = self.video_cache.video_hash if self.video_cache and not cropped else None
+            with ResultsDatabase() as db:
+                session_id = db.store_session(
+                    self.video_processor.source_path,
+                    self.calculator,
+                    None if cropped else self.video_processor.get_video_info(),
+                    video_hash
+                )
+                db_path = db.path
+            self.status_bar.showMessage(f"Results stored as session {session_id} in {db_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Database error: {str(e)}")
+    
     def showEvent(self, event):
         super().showEvent(event)
         self.video_display_width = self.video_label.width()
@@ -633,34 +1913,83 @@ class MainWindow(QMainWindow):
         elif key == Qt.Key.Key_Escape and self.isFullScreen():
             self.showMaximized()
             return
+        elif key == Qt.Key.Key_F3:
+            self.toggle_hud()
+            return
+        elif key == Qt.Key.Key_F4:
+            self.export_trace()
+            return
         
         if not self.video_loaded:
             super().keyPressEvent(event)
             return
         
-        if key == Qt.Key.Key_Left:
-            current = self.frame_slider.value()
-            if current > 0:
-                self.frame_slider.setValue(current - 1)
+        if key == Qt.Key.Key_Space:
+            if self.video_processor.is_live:
+                self.toggle_live_pause()
+            else:
+                self.toggle_playback()
+            return
+        
+        if key in (Qt.Key.Key_Delete, Qt.Key.Key_Backspace):
+            if self.hovered_point is not None:
+                self.delete_point(self.calculator.index_of(self.hovered_point))
+            return
+        
+        shift = bool(event.modifiers() & Qt.KeyboardModifier.ShiftModifier)
+        
+        if key == Qt.Key.Key_PageUp and shift:
+            self.jump_to_activity(False)
+        elif key == Qt.Key.Key_PageDown and shift:
+            self.jump_to_activity(True)
+        elif key == Qt.Key.Key_Left:
+            self.step_frames(-1)
         elif key == Qt.Key.Key_Right:
-            current = self.frame_slider.value()
-            if current < self.frame_slider.maximum():
-                self.frame_slider.setValue(current + 1)
+            self.step_frames(1)
         elif key == Qt.Key.Key_Home:
             self.frame_slider.setValue(0)
         elif key == Qt.Key.Key_End:
             self.frame_slider.setValue(self.frame_slider.maximum())
         elif key == Qt.Key.Key_PageUp:
-            current = self.frame_slider.value()
-            new_value = max(0, current - 10)
-            self.frame_slider.setValue(new_value)
+            self.step_frames(-10)
         elif key == Qt.Key.Key_PageDown:
-            current = self.frame_slider.value()
-            new_value = min(self.frame_slider.maximum(), current + 10)
-            self.frame_slider.setValue(new_value)
+            self.step_frames(10)
         else:
             super().keyPressEvent(event)
     
+    def toggle_hud(self):
+        enabled = not self.hud_label.isVisible()
+        profiler.set_enabled(enabled)
+        self.hud_label.setVisible(enabled)
+        if enabled:
+            profiler.reset()
+            self.update_hud()
+            self.hud_timer.start(500)
+            self.status_bar.showMessage("Performance HUD on (F4: export trace)")
+        else:
+            self.hud_timer.stop()
+            self.status_bar.showMessage("Performance HUD off")
+    
+    def update_hud(self):
+        self.hud_label.setText(profiler.get_hud_text())
+        self.hud_label.adjustSize()
+        self.hud_label.raise_()
+    
+    def export_trace(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Trace",
+            "trace.json",
+            "Chrome Trace (*.json)"
+        )
+        
+        if file_path:
+            try:
+                profiler.export_chrome_trace(file_path)
+                self.status_bar.showMessage(f"Trace saved: {Path(file_path).name}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Save error: {str(e)}")
+    
     def zoom_in(self):
         if not self.video_loaded:
             return
@@ -722,5 +2051,20 @@ class MainWindow(QMainWindow):
         QMessageBox.about(self, "About Erytroscope", about_text)
     
     def closeEvent(self, event):
+        self.close_project()
+        self.stop_playback()
+        self.cancel_video_loading()
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+            self.export_thread.quit()
+            self.export_thread.wait()
+        for thread, worker in self.retired_loads:
+            thread.quit()
+            thread.wait()
+        for window in list(self.comparison_windows):
+            window.close()
+        self.live_timer.stop()
+        self.enhance_timer.stop()
+        self.enhancement.shutdown()
         self.video_processor.release()
         event.accept()
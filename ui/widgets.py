@@ -0,0 +1,362 @@
+import numpy as np
+from PyQt6.QtWidgets import (QWidget, QSizePolicy, QDialog, QFormLayout, QSpinBox, QCheckBox,
+                             QDialogButtonBox, QComboBox, QLabel, QLineEdit, QDoubleSpinBox,
+                             QHBoxLayout, QPushButton, QFileDialog)
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor
+
+from ui.styles import AppStyles
+
+class ActivityStrip(QWidget):
+    frame_clicked = pyqtSignal(int)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.scores = None
+        self.segments = np.empty((0, 2), dtype=np.int64)
+        self.low_quality = None
+        self.irregular = None
+        self.total_frames = 0
+        self.current_frame = 0
+        self.setFixedHeight(18)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setToolTip("Motion activity (Shift+PageUp / Shift+PageDown: previous / next active segment)")
+    
+    def set_activity(self, scores, segments, total_frames):
+        self.scores = scores
+        self.segments = segments
+        self.total_frames = total_frames
+        self.update()
+    
+    def set_low_quality(self, mask):
+        self.low_quality = mask
+        self.update()
+    
+    def set_irregular(self, mask):
+        self.irregular = mask
+        self.update()
+    
+    def clear(self):
+        self.scores = None
+        self.low_quality = None
+        self.irregular = None
+        self.segments = np.empty((0, 2), dtype=np.int64)
+        self.total_frames = 0
+        self.update()
+    
+    def set_current_frame(self, frame_number):
+        if frame_number != self.current_frame:
+            self.current_frame = frame_number
+            self.update()
+    
+    def column_levels(self, width):
+        scores = np.asarray(self.scores, dtype=np.float32)
+        starts = np.arange(width, dtype=np.int64) * len(scores) // width
+        peaks = np.maximum.reduceat(scores, starts)
+        top = float(np.percentile(scores, 99.5))
+        if top <= 0:
+            return np.zeros(width, dtype=np.float32)
+        return np.sqrt(np.clip(peaks / top, 0.0, 1.0))
+    
+    def paint_marks(self, painter, mask, y, color):
+        if mask is None or not len(mask):
+            return
+        width = self.width()
+        mask = np.asarray(mask, dtype=np.uint8)
+        starts = np.arange(width, dtype=np.int64) * len(mask) // width
+        for x in np.flatnonzero(np.maximum.reduceat(mask, starts)):
+            painter.fillRect(int(x), y, 1, 3, color)
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        width = self.width()
+        height = self.height()
+        painter.fillRect(0, 0, width, height, QColor(AppStyles.BORDER_LIGHT_GRAY))
+        
+        if self.total_frames <= 0 or width <= 0:
+            painter.end()
+            return
+        
+        scale = width / self.total_frames
+        self.paint_marks(painter, self.low_quality, 0, QColor(217, 119, 6))
+        self.paint_marks(painter, self.irregular, 3, QColor(147, 51, 234))
+        
+        if self.scores is None or len(self.scores) == 0:
+            painter.end()
+            return
+        
+        segment_color = QColor(AppStyles.ACCENT_LIGHT_NAVY)
+        segment_color.setAlpha(60)
+        for start, end in self.segments:
+            x = int(start * scale)
+            painter.fillRect(x, 0, max(1, int(end * scale) - x), height, segment_color)
+        
+        levels = self.column_levels(width)
+        bar_color = QColor(AppStyles.ACCENT_NAVY)
+        for x, level in enumerate(levels):
+            bar = int(level * height)
+            if bar > 0:
+                painter.fillRect(x, height - bar, 1, bar, bar_color)
+        
+        marker_x = int(self.current_frame * scale)
+        painter.fillRect(marker_x, 0, 2, height, QColor(220, 38, 38))
+        painter.end()
+    
+    def mousePressEvent(self, event):
+        if self.total_frames > 0 and event.button() == Qt.MouseButton.LeftButton:
+            frame = int(event.position().x() * self.total_frames / max(1, self.width()))
+            self.frame_clicked.emit(min(max(0, frame), self.total_frames - 1))
+
+class ExportRangeDialog(QDialog):
+    def __init__(self, last_frame, start_frame=0, end_frame=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Export Annotated Video")
+        layout = QFormLayout(self)
+        
+        self.start_spin = QSpinBox()
+        self.start_spin.setRange(0, last_frame)
+        self.start_spin.setValue(start_frame)
+        layout.addRow("Start frame:", self.start_spin)
+        
+        self.end_spin = QSpinBox()
+        self.end_spin.setRange(0, last_frame)
+        self.end_spin.setValue(last_frame if end_frame is None else end_frame)
+        layout.addRow("End frame:", self.end_spin)
+        
+        self.speed_check = QCheckBox("Show speeds on connecting lines")
+        self.speed_check.setChecked(True)
+        layout.addRow(self.speed_check)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+    
+    def get_range(self):
+        start = self.start_spin.value()
+        end = self.end_spin.value()
+        return min(start, end), max(start, end)
+
+class RoiCacheDialog(QDialog):
+    def __init__(self, last_frame, region_text, formats, start_frame=0, end_frame=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Cache ROI")
+        layout = QFormLayout(self)
+        layout.addRow("Region:", QLabel(region_text))
+        
+        self.start_spin = QSpinBox()
+        self.start_spin.setRange(0, last_frame)
+        self.start_spin.setValue(start_frame)
+        layout.addRow("Start frame:", self.start_spin)
+        
+        self.end_spin = QSpinBox()
+        self.end_spin.setRange(0, last_frame)
+        self.end_spin.setValue(last_frame if end_frame is None else end_frame)
+        layout.addRow("End frame:", self.end_spin)
+        
+        self.format_combo = QComboBox()
+        for key, label in formats:
+            self.format_combo.addItem(label, key)
+        layout.addRow("Format:", self.format_combo)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+    
+    def get_range(self):
+        start = self.start_spin.value()
+        end = self.end_spin.value()
+        return min(start, end), max(start, end)
+    
+    def get_format(self):
+        return self.format_combo.currentData()
+
+class LiveCaptureDialog(QDialog):
+    def __init__(self, source="0", buffer_seconds=30, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Live Capture")
+        layout = QFormLayout(self)
+        
+        source_layout = QHBoxLayout()
+        self.source_edit = QLineEdit(source)
+        self.source_edit.setToolTip("Camera index, stream URL, or a video file played back in real time")
+        source_layout.addWidget(self.source_edit)
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse)
+        source_layout.addWidget(browse_btn)
+        layout.addRow("Source:", source_layout)
+        
+        self.seconds_spin = QSpinBox()
+        self.seconds_spin.setRange(1, 3600)
+        self.seconds_spin.setValue(buffer_seconds)
+        self.seconds_spin.setSuffix(" s")
+        layout.addRow("Buffer:", self.seconds_spin)
+        
+        self.fps_spin = QDoubleSpinBox()
+        self.fps_spin.setRange(0, 10000)
+        self.fps_spin.setDecimals(3)
+        self.fps_spin.setSpecialValueText("Auto")
+        layout.addRow("Frame rate:", self.fps_spin)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+    
+    def browse(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Video", "", "Video Files (*.mp4 *.avi *.mov *.mkv);;All Files (*)"
+        )
+        if file_path:
+            self.source_edit.setText(file_path)
+    
+    def get_source(self):
+        return self.source_edit.text().strip()
+    
+    def get_buffer_seconds(self):
+        return self.seconds_spin.value()
+    
+    def get_fps(self):
+        return self.fps_spin.value() or None
+
+class EnhancementDialog(QDialog):
+    changed = pyqtSignal()
+    
+    def __init__(self, chain, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Image Filters")
+        self.chain = chain
+        self.checks = {}
+        self.spins = {}
+        layout = QFormLayout(self)
+        
+        for stage in chain.stages:
+            spec = stage.spec
+            check = QCheckBox(spec.label + (" (background)" if spec.expensive else ""))
+            check.toggled.connect(lambda enabled, kind=stage.kind: self.stage_toggled(kind, enabled))
+            self.checks[stage.kind] = check
+            layout.addRow(check)
+            for name, (default, minimum, maximum, step) in spec.params.items():
+                spin = QDoubleSpinBox()
+                spin.setRange(minimum, maximum)
+                spin.setSingleStep(step)
+                spin.setDecimals(1)
+                spin.valueChanged.connect(lambda value, kind=stage.kind, name=name: self.param_changed(kind, name, value))
+                self.spins[(stage.kind, name)] = spin
+                layout.addRow(f"    {name.replace('_', ' ').capitalize()}:", spin)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.close)
+        layout.addRow(buttons)
+        self.refresh()
+    
+    def refresh(self):
+        for stage in self.chain.stages:
+            check = self.checks.get(stage.kind)
+            if check is None:
+                continue
+            check.blockSignals(True)
+            check.setChecked(stage.enabled)
+            check.blockSignals(False)
+            for name, value in stage.values.items():
+                spin = self.spins[(stage.kind, name)]
+                spin.blockSignals(True)
+                spin.setValue(value)
+                spin.setEnabled(stage.enabled)
+                spin.blockSignals(False)
+    
+    def stage_toggled(self, kind, enabled):
+        self.chain.set_stage(kind, enabled=enabled)
+        for (spin_kind, _), spin in self.spins.items():
+            if spin_kind == kind:
+                spin.setEnabled(enabled)
+        self.changed.emit()
+    
+    def param_changed(self, kind, name, value):
+        self.chain.set_stage(kind, **{name: value})
+        self.changed.emit()
+
+class ProjectionDialog(QDialog):
+    def __init__(self, last_frame, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Compute Projection")
+        layout = QFormLayout(self)
+        
+        self.start_spin = QSpinBox()
+        self.start_spin.setRange(0, last_frame)
+        layout.addRow("Start frame:", self.start_spin)
+        
+        self.end_spin = QSpinBox()
+        self.end_spin.setRange(0, last_frame)
+        self.end_spin.setValue(last_frame)
+        layout.addRow("End frame:", self.end_spin)
+        
+        self.step_spin = QSpinBox()
+        self.step_spin.setRange(1, max(1, last_frame))
+        self.step_spin.setToolTip("Use every Nth frame")
+        layout.addRow("Frame step:", self.step_spin)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+    
+    def get_range(self):
+        start = self.start_spin.value()
+        end = self.end_spin.value()
+        return min(start, end), max(start, end)
+    
+    def get_step(self):
+        return self.step_spin.value()
+
+class TrackImportDialog(QDialog):
+    def __init__(self, columns, detected, fps, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Import Tracks")
+        self.fps = fps
+        layout = QFormLayout(self)
+        
+        self.column_combos = {}
+        for field, label in (('x', "X column:"), ('y', "Y column:"), ('frame', "Frame column:"),
+                             ('track', "Track column:")):
+            if not columns:
+                break
+            combo = QComboBox()
+            if field == 'track':
+                combo.addItem("(none)", None)
+            for name in columns:
+                combo.addItem(name, name)
+            index = combo.findData(detected.get(field))
+            if index >= 0:
+                combo.setCurrentIndex(index)
+            self.column_combos[field] = combo
+            layout.addRow(label, combo)
+        
+        self.units_spin = QDoubleSpinBox()
+        self.units_spin.setDecimals(6)
+        self.units_spin.setRange(0.000001, 1000000)
+        self.units_spin.setValue(1.0)
+        self.units_spin.setToolTip("Track coordinates per video pixel (e.g. µm per pixel when tracks are in µm)")
+        layout.addRow("Units per pixel:", self.units_spin)
+        
+        self.time_check = QCheckBox("Frame column holds time in seconds")
+        self.time_check.setEnabled(fps > 0)
+        layout.addRow(self.time_check)
+        
+        self.offset_spin = QSpinBox()
+        self.offset_spin.setRange(-1000000, 1000000)
+        self.offset_spin.setToolTip("Subtracted from imported frame numbers (1 for 1-based files)")
+        layout.addRow("Frame offset:", self.offset_spin)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+    
+    def get_mapping(self):
+        mapping = {field: combo.currentData() for field, combo in self.column_combos.items()}
+        mapping['units_per_pixel'] = self.units_spin.value()
+        mapping['seconds_per_frame'] = 1.0 / self.fps if self.time_check.isChecked() else None
+        mapping['frame_offset'] = self.offset_spin.value()
+        return mapping
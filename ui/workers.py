@@ -0,0 +1,138 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.video_processor import VideoProcessor
+from core.decoder_config import autotune, decoder_settings, video_codec
+from core.readers import is_reader_input
+from core.analysis import cached_analysis
+from core.sidecar import SidecarCache
+from core.roi_cache import load_crop_region
+
+class BackgroundExportWorker(QObject):
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+    
+    def __init__(self, exporter):
+        super().__init__()
+        self.exporter = exporter
+    
+    def cancel(self):
+        self.exporter.cancel()
+    
+    def run(self):
+        try:
+            stats = self.exporter.run(lambda done, total: self.progress.emit(done, total))
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.completed.emit(stats)
+        self.finished.emit()
+
+class VideoLoadWorker(QObject):
+    first_frame_ready = pyqtSignal(object)
+    cache_ready = pyqtSignal(object)
+    progress = pyqtSignal(str, int)
+    stage_finished = pyqtSignal(str, object)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+    
+    def __init__(self, video_path, background_stages=None, cache_root=None, fps=None):
+        super().__init__()
+        self.video_path = video_path
+        self.cache_root = cache_root
+        self.fps = fps
+        self.background_stages = list(background_stages or [])
+        self._cancelled = False
+    
+    def cancel(self):
+        self._cancelled = True
+    
+    def is_cancelled(self):
+        return self._cancelled
+    
+    def run(self):
+        processor = VideoProcessor()
+        try:
+            loaded = processor.load_video(self.video_path, self.fps, crop=load_crop_region(self.video_path))
+        except Exception as e:
+            processor.release()
+            self.failed.emit(str(e))
+            self.finished.emit()
+            return
+        
+        if not loaded:
+            processor.release()
+            self.failed.emit("Failed to load video!")
+            self.finished.emit()
+            return
+        
+        if self._cancelled:
+            processor.release()
+            self.finished.emit()
+            return
+        
+        self.first_frame_ready.emit(processor)
+        
+        try:
+            cache = SidecarCache(self.video_path, root=self.cache_root)
+        except OSError as e:
+            cache = None
+            self.failed.emit(f"Cache unavailable: {str(e)}")
+        self.cache_ready.emit(cache)
+        
+        for key, label, stage in self.background_stages:
+            if self._cancelled:
+                break
+            try:
+                result = stage(
+                    self.video_path,
+                    cache,
+                    lambda percent, label=label: self.progress.emit(label, percent),
+                    self.is_cancelled,
+                    self.fps
+                )
+            except Exception as e:
+                self.failed.emit(f"{label}: {str(e)}")
+                continue
+            if self._cancelled:
+                break
+            self.stage_finished.emit(key, result)
+        
+        self.finished.emit()
+
+def tuned_decoder(video_path, cache, progress_callback, is_cancelled, fps=None):
+    if is_reader_input(video_path):
+        progress_callback(100)
+        return None
+    
+    settings = decoder_settings()
+    entry = settings.file_entry(video_path)
+    if entry is None and settings.auto_tune:
+        codec = video_codec(video_path)
+        entry = settings.codec_entry(codec) if codec else None
+        if entry is None:
+            entry = autotune(video_path, progress_callback=progress_callback, is_cancelled=is_cancelled,
+                             sequential_frames=30, random_samples=4)
+            if entry is not None and codec:
+                settings.set_codec(codec, entry)
+        if entry is not None:
+            settings.set_file(video_path, entry)
+    progress_callback(100)
+    return entry
+
+def cached_frame_analysis(video_path, cache, progress_callback, is_cancelled, fps=None):
+    results = cached_analysis(video_path, cache, progress_callback=progress_callback, is_cancelled=is_cancelled, fps=fps)
+    if results is None:
+        return None
+    
+    frames = len(results['activity'])
+    if cache is not None and not cache.load_json("frame_count"):
+        cache.save_json("frame_count", {'frames': frames})
+    return dict(results, frame_count=frames)
+
+def default_background_stages():
+    return [
+        ("decoder", "Tuning decoder", tuned_decoder),
+        ("analysis", "Analysing frames", cached_frame_analysis),
+    ]
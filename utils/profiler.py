@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from functools import wraps
+
+import numpy as np
+
+class _NullStage:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start')
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+class Profiler:
+    def __init__(self, max_samples: int = 2000, max_trace_events: int = 200000):
+        self.enabled = False
+        self.max_samples = max_samples
+        self.samples = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self.counters = defaultdict(int)
+        self.trace_events = deque(maxlen=max_trace_events)
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+    
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self.counters.clear()
+            self.trace_events.clear()
+            self.origin = time.perf_counter()
+    
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+    
+    def record(self, name: str, start: float, end: float):
+        with self._lock:
+            self.samples[name].append((end - start) * 1000.0)
+            self.trace_events.append({
+                'name': name,
+                'cat': name.split('.', 1)[0],
+                'ph': 'X',
+                'ts': (start - self.origin) * 1e6,
+                'dur': (end - start) * 1e6,
+                'pid': os.getpid(),
+                'tid': threading.get_ident()
+            })
+    
+    def count(self, name: str, value: int = 1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += value
+    
+    def count_cache(self, name: str, hit: bool):
+        if self.enabled:
+            with self._lock:
+                self.counters[f"{name}.hit" if hit else f"{name}.miss"] += 1
+    
+    def cache_hit_rates(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        
+        names = {key.rsplit('.', 1)[0] for key in counters
+                 if key.endswith('.hit') or key.endswith('.miss')}
+        rates = {}
+        for name in sorted(names):
+            hits = counters.get(f"{name}.hit", 0)
+            misses = counters.get(f"{name}.miss", 0)
+            total = hits + misses
+            rates[name] = hits / total if total else 0.0
+        return rates
+    
+    def summary(self, percentiles=(50, 90, 99)) -> dict:
+        with self._lock:
+            snapshot = {name: np.fromiter(values, dtype=np.float64) for name, values in self.samples.items()}
+        
+        result = {}
+        for name in sorted(snapshot):
+            values = snapshot[name]
+            if len(values) == 0:
+                continue
+            stats = {'count': len(values), 'mean': float(values.mean())}
+            for p, value in zip(percentiles, np.percentile(values, percentiles)):
+                stats[f"p{p}"] = float(value)
+            result[name] = stats
+        return result
+    
+    def get_hud_text(self) -> str:
+        lines = [f"{'stage':<26}{'n':>6}{'p50':>8}{'p90':>8}{'p99':>8}  ms"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<26}{stats['count']:>6}{stats['p50']:>8.2f}{stats['p90']:>8.2f}{stats['p99']:>8.2f}")
+        rates = self.cache_hit_rates()
+        if rates:
+            lines.append("")
+            for name, rate in rates.items():
+                lines.append(f"{name:<26}hit rate {rate * 100:5.1f}%")
+        return "\n".join(lines)
+    
+    def export_chrome_trace(self, path: str):
+        with self._lock:
+            events = list(self.trace_events)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+profiler = Profiler()
+
+def profiled(name: str):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with _Stage(profiler, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator